@@ -0,0 +1,132 @@
+import time
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from fastapi import Depends, HTTPException, WebSocket
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.auth import authenticate_token, get_current_user
+from app.core.config import settings
+from app.core.supabase import AsyncSupabaseClient, get_async_supabase_client
+from app.db import session as db_session
+from app.db.session import SessionLocal
+
+
+class RecentWriters:
+    """
+    Remembers which users wrote recently, so their reads can stay on the
+    primary until replicas have caught up.
+
+    Tracking is per worker process. Entries older than the window are
+    pruned as new writes arrive, and at most ``max_size`` users are kept.
+    """
+
+    def __init__(self, window: float, max_size: int = 100000):
+        self.window = window
+        self.max_size = max_size
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+
+    def record(self, user_id: str) -> None:
+        """Note that a user has just written."""
+        now = time.monotonic()
+        self._writes[user_id] = now
+        self._writes.move_to_end(user_id)
+        while self._writes:
+            oldest_user, written_at = next(iter(self._writes.items()))
+            if now - written_at <= self.window and len(self._writes) <= self.max_size:
+                break
+            del self._writes[oldest_user]
+
+    def wrote_recently(self, user_id: str) -> bool:
+        """Whether the user wrote within the read-your-writes window."""
+        written_at = self._writes.get(user_id)
+        return written_at is not None and time.monotonic() - written_at <= self.window
+
+    def clear(self) -> None:
+        self._writes.clear()
+
+
+recent_writers = RecentWriters(window=settings.READ_YOUR_WRITES_SECONDS)
+
+# WebSocket close code for a missing or invalid token, mirroring HTTP 401
+WS_CLOSE_UNAUTHORIZED = 4401
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a database session for the duration of a request."""
+    async with SessionLocal() as session:
+        yield session
+
+
+async def get_write_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a primary session and open the user's read-your-writes window."""
+    yield db
+    recent_writers.record(current_user.get("sub", ""))
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a session for read-only queries.
+
+    Uses the read replica when one is configured, unless the user wrote
+    within ``READ_YOUR_WRITES_SECONDS`` and might not see their own change
+    there yet. The primary session is created lazily and never connects
+    when the replica is used.
+    """
+    if db_session.ReadSessionLocal is None or recent_writers.wrote_recently(current_user.get("sub", "")):
+        yield db
+        return
+    async with db_session.ReadSessionLocal() as session:
+        yield session
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Provide the primary session factory.
+
+    For streamed responses, which outlive the request's ``yield``
+    dependencies and must open their own session.
+    """
+    return SessionLocal
+
+
+def get_read_session_factory(
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> async_sessionmaker:
+    """Provide a read session factory, routed like ``get_read_db``."""
+    if db_session.ReadSessionLocal is None or recent_writers.wrote_recently(current_user.get("sub", "")):
+        return session_factory
+    return db_session.ReadSessionLocal
+
+
+def authenticate_websocket(websocket: WebSocket, token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Verify the bearer token of a WebSocket connection.
+
+    Browsers can't set headers on WebSockets, so the token may come from
+    the query string as well as the Authorization header.
+
+    Returns:
+        The token's claims, or None if it is missing or invalid
+    """
+    if not token:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        return None
+    try:
+        return authenticate_token(token)
+    except HTTPException:
+        return None
+
+
+def get_supabase() -> AsyncSupabaseClient:
+    """Provide the shared async Supabase client."""
+    return get_async_supabase_client()
@@ -1,5 +1,10 @@
 from fastapi import APIRouter
-from .endpoints import auth
+from .endpoints import admin, auth, health, pois, sessions, tours
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
+api_router.include_router(pois.router, prefix="/pois", tags=["pois"])
+api_router.include_router(tours.router, prefix="/tours", tags=["tours"])
+api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import get_current_admin
+from app.core.config import settings
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+
+@router.get("/profiles")
+async def list_profiles(
+    current_admin: Dict[str, Any] = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """List stored request profiles, newest first."""
+    return {
+        "enabled": settings.PROFILING_ENABLED,
+        "profiles": [profile.summary() for profile in profile_store.list()]
+    }
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str,
+    current_admin: Dict[str, Any] = Depends(get_current_admin)
+) -> PlainTextResponse:
+    """
+    Get a profile as folded stacks.
+
+    Each line is ``frame;frame;... count``, which flamegraph.pl, speedscope
+    and inferno read directly.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return PlainTextResponse(profile.folded)
@@ -4,7 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app.api import deps
+from app.core.auth import token_cache
 from app.core.config import settings
+from app.core.session_hub import session_hub
+from app.db.session import engine, pool_stats, read_engine
+from app.utils.cluster_grid import cluster_grid
+from app.utils.nearby_cache import nearby_cache
+from app.utils.spatial_index import poi_index
 
 router = APIRouter()
 
@@ -34,3 +40,39 @@ async def health_check_db(db: AsyncSession = Depends(deps.get_db)):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Database health check failed: {str(e)}"
         )
+
+@router.get("/db-pool")
+async def health_check_db_pool():
+    """Report database connection pool usage and checkout wait times."""
+    return {
+        "primary": pool_stats(engine),
+        "replica": pool_stats(read_engine) if read_engine is not None else None
+    }
+
+@router.get("/poi-index")
+async def health_check_poi_index():
+    """Report size, memory use and build time of the POI spatial index."""
+    return poi_index.stats()
+
+@router.get("/auth-cache")
+async def health_check_auth_cache():
+    """Report hit/miss counters of the verified-token cache."""
+    return token_cache.stats()
+
+@router.get("/nearby-cache")
+async def health_check_nearby_cache():
+    """Report hit rate of the quantized-location nearby cache."""
+    return nearby_cache.stats()
+
+@router.get("/cluster-grid")
+async def health_check_cluster_grid():
+    """Report size and build time of the map cluster grid."""
+    return cluster_grid.stats()
+
+@router.get("/sessions")
+async def health_check_sessions():
+    """Report connected group sessions, fan-out and backplane counters."""
+    stats = session_hub.stats()
+    if session_hub.backplane is not None:
+        stats["backplane"] = session_hub.backplane.stats()
+    return stats
@@ -1,21 +1,176 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import (
+    APIRouter, Depends, HTTPException, status, Query, Request, Response, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, delete, insert, and_, or_, true
+import numpy as np
 
 from app.api import deps
-from app.models.poi import POI
-from app.schemas.poi import POICreate, POIUpdate, POIInDB
-from app.schemas.location import LocationQuery
-from app.utils.geofence import is_within_radius
+from app.db import session as db_session
+from app.models.poi import POI, POITombstone, utcnow
+from app.models.tour import TourPOI
+from app.schemas.poi import (
+    POICreate, POIUpdate, POIInDB, POIChanges, POIClusters, BulkImportError, BulkImportResult
+)
+from app.schemas.location import LocationQuery, BatchNearbyQuery, BatchNearbyResponse, PositionUpdate
+from app.utils.cluster_grid import cluster_grid, cluster_pois
+from app.utils.geofence import BoundingBox, bounding_box, batch_within_radius, filter_within_radius
+from app.utils.geofence_tracker import GeofenceTracker
+from app.utils.markers import (
+    MARKERS_BINARY_MEDIA_TYPE, MAX_TILE_ZOOM, encode_markers_binary, encode_markers_json, tile_bounds
+)
+from app.utils.nearby_cache import nearby_cache
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.serialization import POIListResponse, dump_csv, dump_ndjson
+from app.utils.spatial_index import poi_index
+from app.utils.tour_bundle import invalidate_tour_bundles, tours_containing
+from app.utils.ingest import (
+    CSV_MEDIA_TYPES, NDJSON_MEDIA_TYPES, iter_csv_records, iter_lines, iter_ndjson_records
+)
 from app.core.auth import get_current_user
+from app.core.cache import get_cache, invalidate_versioned, versioned_key
+from app.core.config import settings
+from app.core.metrics import GEOFENCE_POSITIONS
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _in_box(box: BoundingBox):
+    """Build a SQL predicate selecting POIs inside a bounding box.
+
+    The predicate only uses plain range comparisons so it is served by the
+    ``ix_pois_latitude_longitude`` index on Postgres and works unchanged on
+    SQLite.
+    """
+    return and_(
+        POI.latitude.between(box.min_lat, box.max_lat),
+        or_(*(POI.longitude.between(west, east) for west, east in box.lon_ranges))
+    )
+
+
+def _within_bounding_box(latitude: float, longitude: float, radius: float):
+    """Build a SQL predicate selecting POIs inside the geofence's bounding box."""
+    return _in_box(bounding_box(latitude, longitude, radius))
+
+
+async def _invalidate_nearby(*positions: Tuple[float, float]) -> None:
+    """Drop cached nearby candidates around POI locations that changed."""
+    if settings.NEARBY_CACHE_ENABLED:
+        await nearby_cache.invalidate(*positions)
+
+SyncPosition = Optional[Tuple[datetime, int]]
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (as returned by SQLite) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_sync_point(since: Optional[str]) -> Tuple[SyncPosition, SyncPosition]:
+    """Turn a ``since`` timestamp or changes cursor into keyset positions.
+
+    Returns the positions for the POI change stream and the tombstone stream.
+    """
+    if since is None:
+        return None, None
+    try:
+        timestamp = _as_utc(datetime.fromisoformat(since))
+        return (timestamp, 0), (timestamp, 0)
+    except ValueError:
+        pass
+
+    def position(raw: Any) -> SyncPosition:
+        if raw is None:
+            return None
+        timestamp, last_id = raw
+        return _as_utc(datetime.fromisoformat(timestamp)), int(last_id)
+
+    try:
+        cursor = decode_cursor(since)
+        return position(cursor.get("u")), position(cursor.get("d"))
+    except (InvalidCursorError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must be an ISO 8601 timestamp or a changes cursor"
+        )
+
+
+def _behind_safety_window(position: SyncPosition, now: datetime) -> SyncPosition:
+    """
+    Hold a caught-up sync position back by the changes safety window.
+
+    ``updated_at`` and ``deleted_at`` are stamped when a row is written, not
+    when its transaction commits, so a slow transaction can commit a row
+    behind a cursor that was already handed out. Keeping the final cursor
+    of a sync at least ``POI_CHANGES_SAFETY_WINDOW_SECONDS`` behind now
+    makes the next sync re-scan that window; clients apply changes by ID,
+    so rows seen twice are harmless.
+    """
+    if position is None:
+        return None
+    horizon = now - timedelta(seconds=settings.POI_CHANGES_SAFETY_WINDOW_SECONDS)
+    if position[0] <= horizon:
+        return position
+    return horizon, 0
+
+
+def _after(timestamp_column, id_column, position: SyncPosition):
+    """Keyset predicate for rows strictly after a (timestamp, id) position."""
+    if position is None:
+        return true()
+    timestamp, last_id = position
+    return or_(
+        timestamp_column > timestamp,
+        and_(timestamp_column == timestamp, id_column > last_id)
+    )
+
+def _poi_cache_key(poi_id: int) -> str:
+    return f"poi:{poi_id}"
+
+
+def _validators(poi: POIInDB) -> Tuple[str, str]:
+    """Build the ETag and Last-Modified values for a POI from its updated_at."""
+    modified = _as_utc(poi.updated_at or poi.created_at)
+    etag = f'"{poi.id}-{int(modified.timestamp() * 1_000_000)}"'
+    return etag, format_datetime(modified, usegmt=True)
+
+
+def _not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """Whether the request's conditional headers match the current version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; compare weakly per RFC 9110
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(last_modified) <= since
+    return False
+
 @router.post("", response_model=POIInDB, status_code=status.HTTP_201_CREATED)
 async def create_poi(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_write_db),
     poi_in: POICreate,
     current_user: dict = Depends(get_current_user)
 ) -> POIInDB:
@@ -30,71 +185,559 @@ async def create_poi(
     db.add(poi)
     await db.commit()
     await db.refresh(poi)
+    poi_index.upsert(poi)
+    cluster_grid.upsert(poi)
+    await _invalidate_nearby((poi.latitude, poi.longitude))
     return poi
 
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_pois(
+    *,
+    db: AsyncSession = Depends(deps.get_write_db),
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+) -> BulkImportResult:
+    """
+    Import POIs from a streamed NDJSON or CSV body.
+
+    Rows are validated against ``POICreate`` and inserted in chunks with a
+    multi-row ``INSERT ... RETURNING``, one transaction per chunk. Invalid
+    rows are reported back and do not stop the import.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        records = iter_ndjson_records(iter_lines(request.stream()))
+    elif media_type in CSV_MEDIA_TYPES:
+        records = iter_csv_records(iter_lines(request.stream()))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be NDJSON (application/x-ndjson) or CSV (text/csv)"
+        )
+
+    started = time.perf_counter()
+    imported = 0
+    failed = 0
+    errors: List[BulkImportError] = []
+
+    def reject(row: int, messages: List[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.BULK_IMPORT_MAX_REPORTED_ERRORS:
+            errors.append(BulkImportError(row=row, errors=messages))
+
+    async def flush(chunk: List[Tuple[int, dict]]) -> None:
+        nonlocal imported
+        try:
+            result = await db.scalars(insert(POI).returning(POI), [values for _, values in chunk])
+            pois = result.all()
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for row, _ in chunk:
+                reject(row, [f"Database error: {e.__class__.__name__}"])
+            return
+        imported += len(pois)
+        for poi in pois:
+            poi_index.upsert(poi)
+            cluster_grid.upsert(poi)
+        await _invalidate_nearby(*((poi.latitude, poi.longitude) for poi in pois))
+
+    chunk: List[Tuple[int, dict]] = []
+    async for row, record, parse_error in records:
+        if parse_error is not None:
+            reject(row, [parse_error])
+            continue
+        try:
+            poi_in = POICreate.model_validate(record)
+        except ValidationError as e:
+            reject(row, [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            ])
+            continue
+        chunk.append((row, poi_in.model_dump()))
+        if len(chunk) >= settings.BULK_IMPORT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+    if chunk:
+        await flush(chunk)
+
+    elapsed = time.perf_counter() - started
+    rows_per_second = (imported + failed) / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        "Bulk POI import: %d imported, %d failed in %.2fs (%.0f rows/s)",
+        imported, failed, elapsed, rows_per_second
+    )
+    return BulkImportResult(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        elapsed_seconds=elapsed,
+        rows_per_second=rows_per_second
+    )
+
 @router.get("/nearby", response_model=List[POIInDB])
 async def get_nearby_pois(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     latitude: float = Query(..., ge=-90, le=90),
     longitude: float = Query(..., ge=-180, le=180),
     radius: float = Query(default=20.0, gt=0, le=1000),
     current_user: dict = Depends(get_current_user)
 ) -> List[POIInDB]:
-    """Get POIs within specified radius of user's location."""
-    # First, get all POIs
-    result = await db.execute(select(POI))
-    all_pois = result.scalars().all()
+    """
+    Get POIs within specified radius of user's location.
+
+    Rows are trusted, so they are encoded directly instead of being
+    re-validated against the response model.
+    """
+    if poi_index.is_ready:
+        return POIListResponse(poi_index.query_radius(latitude, longitude, radius))
+
+    candidates = await _nearby_candidates(db, latitude, longitude, radius)
+
+    # Exact distance check on the remaining candidates
+    nearby_pois = filter_within_radius(latitude, longitude, candidates, radius)
     
-    # Filter POIs within radius
-    nearby_pois = [
-        poi for poi in all_pois
-        if is_within_radius(
-            latitude,
-            longitude,
-            poi.latitude,
-            poi.longitude,
-            radius
+    return POIListResponse(nearby_pois)
+
+async def _nearby_candidates(db: AsyncSession, latitude: float, longitude: float, radius: float) -> Sequence[Any]:
+    """Fetch POIs that may lie within radius, from the nearby cache when possible."""
+    if settings.NEARBY_CACHE_ENABLED and nearby_cache.supports(latitude, longitude, radius):
+        # Candidates are shared by every query snapping to the same grid cell
+        cell = await nearby_cache.get(latitude, longitude)
+        candidates = cell.candidates
+        if candidates is None:
+            result = await db.execute(
+                select(POI)
+                .where(_in_box(nearby_cache.candidate_box(latitude, longitude)))
+                .order_by(POI.id)
+            )
+            candidates = await nearby_cache.set(cell, result.scalars().all())
+    else:
+        # Let the database narrow the search to the geofence's bounding box
+        result = await db.execute(
+            select(POI)
+            .where(_within_bounding_box(latitude, longitude, radius))
+            .order_by(POI.id)
         )
-    ]
-    
-    return nearby_pois
+        candidates = result.scalars().all()
+    return candidates
+
+@router.websocket("/geofence")
+async def track_geofences(
+    websocket: WebSocket,
+    radius: float = Query(default=20.0, gt=0, le=1000),
+    token: Optional[str] = Query(default=None),
+    session_factory: async_sessionmaker = Depends(deps.get_session_factory)
+):
+    """
+    Stream geofence enter/exit events for positions pushed by the client.
+
+    The client sends ``{"latitude": ..., "longitude": ...}`` as it moves
+    and only hears back when the set of POIs it is inside changes:
+    ``{"type": "exit", "poi_id": ...}`` and ``{"type": "enter", "poi":
+    {...}}``. Positions within ``GEOFENCE_MIN_MOVE_METERS`` of the last
+    evaluated one are dropped without a lookup.
+    """
+    if deps.authenticate_websocket(websocket, token) is None:
+        await websocket.close(code=deps.WS_CLOSE_UNAUTHORIZED)
+        return
+
+    await websocket.accept()
+    tracker = GeofenceTracker(radius, settings.GEOFENCE_MIN_MOVE_METERS)
+    read_session_factory = db_session.ReadSessionLocal or session_factory
+    try:
+        while True:
+            try:
+                position = PositionUpdate.model_validate_json(await websocket.receive_text())
+            except KeyError:
+                # A binary frame has no text
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON text"})
+                continue
+            except ValidationError:
+                await websocket.send_json({"type": "error", "detail": "Expected a latitude and longitude"})
+                continue
+            latitude, longitude = position.latitude, position.longitude
+            if not tracker.should_evaluate(latitude, longitude):
+                GEOFENCE_POSITIONS.inc("skipped")
+                continue
+            GEOFENCE_POSITIONS.inc("evaluated")
+
+            if poi_index.is_ready:
+                candidates = poi_index.candidates(latitude, longitude, radius)
+            else:
+                try:
+                    # Only hold a connection for the lookup, not the whole stream
+                    async with read_session_factory() as db:
+                        candidates = await _nearby_candidates(db, latitude, longitude, radius)
+                except SQLAlchemyError:
+                    logger.exception("Failed to look up geofence candidates")
+                    await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                    return
+
+            entered, exited = tracker.update(latitude, longitude, candidates)
+            for poi_id in exited:
+                await websocket.send_json({"type": "exit", "poi_id": poi_id})
+            for poi in entered:
+                await websocket.send_json({"type": "enter", "poi": POIInDB.model_validate(poi).model_dump(mode="json")})
+    except WebSocketDisconnect:
+        pass
+
+@router.post("/nearby:batch", response_model=BatchNearbyResponse)
+async def get_nearby_pois_batch(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    query: BatchNearbyQuery,
+    current_user: dict = Depends(get_current_user)
+) -> BatchNearbyResponse:
+    """Get the POIs each participant of a group session is within range of."""
+    positions = query.positions
+
+    if poi_index.is_ready:
+        candidates_by_id = {
+            poi.id: poi
+            for position in positions
+            for poi in poi_index.candidates(position.latitude, position.longitude, query.radius)
+        }
+        candidates = [candidates_by_id[poi_id] for poi_id in sorted(candidates_by_id)]
+    else:
+        # One query covering every participant's bounding box
+        result = await db.execute(
+            select(POI)
+            .where(or_(*(
+                _within_bounding_box(position.latitude, position.longitude, query.radius)
+                for position in positions
+            )))
+            .order_by(POI.id)
+        )
+        candidates = result.scalars().all()
+
+    # Participants along rows, candidate POIs along columns
+    mask = batch_within_radius(
+        [position.latitude for position in positions],
+        [position.longitude for position in positions],
+        [poi.latitude for poi in candidates],
+        [poi.longitude for poi in candidates],
+        query.radius
+    )
+
+    return {
+        "session_id": query.session_id,
+        "results": [
+            {
+                "user_id": position.user_id,
+                "pois": [candidates[i] for i in np.flatnonzero(row)]
+            }
+            for position, row in zip(positions, mask)
+        ]
+    }
+
+@router.get("/changes", response_model=POIChanges)
+async def get_poi_changes(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    since: Optional[str] = None,
+    limit: int = Query(default=500, ge=1, le=5000),
+    current_user: dict = Depends(get_current_user)
+) -> POIChanges:
+    """
+    Get POIs created, updated or deleted since a sync point.
+
+    ``since`` is either an ISO 8601 timestamp or the ``next_cursor`` of a
+    previous call; omit it to download the whole catalog. Keep calling with
+    ``next_cursor`` while ``has_more`` is true, then store it for the next
+    sync.
+    """
+    changes_after, deleted_after = _parse_sync_point(since)
+    now = utcnow()
+
+    result = await db.execute(
+        select(POI)
+        .where(_after(POI.updated_at, POI.id, changes_after))
+        .order_by(POI.updated_at, POI.id)
+        .limit(limit)
+    )
+    changes = result.scalars().all()
+
+    result = await db.execute(
+        select(POITombstone)
+        .where(_after(POITombstone.deleted_at, POITombstone.poi_id, deleted_after))
+        .order_by(POITombstone.deleted_at, POITombstone.poi_id)
+        .limit(limit)
+    )
+    deleted = result.scalars().all()
+
+    if changes:
+        changes_after = (_as_utc(changes[-1].updated_at), changes[-1].id)
+    if deleted:
+        deleted_after = (_as_utc(deleted[-1].deleted_at), deleted[-1].poi_id)
+    # Only a stream that is caught up is held back; pages within a sync
+    # keep exact positions so a busy window cannot repeat the same page
+    if len(changes) < limit:
+        changes_after = _behind_safety_window(changes_after, now)
+    if len(deleted) < limit:
+        deleted_after = _behind_safety_window(deleted_after, now)
+
+    next_cursor = encode_cursor({
+        key: None if position is None else [position[0].isoformat(), position[1]]
+        for key, position in (("u", changes_after), ("d", deleted_after))
+    })
+
+    return {
+        "changes": changes,
+        "deleted": deleted,
+        "next_cursor": next_cursor,
+        "has_more": len(changes) == limit or len(deleted) == limit
+    }
+
+def _in_tile(z: int, x: int, y: int):
+    """
+    Build a SQL predicate selecting POIs inside an XYZ tile.
+
+    Tiles are half-open so a POI on a shared edge belongs to exactly one
+    of them.
+    """
+    n = 1 << z
+    if not (0 <= x < n and 0 <= y < n):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tile {z}/{x}/{y} does not exist"
+        )
+    south, north, west, east = tile_bounds(z, x, y)
+    return and_(
+        POI.latitude <= north,
+        POI.latitude >= south if y == n - 1 else POI.latitude > south,
+        POI.longitude >= west,
+        POI.longitude <= east if x == n - 1 else POI.longitude < east,
+    )
+
+@router.get(
+    "/markers",
+    responses={200: {"content": {"application/json": {}, MARKERS_BINARY_MEDIA_TYPE: {}}}}
+)
+async def get_poi_markers(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    encoding: str = Query(default="json", alias="format", pattern="^(json|binary)$"),
+    z: Optional[int] = Query(default=None, ge=0, le=MAX_TILE_ZOOM),
+    x: Optional[int] = Query(default=None, ge=0),
+    y: Optional[int] = Query(default=None, ge=0),
+    current_user: dict = Depends(get_current_user)
+) -> Response:
+    """
+    Get the map markers (id, title and location) of every POI, or of one tile.
+
+    ``format=json`` returns one array per column; ``format=binary`` returns
+    the packed layout described in ``encode_markers_binary``. Pass all of
+    ``z``, ``x`` and ``y`` to only get the markers inside that Web Mercator
+    tile.
+    """
+    query = select(POI.id, POI.title, POI.latitude, POI.longitude).order_by(POI.id)
+    tile = (z, x, y)
+    if any(value is not None for value in tile):
+        if any(value is None for value in tile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="z, x and y must be given together"
+            )
+        query = query.where(_in_tile(z, x, y))
+
+    result = await db.execute(query)
+    rows = result.all()
+    ids, titles, latitudes, longitudes = zip(*rows) if rows else ((), (), (), ())
+
+    if encoding == "binary":
+        content = encode_markers_binary(ids, titles, latitudes, longitudes)
+        return Response(content=content, media_type=MARKERS_BINARY_MEDIA_TYPE)
+    content = encode_markers_json(ids, titles, latitudes, longitudes)
+    return Response(content=content, media_type="application/json")
+
+def _parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """Parse a ``west,south,east,north`` bounding box in degrees."""
+    try:
+        west, south, east, north = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox must be west,south,east,north in degrees"
+        )
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox is out of range"
+        )
+    return west, south, east, north
+
+@router.get("/clusters", response_model=POIClusters)
+async def get_poi_clusters(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    bbox: str = Query(..., description="west,south,east,north in degrees"),
+    zoom: int = Query(..., ge=0, le=MAX_TILE_ZOOM),
+    current_user: dict = Depends(get_current_user)
+) -> POIClusters:
+    """
+    Get POI counts and centroids per grid cell for a map viewport.
+
+    Clusters come from the precomputed cluster grid, which write endpoints
+    keep current. A ``west`` greater than ``east`` selects a viewport
+    crossing the antimeridian. Zoom levels beyond the grid's deepest level
+    are answered from that level.
+    """
+    west, south, east, north = _parse_bbox(bbox)
+    zoom = min(zoom, cluster_grid.max_zoom)
+    if cluster_grid.is_ready:
+        return {"zoom": zoom, "clusters": cluster_grid.query(zoom, west, south, east, north)}
+
+    # Aggregate the viewport's POIs at the requested level only
+    box = BoundingBox(
+        south, north, [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+    )
+    result = await db.execute(select(POI.id, POI.latitude, POI.longitude).where(_in_box(box)))
+    return {"zoom": zoom, "clusters": cluster_pois(result.all(), zoom, cluster_grid.cells_per_tile)}
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPES[0]: {}, CSV_MEDIA_TYPES[0]: {}}}}
+)
+async def export_pois(
+    *,
+    session_factory: async_sessionmaker = Depends(deps.get_read_session_factory),
+    encoding: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    updated_from: Optional[datetime] = Query(default=None, description="Inclusive lower bound on updated_at"),
+    updated_to: Optional[datetime] = Query(default=None, description="Exclusive upper bound on updated_at"),
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream every POI, optionally limited to an ``updated_at`` range, as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in batches of
+    ``EXPORT_BATCH_SIZE`` and written out as they arrive, so memory use
+    does not grow with the table. Naive timestamps are taken as UTC.
+    """
+    query = select(POI.__table__).order_by(POI.id)
+    if updated_from is not None:
+        query = query.where(POI.updated_at >= _as_utc(updated_from))
+    if updated_to is not None:
+        query = query.where(POI.updated_at < _as_utc(updated_to))
+    query = query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+
+    async def stream():
+        # The request's session is closed before the body streams, so open one here
+        async with session_factory() as db:
+            result = await db.stream(query)
+            if encoding == "csv":
+                yield dump_csv((), header=True)
+            async for rows in result.partitions():
+                yield dump_csv(rows) if encoding == "csv" else dump_ndjson(rows)
+
+    media_type, extension = (
+        (CSV_MEDIA_TYPES[0], "csv") if encoding == "csv" else (NDJSON_MEDIA_TYPES[0], "ndjson")
+    )
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="pois.{extension}"'}
+    )
 
 @router.get("/{poi_id}", response_model=POIInDB)
 async def get_poi(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
+    primary_db: AsyncSession = Depends(deps.get_db),
     poi_id: int,
+    request: Request,
     current_user: dict = Depends(get_current_user)
-) -> POIInDB:
-    """Get a POI by ID."""
-    result = await db.execute(select(POI).where(POI.id == poi_id))
-    poi = result.scalar_one_or_none()
-    
-    if poi is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"POI with ID {poi_id} not found"
-        )
-    
-    return poi
+) -> Response:
+    """
+    Get a POI by ID.
+
+    Serialized responses are cached until the POI is updated or deleted.
+    Responses carry ``ETag`` and ``Last-Modified`` validators, and a
+    matching ``If-None-Match`` or ``If-Modified-Since`` gets a 304.
+    A miss shortly after a change is loaded from the primary, so a lagging
+    replica cannot put the old POI back in the cache.
+    """
+    cache = get_cache()
+    cache_key, recently_changed = await versioned_key(cache, _poi_cache_key(poi_id))
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        entry = json.loads(cached)
+    else:
+        session = primary_db if recently_changed else db
+        result = await session.execute(select(POI).where(POI.id == poi_id))
+        poi = result.scalar_one_or_none()
+        
+        if poi is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"POI with ID {poi_id} not found"
+            )
+        
+        poi_out = POIInDB.model_validate(poi)
+        etag, last_modified = _validators(poi_out)
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": poi_out.model_dump_json()
+        }
+        await cache.set(cache_key, json.dumps(entry).encode())
+
+    headers = {
+        "ETag": entry["etag"],
+        "Last-Modified": entry["last_modified"],
+        "Cache-Control": "private, no-cache"
+    }
+    if _not_modified(request, entry["etag"], entry["last_modified"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
 
 @router.get("", response_model=List[POIInDB])
 async def list_pois(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(default=100, ge=1),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ) -> List[POIInDB]:
-    """List POIs with pagination."""
-    result = await db.execute(select(POI).offset(skip).limit(limit))
-    return result.scalars().all()
+    """
+    List POIs with pagination.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch
+    the next page with a keyset seek on ``id``, which stays as cheap on the
+    last page as on the first. ``skip`` is still honoured when no cursor
+    is given.
+    """
+    query = select(POI).order_by(POI.id).limit(limit)
+    if cursor is not None:
+        try:
+            last_id = int(decode_cursor(cursor)["id"])
+        except (InvalidCursorError, KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        query = query.where(POI.id > last_id)
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(query)
+    pois = result.scalars().all()
+
+    response = POIListResponse(pois)
+    # A full page means there may be more rows after it
+    if len(pois) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": pois[-1].id})
+    return response
 
 @router.put("/{poi_id}", response_model=POIInDB)
 async def update_poi(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_write_db),
     poi_id: int,
     poi_in: POIUpdate,
     current_user: dict = Depends(get_current_user)
@@ -108,6 +751,7 @@ async def update_poi(
             detail="POI not found"
         )
     
+    old_position = (poi.latitude, poi.longitude)
     update_data = poi_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(poi, field, value)
@@ -115,12 +759,17 @@ async def update_poi(
     db.add(poi)
     await db.commit()
     await db.refresh(poi)
+    poi_index.upsert(poi)
+    cluster_grid.upsert(poi)
+    await invalidate_versioned(get_cache(), _poi_cache_key(poi_id))
+    await _invalidate_nearby(old_position, (poi.latitude, poi.longitude))
+    await invalidate_tour_bundles(*await tours_containing(db, poi_id))
     return poi
 
 @router.delete("/{poi_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_poi(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_write_db),
     poi_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -133,6 +782,15 @@ async def delete_poi(
             detail="POI not found"
         )
     
+    tour_ids = await tours_containing(db, poi_id)
+    await db.execute(delete(TourPOI).where(TourPOI.poi_id == poi_id))
     await db.execute(delete(POI).where(POI.id == poi_id))
+    # Leave a tombstone so offline clients drop the POI on their next sync
+    await db.merge(POITombstone(poi_id=poi_id, deleted_at=utcnow()))
     await db.commit()
+    poi_index.remove(poi_id)
+    cluster_grid.remove(poi_id)
+    await invalidate_versioned(get_cache(), _poi_cache_key(poi_id))
+    await _invalidate_nearby((poi.latitude, poi.longitude))
+    await invalidate_tour_bundles(*tour_ids)
     return None
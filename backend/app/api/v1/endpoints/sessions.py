@@ -0,0 +1,172 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api import deps
+from app.core.config import settings
+from app.core.session_hub import Subscriber, session_hub
+from app.core.supabase import AsyncSupabaseClient
+from app.models.poi import POI
+from app.models.session import GroupSessionState
+from app.schemas.session import SetPOIMessage
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Application close code, following the HTTP status it mirrors
+CLOSE_NOT_FOUND = 4404
+
+
+async def _load_session(supabase: AsyncSupabaseClient, session_code: str) -> Optional[Dict[str, Any]]:
+    """Fetch an active group session by its share code."""
+    response = await (
+        supabase.table("group_sessions")
+        .select("id,leader_id,status")
+        .eq("session_code", session_code)
+        .limit(1)
+        .execute()
+    )
+    if not response.data or response.data[0]["status"] != "active":
+        return None
+    return response.data[0]
+
+
+async def _current_poi(session_factory: async_sessionmaker, session_id: str) -> Optional[int]:
+    """The POI a session is currently at, if any."""
+    async with session_factory() as db:
+        return await db.scalar(
+            select(GroupSessionState.current_poi_id).where(GroupSessionState.session_id == session_id)
+        )
+
+
+async def _store_current_poi(session_factory: async_sessionmaker, session_id: str, poi_id: int) -> bool:
+    """
+    Move a session to a POI.
+
+    The POI is looked up on the primary, in the same transaction, so a POI
+    created moments ago is found.
+
+    Returns:
+        False if the POI does not exist, in which case nothing is stored
+    """
+    async with session_factory() as db:
+        if await db.scalar(select(POI.id).where(POI.id == poi_id)) is None:
+            return False
+        await db.merge(GroupSessionState(session_id=session_id, current_poi_id=poi_id))
+        await db.commit()
+    return True
+
+
+def _error(subscriber: Subscriber, detail: str) -> None:
+    subscriber.offer("error", {"type": "error", "detail": detail})
+
+
+async def _forward(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Send a subscriber's coalesced updates until it is closed or too slow."""
+    while True:
+        batch = await subscriber.next_batch()
+        if subscriber.closed and not batch:
+            break
+        try:
+            for message in batch:
+                await asyncio.wait_for(
+                    websocket.send_json(message), settings.SESSION_HUB_SEND_TIMEOUT_SECONDS
+                )
+        except asyncio.TimeoutError:
+            break
+        except Exception:
+            # The client went away mid-send; the receive loop cleans up
+            logger.debug("Failed to send session update", exc_info=True)
+            break
+    # Closing makes the receive loop exit as well
+    try:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except Exception:
+        # The client is already gone
+        pass
+
+
+@router.websocket("/{session_code}/ws")
+async def session_updates(
+    websocket: WebSocket,
+    session_code: str,
+    token: Optional[str] = Query(default=None),
+    supabase: AsyncSupabaseClient = Depends(deps.get_supabase),
+    session_factory: async_sessionmaker = Depends(deps.get_session_factory)
+):
+    """
+    Live updates for a group session.
+
+    Every participant receives ``{"type": "poi_changed", "poi_id": ...,
+    "seq": ...}`` messages, starting with the session's current POI. The
+    session leader changes the POI by sending ``{"type": "set_poi",
+    "poi_id": ...}`` with the ID of an existing POI; the change is stored
+    before it is sent to anyone. Anything else, or a change that could not
+    be stored, gets an ``{"type": "error", "detail": ...}`` reply.
+    Participants that fall too far behind are disconnected with code 1013
+    and should reconnect.
+    """
+    claims = deps.authenticate_websocket(websocket, token)
+    if claims is None:
+        await websocket.close(code=deps.WS_CLOSE_UNAUTHORIZED)
+        return
+
+    try:
+        session = await _load_session(supabase, session_code)
+        current_poi_id = await _current_poi(session_factory, str(session["id"])) if session else None
+    except Exception:
+        logger.exception("Failed to load session %s", session_code)
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    if session is None:
+        await websocket.close(code=CLOSE_NOT_FOUND)
+        return
+
+    await websocket.accept()
+    is_leader = str(session["leader_id"]) == claims["sub"]
+    initial = {}
+    if current_poi_id is not None:
+        initial["poi"] = {"type": "poi_changed", "poi_id": current_poi_id, "seq": 0}
+    subscriber = session_hub.subscribe(session_code, initial)
+    sender = asyncio.create_task(_forward(websocket, subscriber))
+
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except (ValueError, KeyError):
+                # KeyError: a binary frame has no text
+                _error(subscriber, "Messages must be JSON text")
+                continue
+            if not isinstance(message, dict) or message.get("type") != "set_poi":
+                continue
+            if not is_leader:
+                _error(subscriber, "Only the session leader can change the POI")
+                continue
+            try:
+                poi_id = SetPOIMessage.model_validate(message).poi_id
+            except ValidationError:
+                _error(subscriber, "poi_id must be a positive integer")
+                continue
+            try:
+                if not await _store_current_poi(session_factory, str(session["id"]), poi_id):
+                    _error(subscriber, f"POI {poi_id} not found")
+                    continue
+            except SQLAlchemyError:
+                logger.exception("Failed to store POI %s for session %s", poi_id, session_code)
+                _error(subscriber, "Could not change the POI, try again")
+                continue
+            session_hub.publish(session_code, "poi", {"type": "poi_changed", "poi_id": poi_id})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        session_hub.unsubscribe(session_code, subscriber)
+        sender.cancel()
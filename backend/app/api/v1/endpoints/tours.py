@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.auth import get_current_user
+from app.core.cache import get_cache, versioned_key
+from app.core.config import settings
+from app.models.poi import POI, utcnow
+from app.models.tour import Tour, TourPOI
+from app.schemas.tour import TourBundle, TourCreate, TourInDB, TourPackageJob, TourPOIs
+from app.utils.byte_ranges import RangeNotSatisfiable, iter_file_range, parse_byte_range
+from app.utils.tour_bundle import build_tour_bundle, invalidate_tour_bundles, tour_bundle_key
+from app.utils.tour_package import (
+    PACKAGE_MEDIA_TYPE, PackageJob, package_jobs, package_path, run_package_job
+)
+
+router = APIRouter()
+
+
+async def _get_tour(db: AsyncSession, tour_id: int) -> Tour:
+    result = await db.execute(select(Tour).where(Tour.id == tour_id))
+    tour = result.scalar_one_or_none()
+    if tour is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tour with ID {tour_id} not found"
+        )
+    return tour
+
+
+async def _set_tour_pois(db: AsyncSession, tour_id: int, poi_ids: List[int]) -> None:
+    """Replace a tour's POIs, numbering them in the given order."""
+    if poi_ids:
+        result = await db.execute(select(POI.id).where(POI.id.in_(poi_ids)))
+        unknown = sorted(set(poi_ids) - set(result.scalars().all()))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown POI IDs: {', '.join(map(str, unknown))}"
+            )
+    await db.execute(delete(TourPOI).where(TourPOI.tour_id == tour_id))
+    if poi_ids:
+        await db.execute(insert(TourPOI), [
+            {"tour_id": tour_id, "poi_id": poi_id, "sequence_number": sequence_number}
+            for sequence_number, poi_id in enumerate(poi_ids, start=1)
+        ])
+
+
+async def _load_bundle(db: AsyncSession, tour_id: int) -> TourBundle:
+    tour = await _get_tour(db, tour_id)
+    result = await db.execute(
+        select(POI)
+        .join(TourPOI, TourPOI.poi_id == POI.id)
+        .where(TourPOI.tour_id == tour_id)
+        .order_by(TourPOI.sequence_number, POI.id)
+    )
+    return build_tour_bundle(tour, result.scalars().all())
+
+
+@router.post("", response_model=TourInDB, status_code=status.HTTP_201_CREATED)
+async def create_tour(
+    *,
+    db: AsyncSession = Depends(deps.get_write_db),
+    tour_in: TourCreate,
+    current_user: dict = Depends(get_current_user)
+) -> TourInDB:
+    """Create a tour visiting the given POIs in order."""
+    tour = Tour(
+        title=tour_in.title,
+        description=tour_in.description,
+        created_by=current_user.get("sub")
+    )
+    db.add(tour)
+    await db.flush()
+    await _set_tour_pois(db, tour.id, tour_in.poi_ids)
+    await db.commit()
+    await db.refresh(tour)
+    return tour
+
+
+@router.put("/{tour_id}/pois", response_model=TourInDB)
+async def update_tour_pois(
+    *,
+    db: AsyncSession = Depends(deps.get_write_db),
+    tour_id: int,
+    tour_pois: TourPOIs,
+    current_user: dict = Depends(get_current_user)
+) -> TourInDB:
+    """Replace a tour's POIs and their order."""
+    tour = await _get_tour(db, tour_id)
+    await _set_tour_pois(db, tour_id, tour_pois.poi_ids)
+    tour.updated_at = utcnow()
+    await db.commit()
+    await db.refresh(tour)
+    await invalidate_tour_bundles(tour_id)
+    return tour
+
+
+@router.delete("/{tour_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_tour(
+    *,
+    db: AsyncSession = Depends(deps.get_write_db),
+    tour_id: int,
+    current_user: dict = Depends(get_current_user)
+):
+    """Delete a tour."""
+    await _get_tour(db, tour_id)
+    await db.execute(delete(TourPOI).where(TourPOI.tour_id == tour_id))
+    await db.execute(delete(Tour).where(Tour.id == tour_id))
+    await db.commit()
+    await invalidate_tour_bundles(tour_id)
+    return None
+
+
+@router.get("/{tour_id}/bundle", response_model=TourBundle)
+async def get_tour_bundle(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    primary_db: AsyncSession = Depends(deps.get_db),
+    tour_id: int,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+) -> Response:
+    """
+    Get a tour with its POIs in visiting order and the distances between them.
+
+    The serialized bundle is cached until the tour's POIs, their order, or
+    any of the POIs themselves change, so starting a tour costs one request
+    and, once warm, no queries. A matching ``If-None-Match`` gets a 304.
+    A miss shortly after a change is loaded from the primary, so a lagging
+    replica cannot put the old bundle back in the cache.
+    """
+    cache = get_cache()
+    cache_key, recently_changed = await versioned_key(cache, tour_bundle_key(tour_id))
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        entry = json.loads(cached)
+    else:
+        body = (await _load_bundle(primary_db if recently_changed else db, tour_id)).model_dump_json()
+        digest = hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+        entry = {"etag": f'"{tour_id}-{digest}"', "body": body}
+        await cache.set(cache_key, json.dumps(entry).encode())
+
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or entry["etag"] in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+@router.post(
+    "/{tour_id}/package",
+    response_model=TourPackageJob,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def create_tour_package(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    tour_id: int,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    include_audio: bool = Query(default=False),
+    current_user: dict = Depends(get_current_user)
+) -> TourPackageJob:
+    """
+    Start building an offline package of a tour.
+
+    The package holds the tour bundle and a manifest of narration audio
+    with sizes and SHA-256 hashes, plus the audio itself with
+    ``include_audio``. Poll the job at the ``Location`` header; once
+    ``done``, download it from ``/tours/packages/{package_id}``. Jobs are
+    tracked per worker.
+    """
+    bundle = await _load_bundle(db, tour_id)
+    job = PackageJob(tour_id=tour_id, include_audio=include_audio)
+    package_jobs.add(job)
+    background_tasks.add_task(run_package_job, job, bundle)
+    response.headers["Location"] = f"{settings.API_V1_STR}/tours/package-jobs/{job.id}"
+    return job
+
+
+@router.get("/package-jobs/{job_id}", response_model=TourPackageJob)
+async def get_tour_package_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> TourPackageJob:
+    """Get the status of a package build."""
+    job = package_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Package job not found"
+        )
+    return job
+
+
+@router.get("/packages/{package_id}", response_class=StreamingResponse)
+async def download_tour_package(
+    package_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+) -> Response:
+    """
+    Download a tour package.
+
+    Packages are content-addressed and never change, so the ID is the
+    ``ETag``: a matching ``If-None-Match`` gets a 304, and interrupted
+    downloads resume with a ``Range`` request, honoured unless an
+    ``If-Range`` names a different package.
+    """
+    try:
+        path = package_path(package_id)
+        size = os.path.getsize(path)
+    except (ValueError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Package not found"
+        )
+
+    etag = f'"{package_id}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if request.headers.get("if-range", etag) == etag:
+        try:
+            byte_range = parse_byte_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    headers["Content-Disposition"] = f'attachment; filename="tour-package-{package_id[:12]}.zip"'
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, status.HTTP_200_OK
+    else:
+        (start, end), status_code = byte_range, status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(path, start, end),
+        status_code=status_code,
+        media_type=PACKAGE_MEDIA_TYPE,
+        headers=headers
+    )
@@ -1,16 +1,113 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 
 from .config import settings
+from .jwks import JWKSCache
+from .metrics import timed_phase
+from .token_cache import TokenCache
 
 security = HTTPBearer()
 
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+jwks_cache: Optional[JWKSCache] = (
+    JWKSCache(settings.SUPABASE_JWKS_URL, refresh_interval=settings.SUPABASE_JWKS_REFRESH_SECONDS)
+    if settings.SUPABASE_JWKS_URL else None
+)
+
+token_cache = TokenCache(
+    max_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    max_ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+)
+
+
+def _signing_key(token: str) -> Tuple[str, Any]:
+    """Pick the algorithm and key to verify a token with from its header.
+
+    Asymmetric keys only ever come from the JWKS cache, so a token cannot
+    downgrade to HS256 verification against a public key.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        return algorithm, settings.SUPABASE_JWT_SECRET
+    if algorithm in ASYMMETRIC_ALGORITHMS and jwks_cache is not None:
+        key = jwks_cache.get_key(header.get("kid"))
+        if key is None or key.get("alg", algorithm) != algorithm:
+            raise JWTError("Unknown signing key")
+        return algorithm, key
+    raise JWTError(f"Unsupported signing algorithm: {algorithm}")
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a Supabase JWT and validate its required claims.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Dict containing the token claims
+
+    Raises:
+        HTTPException: If the token is invalid, expired or missing claims
+    """
+    try:
+        algorithm, key = _signing_key(token)
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            options={"verify_aud": False}
+        )
+    except JWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid authentication token: {str(e)}",
+        )
+
+    if not claims.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid user ID in token",
+        )
+    if not claims.get("role"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid role in token",
+        )
+    return claims
+
+
+def authenticate_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a token, reusing claims cached from earlier requests.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Dict containing the token claims
+
+    Raises:
+        HTTPException: If the token is invalid, expired or missing claims
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = verify_token(token)
+        token_cache.set(token, claims)
+    return claims
+
+
 async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> Dict[str, Any]:
     """
     Get current user from JWT token.
     
+    Verified claims are cached by token digest until the token expires, so
+    repeated requests with the same token skip signature verification.
+    
     Args:
         credentials: JWT token from Authorization header
         
@@ -20,11 +117,40 @@ async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] =
     Raises:
         HTTPException: If token is invalid or missing
     """
-    # For testing purposes, accept any token
-    if credentials and credentials.credentials == "test-token":
-        return {"role": "authenticated", "user_id": "test-user"}
-    
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated",
+    if not credentials or not credentials.credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+
+    with timed_phase("auth"):
+        return authenticate_token(credentials.credentials)
+
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    """
+    Whether verified claims carry one of ``ADMIN_ROLES``.
+
+    Only user tokens get this far, since ``verify_token`` requires ``sub``;
+    grant admin through the user's ``app_metadata.role``.
+    """
+    app_metadata = claims.get("app_metadata") or {}
+    return (
+        claims.get("role") in settings.ADMIN_ROLES
+        or app_metadata.get("role") in settings.ADMIN_ROLES
     )
+
+
+async def get_current_admin(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Get the current user, requiring an admin role.
+
+    Raises:
+        HTTPException: If the user is not an admin
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
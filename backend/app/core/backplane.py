@@ -0,0 +1,444 @@
+"""
+Pub/sub backplane relaying group session updates between workers.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# {"origin": worker id, "session": session code, "key": coalescing key, "message": {...}}
+Envelope = Dict[str, Any]
+Handler = Callable[[List[Envelope]], None]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+POSTGRES_MAX_PAYLOAD_BYTES = 7900
+
+
+def _is_envelope(value: Any) -> bool:
+    """Whether a decoded value has the shape of an ``Envelope``."""
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("origin"), str)
+        and isinstance(value.get("session"), str)
+        and isinstance(value.get("key"), str)
+        and isinstance(value.get("message"), dict)
+    )
+
+
+class Backplane(ABC):
+    """
+    Batches published session messages and relays them to other workers.
+
+    ``publish`` only buffers: a flush task sends everything buffered every
+    ``flush_interval`` seconds, or as soon as ``max_batch`` messages are
+    waiting, packed into as few payloads of at most ``max_payload_bytes``
+    as possible. Messages for the same session and key within one batch
+    are coalesced. Messages a worker published itself are not handed back
+    to it.
+
+    Subclasses implement ``_connect``, ``_send`` and ``_disconnect`` and
+    pass incoming payloads to ``_receive``. Subclasses holding a connection
+    re-establish it with ``_retry`` when it drops.
+
+    Attributes:
+        flush_interval: Longest a message waits in the buffer, in seconds
+        max_batch: Buffered messages that trigger an early flush
+        max_payload_bytes: Largest payload handed to ``_send``
+        reconnect_delay: First wait before retrying a lost connection, in
+            seconds; doubled after each failure up to ``max_reconnect_delay``
+        max_reconnect_delay: Longest wait between reconnection attempts
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.01,
+        max_batch: int = 500,
+        max_payload_bytes: Optional[int] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_payload_bytes = max_payload_bytes
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self.worker_id = uuid.uuid4().hex
+        self.sent = 0
+        self.received = 0
+        self._handler: Optional[Handler] = None
+        self._buffer: Dict[Tuple[str, str], Envelope] = {}
+        self._full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Whether the last flush failed, so an outage is logged once
+        self._failing = False
+
+    async def _connect(self) -> None:
+        pass
+
+    @abstractmethod
+    async def _send(self, payload: str) -> None:
+        """Deliver one encoded batch to every worker, including this one."""
+
+    async def _disconnect(self) -> None:
+        pass
+
+    async def _retry(self, attempt: Callable[[], Awaitable[None]], what: str) -> None:
+        """Call ``attempt`` until it succeeds, backing off exponentially."""
+        delay = self.reconnect_delay
+        while True:
+            try:
+                await attempt()
+                self.reconnects += 1
+                return
+            except Exception:
+                logger.warning("Backplane %s failed; retrying in %.1fs", what, delay, exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def start(self, handler: Handler) -> None:
+        """
+        Connect and start relaying.
+
+        Args:
+            handler: Called with each batch of envelopes from other workers
+        """
+        self._handler = handler
+        await self._connect()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Send anything still buffered and disconnect."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        await self._disconnect()
+        self._handler = None
+
+    def publish(self, session_code: str, key: str, message: Dict[str, Any]) -> None:
+        """Buffer a message for the other workers. Never blocks."""
+        buffer_key = (session_code, key)
+        # Re-insert so a coalesced message keeps its latest position
+        self._buffer.pop(buffer_key, None)
+        self._buffer[buffer_key] = {
+            "origin": self.worker_id, "session": session_code, "key": key, "message": message
+        }
+        if len(self._buffer) >= self.max_batch:
+            self._full.set()
+
+    def _encode(self, batch: List[Envelope]) -> List[Tuple[str, List[Envelope]]]:
+        """
+        Pack envelopes into JSON arrays no larger than ``max_payload_bytes``.
+
+        Returns:
+            Each payload with the envelopes it carries
+        """
+        if self.max_payload_bytes is None:
+            return [(json.dumps(batch, separators=(",", ":")), batch)]
+
+        payloads: List[Tuple[str, List[Envelope]]] = []
+        parts: List[str] = []
+        envelopes: List[Envelope] = []
+        size = 2
+        for envelope in batch:
+            part = json.dumps(envelope, separators=(",", ":"))
+            part_size = len(part.encode("utf-8")) + 1
+            if part_size + 2 > self.max_payload_bytes:
+                logger.error("Dropping session %s message larger than the backplane limit", envelope["session"])
+                continue
+            if parts and size + part_size > self.max_payload_bytes:
+                payloads.append(("[" + ",".join(parts) + "]", envelopes))
+                parts, envelopes, size = [], [], 2
+            parts.append(part)
+            envelopes.append(envelope)
+            size += part_size
+        if parts:
+            payloads.append(("[" + ",".join(parts) + "]", envelopes))
+        return payloads
+
+    def _requeue(self, envelopes: List[Envelope]) -> None:
+        """Put unsent envelopes back, unless a newer message replaced them."""
+        requeued = {
+            (envelope["session"], envelope["key"]): envelope
+            for envelope in envelopes
+            if (envelope["session"], envelope["key"]) not in self._buffer
+        }
+        requeued.update(self._buffer)
+        self._buffer = requeued
+
+    async def flush(self) -> None:
+        """
+        Send every buffered message now.
+
+        If a send fails, the messages not yet sent go back into the buffer
+        for the next flush.
+        """
+        if not self._buffer:
+            return
+        batch = list(self._buffer.values())
+        self._buffer = {}
+        payloads = self._encode(batch)
+        for index, (payload, envelopes) in enumerate(payloads):
+            try:
+                await self._send(payload)
+            except Exception:
+                unsent = [envelope for _, rest in payloads[index:] for envelope in rest]
+                self._requeue(unsent)
+                if not self._failing:
+                    logger.exception("Failed to relay %d session messages; will retry", len(unsent))
+                self._failing = True
+                return
+            self.sent += len(envelopes)
+        if self._failing:
+            logger.info("Relaying session messages again")
+            self._failing = False
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+    def _receive(self, payload: str) -> None:
+        try:
+            envelopes = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed backplane payload")
+            return
+        if not isinstance(envelopes, list):
+            logger.warning("Ignoring backplane payload that is not a list")
+            return
+        valid = [envelope for envelope in envelopes if _is_envelope(envelope)]
+        if len(valid) < len(envelopes):
+            logger.warning("Ignoring %d malformed backplane messages", len(envelopes) - len(valid))
+        envelopes = [envelope for envelope in valid if envelope["origin"] != self.worker_id]
+        if envelopes and self._handler is not None:
+            self.received += len(envelopes)
+            self._handler(envelopes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize relay counters."""
+        return {
+            "backend": self.__class__.__name__,
+            "worker_id": self.worker_id,
+            "sent": self.sent,
+            "received": self.received,
+            "buffered": len(self._buffer),
+            "reconnects": self.reconnects,
+        }
+
+
+class InMemoryBus:
+    """Connects in-memory backplanes as if they ran in different workers."""
+
+    def __init__(self):
+        self.members: List["InMemoryBackplane"] = []
+
+
+class InMemoryBackplane(Backplane):
+    """
+    Backplane for a single worker, or for tests when given a shared bus.
+
+    Attributes:
+        bus: Backplanes that receive each other's messages
+    """
+
+    def __init__(self, bus: Optional[InMemoryBus] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.bus = bus or InMemoryBus()
+
+    async def _connect(self) -> None:
+        self.bus.members.append(self)
+
+    async def _send(self, payload: str) -> None:
+        for member in list(self.bus.members):
+            member._receive(payload)
+
+    async def _disconnect(self) -> None:
+        if self in self.bus.members:
+            self.bus.members.remove(self)
+
+
+class PostgresBackplane(Backplane):
+    """
+    Backplane over Postgres ``LISTEN``/``NOTIFY`` on a dedicated asyncpg connection.
+
+    Attributes:
+        dsn: Postgres connection string
+        channel: Notification channel name
+    """
+
+    def __init__(self, dsn: str, channel: str = "group_sessions", **kwargs):
+        kwargs.setdefault("max_payload_bytes", POSTGRES_MAX_PAYLOAD_BYTES)
+        super().__init__(**kwargs)
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._stopping = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    def _on_notification(self, conn, pid, channel, payload) -> None:
+        self._receive(payload)
+
+    def _on_termination(self, conn) -> None:
+        if self._stopping or conn is not self._conn:
+            return
+        self._conn = None
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            logger.warning("Backplane connection lost; reconnecting")
+            # LISTEN is per connection, so it is issued again on the new one;
+            # notifications sent in between are lost and superseded by the
+            # next change
+            self._reconnect_task = asyncio.create_task(self._retry(self._open, "reconnect"))
+
+    async def _open(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            conn.add_termination_listener(self._on_termination)
+            await conn.add_listener(self.channel, self._on_notification)
+        except Exception:
+            await conn.close()
+            raise
+        self._conn = conn
+
+    async def _connect(self) -> None:
+        self._stopping = False
+        await self._open()
+
+    async def _send(self, payload: str) -> None:
+        if self._conn is None or self._conn.is_closed():
+            self._conn = None
+            self._schedule_reconnect()
+            raise ConnectionError("Backplane connection is down")
+        await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def _disconnect(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+
+class RedisBackplane(Backplane):
+    """
+    Backplane over Redis pub/sub.
+
+    Requires the optional ``redis`` package.
+
+    Attributes:
+        channel: Pub/sub channel name
+    """
+
+    def __init__(self, url: str, channel: str = "geovoyager:group_sessions", **kwargs):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise Exception("BACKPLANE_BACKEND=redis requires the 'redis' package") from e
+        super().__init__(**kwargs)
+        self.channel = channel
+        self._redis = redis_asyncio.from_url(url)
+        self._pubsub = None
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def _subscribe(self) -> None:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel)
+        except Exception:
+            await pubsub.aclose()
+            raise
+        self._pubsub = pubsub
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                logger.debug("Failed to close backplane subscription", exc_info=True)
+            self._pubsub = None
+
+    async def _connect(self) -> None:
+        await self._subscribe()
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode("utf-8")
+                    self._receive(data)
+                logger.warning("Backplane subscription ended; resubscribing")
+            except Exception:
+                logger.warning("Backplane subscription lost; resubscribing", exc_info=True)
+            # Messages published in between are lost and superseded by the
+            # next change
+            await self._close_pubsub()
+            await self._retry(self._subscribe, "resubscribe")
+
+    async def _send(self, payload: str) -> None:
+        await self._redis.publish(self.channel, payload)
+
+    async def _disconnect(self) -> None:
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+            self._listen_task = None
+        await self._close_pubsub()
+        await self._redis.aclose()
+
+
+def create_backplane() -> Backplane:
+    """
+    Create the backplane selected by ``BACKPLANE_BACKEND``.
+
+    Returns:
+        Backplane: Unstarted backplane
+
+    Raises:
+        Exception: If the configured backend is unknown or unavailable
+    """
+    options = {
+        "flush_interval": settings.BACKPLANE_FLUSH_INTERVAL_SECONDS,
+        "max_batch": settings.BACKPLANE_MAX_BATCH,
+    }
+    if settings.BACKPLANE_BACKEND == "memory":
+        return InMemoryBackplane(**options)
+    if settings.BACKPLANE_BACKEND == "postgres":
+        url = make_url(settings.SQLALCHEMY_DATABASE_URL).set(drivername="postgresql")
+        return PostgresBackplane(url.render_as_string(hide_password=False), **options)
+    if settings.BACKPLANE_BACKEND == "redis":
+        return RedisBackplane(settings.REDIS_URL, **options)
+    raise Exception(f"Unknown BACKPLANE_BACKEND: {settings.BACKPLANE_BACKEND}")
@@ -0,0 +1,207 @@
+"""
+Pluggable cache for serialized API responses.
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .config import settings
+
+
+class CacheBackend(ABC):
+    """Interface for byte-string caches keyed by string."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under a key, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, expiring after ``ttl`` seconds or the backend default."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove keys; missing keys are ignored."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
+        pass
+
+
+class InMemoryLRUCache(CacheBackend):
+    """
+    Per-process LRU cache with optional per-entry TTL.
+
+    Invalidations only reach the worker that performs them, so other
+    workers may serve an entry until its TTL runs out.
+
+    Attributes:
+        max_entries: Maximum number of entries before LRU eviction
+        default_ttl: TTL in seconds applied when ``set`` is given none
+    """
+
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker, backed by Redis.
+
+    Requires the optional ``redis`` package.
+
+    Attributes:
+        prefix: Namespace prepended to every key
+        default_ttl: TTL in seconds applied when ``set`` is given none
+    """
+
+    def __init__(self, url: str, prefix: str = "geovoyager:", default_ttl: Optional[float] = None):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise Exception("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self._redis = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        px = int(ttl * 1000) if ttl is not None else None
+        await self._redis.set(self.prefix + key, value, px=px)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._redis.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=f"{self.prefix}*"):
+            await self._redis.delete(key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _version_key(key: str) -> str:
+    return f"{key}#version"
+
+
+async def versioned_key(cache: CacheBackend, key: str) -> Tuple[str, bool]:
+    """
+    Resolve a cache key to the entry for its current version.
+
+    ``invalidate_versioned`` moves a key to a new version rather than only
+    deleting its entry, so a reader that loaded the old value before the
+    write committed can only store it under the old version, which is no
+    longer read.
+
+    Args:
+        cache: Cache holding the entry
+        key: Unversioned key
+
+    Returns:
+        The entry key, and whether the key was invalidated within
+        ``READ_YOUR_WRITES_SECONDS``. In that case a replica may still
+        return the old value, so a miss should be loaded from the primary.
+    """
+    version = await cache.get(_version_key(key))
+    if version is None:
+        return key, False
+    written_ns = int(version)
+    # Compares wall clocks across workers; skew only shifts the window
+    recent = time.time_ns() - written_ns < settings.READ_YOUR_WRITES_SECONDS * 1e9
+    return f"{key}@{written_ns}", recent
+
+
+async def invalidate_versioned(cache: CacheBackend, *keys: str) -> None:
+    """
+    Invalidate keys read through ``versioned_key`` after a committed write.
+
+    Version markers outlive any entry stored under the version they
+    replace, so once a marker expires no stale entry is left to find.
+    """
+    version = str(time.time_ns()).encode()
+
+    async def invalidate(key: str) -> None:
+        entry_key, _ = await versioned_key(cache, key)
+        await cache.set(_version_key(key), version, ttl=2 * settings.CACHE_TTL_SECONDS)
+        await cache.delete(entry_key)
+
+    await asyncio.gather(*(invalidate(key) for key in keys))
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """
+    Get or create the response cache selected by ``CACHE_BACKEND``.
+
+    Returns:
+        CacheBackend: Shared cache instance
+
+    Raises:
+        Exception: If the configured backend is unknown or unavailable
+    """
+    global _cache
+
+    if _cache is None:
+        if settings.CACHE_BACKEND == "memory":
+            _cache = InMemoryLRUCache(
+                max_entries=settings.CACHE_MAX_ENTRIES,
+                default_ttl=settings.CACHE_TTL_SECONDS
+            )
+        elif settings.CACHE_BACKEND == "redis":
+            _cache = RedisCache(settings.REDIS_URL, default_ttl=settings.CACHE_TTL_SECONDS)
+        else:
+            raise Exception(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+    return _cache
+
+
+async def close_cache() -> None:
+    """Close the shared cache on shutdown."""
+    global _cache
+
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
@@ -0,0 +1,140 @@
+"""
+Local cache of Supabase JSON Web Key Sets for asymmetric JWT verification.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """
+    Keeps signing keys in memory and refreshes them in the background.
+
+    Keys are loaded once by ``start`` and then refreshed ahead of the
+    ``Cache-Control: max-age`` advertised by the server (or every
+    ``refresh_interval`` seconds). ``get_key`` never performs I/O: an
+    unknown ``kid`` returns None and schedules a single background
+    re-fetch, rate limited by ``min_refetch_interval``.
+
+    Attributes:
+        url: JWKS endpoint
+        refresh_interval: Seconds between refreshes when no max-age is sent
+        min_refetch_interval: Minimum seconds between unknown-kid re-fetches
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 600.0,
+        min_refetch_interval: float = 30.0,
+        timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        self._client = client
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._next_refresh_in = refresh_interval
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refetch_task: Optional[asyncio.Task] = None
+
+    @property
+    def kids(self) -> list:
+        """Key IDs currently loaded."""
+        return list(self._keys)
+
+    async def refresh(self) -> None:
+        """Fetch the key set and replace the cached keys."""
+        if self._client is not None:
+            response = await self._client.get(self.url, timeout=self.timeout)
+        else:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.url)
+        response.raise_for_status()
+
+        keys = {
+            key["kid"]: key
+            for key in response.json().get("keys", [])
+            if key.get("kid")
+        }
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+        # Refresh ahead of expiry so requests never see a stale set
+        match = MAX_AGE_PATTERN.search(response.headers.get("cache-control", ""))
+        max_age = float(match.group(1)) * 0.8 if match else self.refresh_interval
+        self._next_refresh_in = max(self.min_refetch_interval, min(max_age, self.refresh_interval))
+
+    async def start(self) -> None:
+        """Load the keys and start the background refresh loop."""
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Initial JWKS fetch from %s failed", self.url)
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel background refreshes."""
+        for task in (self._refresh_task, self._refetch_task):
+            if task is not None:
+                task.cancel()
+        for task in (self._refresh_task, self._refetch_task):
+            if task is not None:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._refresh_task = None
+        self._refetch_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_in)
+            try:
+                await self.refresh()
+            except (httpx.HTTPError, ValueError):
+                # Keep serving the previous keys until the next attempt
+                logger.exception("JWKS refresh from %s failed", self.url)
+
+    async def _refetch(self) -> None:
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError):
+            logger.exception("JWKS re-fetch from %s failed", self.url)
+
+    def _schedule_refetch(self) -> None:
+        if self._refetch_task is not None and not self._refetch_task.done():
+            return
+        if time.monotonic() - self._fetched_at < self.min_refetch_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refetch_task = loop.create_task(self._refetch())
+
+    def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a signing key without blocking.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            The JWK, or None if it is not (yet) known
+        """
+        key = self._keys.get(kid) if kid else None
+        if key is None:
+            self._schedule_refetch()
+        return key
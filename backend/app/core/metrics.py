@@ -0,0 +1,256 @@
+"""
+Low-overhead request, database and phase metrics in Prometheus text format.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations per label set, with running sum and count."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts..., sum, count]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, INF_LABEL)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: List[object] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+)
+DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "Database queries issued per HTTP request.", ("route",), COUNT_BUCKETS
+)
+DB_TIME = registry.histogram(
+    "http_request_db_seconds", "Time spent in database queries per HTTP request.", ("route",)
+)
+PHASE_TIME = registry.histogram(
+    "http_request_phase_seconds", "Time spent in a phase of request handling.", ("route", "phase")
+)
+DB_QUERIES_TOTAL = registry.counter(
+    "db_queries_total", "Database queries, including those outside requests.", ("engine",)
+)
+GEOFENCE_POSITIONS = registry.counter(
+    "geofence_positions_total", "Streamed geofence positions, evaluated or skipped as redundant.", ("outcome",)
+)
+
+
+@dataclass
+class RequestMetrics:
+    """Timings accumulated while handling one request."""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def start_request() -> RequestMetrics:
+    """Begin collecting metrics for the request running in this context."""
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's ``name`` phase."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[name] = metrics.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """
+    Count and time every statement executed on an engine.
+
+    Args:
+        engine: Engine to hook
+        name: Label identifying the engine in ``db_queries_total``
+    """
+    sync_engine = engine.sync_engine
+    if getattr(sync_engine, "_metrics_instrumented", False):
+        return
+    sync_engine._metrics_instrumented = True
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        DB_QUERIES_TOTAL.inc(name)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_seconds += time.perf_counter() - context._metrics_started
+
+
+def record_request(method: str, route: str, status: int, seconds: float, metrics: RequestMetrics) -> None:
+    """Fold a finished request's measurements into the histograms."""
+    REQUEST_LATENCY.observe(seconds, method, route, str(status))
+    DB_QUERIES.observe(metrics.db_queries, route)
+    DB_TIME.observe(metrics.db_seconds, route)
+    for phase, phase_seconds in metrics.phases.items():
+        PHASE_TIME.observe(phase_seconds, route, phase)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Requests are labelled with their route template (e.g.
+    ``/api/v1/pois/{poi_id}``) rather than the raw path, so label
+    cardinality stays bounded; paths matching no route are grouped as
+    ``unmatched``. Streamed bodies are timed until their last chunk.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = start_request()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            record_request(
+                scope["method"],
+                getattr(route, "path_format", None) or getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+                metrics
+            )
@@ -0,0 +1,231 @@
+"""
+Opt-in sampling profiler producing flamegraph-compatible folded stacks.
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from .auth import authenticate_token, is_admin
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Render a stack root-first as ``outer;inner;leaf``."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack from a background thread.
+
+    With ``task`` given, only samples taken while that asyncio task is
+    running on ``loop`` are kept, so concurrent requests on the same event
+    loop don't show up in each other's profiles. Work handed to other
+    threads (sync dependencies, the thread pool) is not sampled.
+
+    Attributes:
+        interval: Seconds between samples
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float = 0.001,
+        task: Optional[asyncio.Task] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        self.thread_id = thread_id
+        self.interval = interval
+        self._task = task
+        self._loop = loop
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self._task is not None and asyncio.current_task(self._loop) is not self._task:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._stacks[collapse_stack(frame)] += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the sample count per collapsed stack."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self._stacks
+
+
+@dataclass
+class Profile:
+    """A profiled request and its folded stacks."""
+    id: str
+    method: str
+    path: str
+    trigger: str
+    created_at: datetime
+    status: int = 0
+    duration_seconds: float = 0.0
+    samples: int = 0
+    folded: str = field(default="", repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        """Metadata without the stacks."""
+        data = asdict(self)
+        del data["folded"]
+        return data
+
+
+class ProfileStore:
+    """
+    Keeps the most recent profiles in memory and optionally on disk.
+
+    Attributes:
+        max_profiles: Profiles kept in memory before the oldest is dropped
+        output_dir: Directory to also write ``<timestamp>-<id>.folded`` files to
+    """
+
+    def __init__(self, max_profiles: int = 50, output_dir: Optional[str] = None):
+        self.max_profiles = max_profiles
+        self.output_dir = output_dir
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        if self.output_dir:
+            filename = f"{profile.created_at:%Y%m%dT%H%M%S}-{profile.id}.folded"
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                with open(os.path.join(self.output_dir, filename), "w") as f:
+                    f.write(profile.folded)
+            except OSError:
+                logger.exception("Failed to write profile %s", profile.id)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[Profile]:
+        """Stored profiles, newest first."""
+        return list(reversed(self._profiles.values()))
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(
+    max_profiles=settings.PROFILING_MAX_STORED,
+    output_dir=settings.PROFILING_OUTPUT_DIR
+)
+
+
+def _requested_by_admin(headers: Dict[bytes, bytes]) -> bool:
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        return is_admin(authenticate_token(token))
+    except HTTPException:
+        return False
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests with a ``StackSampler``.
+
+    A request is profiled when it carries the ``X-Profile`` header and an
+    admin bearer token, or at random with probability ``sample_rate``.
+    Profiled responses get an ``X-Profile-Id`` header naming the stored
+    profile. Only installed when ``PROFILING_ENABLED`` is set, so it costs
+    nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app: Callable[..., Awaitable[None]],
+        store: ProfileStore = profile_store,
+        sample_rate: float = 0.0,
+        interval: float = 0.001
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+    def _trigger(self, scope: Dict[str, Any]) -> Optional[str]:
+        headers = dict(scope["headers"])
+        if PROFILE_HEADER in headers and _requested_by_admin(headers):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(
+            id=uuid.uuid4().hex,
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            created_at=datetime.now(timezone.utc)
+        )
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER.lower().encode(), profile.id.encode())
+                ]
+            await send(message)
+
+        sampler = StackSampler(
+            threading.get_ident(), self.interval, task=asyncio.current_task(), loop=asyncio.get_running_loop()
+        )
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stacks = sampler.stop()
+            profile.duration_seconds = time.perf_counter() - started
+            profile.samples = sum(stacks.values())
+            profile.folded = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+            self.store.add(profile)
@@ -0,0 +1,218 @@
+"""
+In-process fan-out of group session updates to connected participants.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from .config import settings
+
+if TYPE_CHECKING:
+    from .backplane import Backplane, Envelope
+
+Message = Dict[str, Any]
+
+
+class Subscriber:
+    """
+    Outbox of one connection, coalescing updates that have not been sent yet.
+
+    Messages are keyed (e.g. ``"poi"``); a newer message replaces a pending
+    one with the same key, so a slow consumer only ever receives the latest
+    state and its outbox never holds more than ``max_pending`` messages.
+
+    Attributes:
+        max_pending: Distinct keys that may be pending before the
+            subscriber is considered too slow and dropped
+    """
+
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self.closed = False
+        self._pending: "OrderedDict[str, Message]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def offer(self, key: str, message: Message) -> bool:
+        """
+        Queue a message, replacing a pending one with the same key.
+
+        Returns:
+            False if the subscriber is closed or its outbox is full
+        """
+        if self.closed:
+            return False
+        if key in self._pending:
+            self._pending.move_to_end(key)
+        elif len(self._pending) >= self.max_pending:
+            return False
+        self._pending[key] = message
+        self._ready.set()
+        return True
+
+    async def next_batch(self) -> List[Message]:
+        """
+        Wait for and take every pending message, oldest key first.
+
+        Returns:
+            The pending messages; empty, without waiting, once the
+            subscriber is closed
+        """
+        await self._ready.wait()
+        if self.closed:
+            # A dropped subscriber's backlog is stale; the event stays set
+            # so every later call returns right away too
+            self._pending.clear()
+            return []
+        self._ready.clear()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+    def close(self) -> None:
+        """Stop accepting messages and wake the sender."""
+        self.closed = True
+        self._ready.set()
+
+
+class _Channel:
+    __slots__ = ("subscribers", "state", "seq")
+
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.state: Dict[str, Message] = {}
+        self.seq = 0
+
+
+class SessionHub:
+    """
+    Broadcasts session updates to every subscriber of a session code.
+
+    Publishing never awaits a socket: each subscriber has a bounded,
+    coalescing outbox drained by its own sender task, so one slow phone
+    cannot hold up the rest of the group. Subscribers whose outbox is full
+    are closed. A session's channel and latest state are dropped with its
+    last subscriber, so memory is bounded by the connected participants.
+
+    With a ``backplane`` attached, published messages are also relayed to
+    the other workers, which deliver them to their own subscribers.
+
+    Attributes:
+        max_pending: Outbox size given to each subscriber
+        backplane: Relay to other workers, if any
+    """
+
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self.backplane: Optional["Backplane"] = None
+        self._channels: Dict[str, _Channel] = {}
+        self.published = 0
+        self.relayed = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, session_code: str, initial: Optional[Dict[str, Message]] = None) -> Subscriber:
+        """
+        Join a session and receive its latest state.
+
+        Args:
+            session_code: Session to join
+            initial: State to start a new channel with, e.g. the session's
+                current POI as stored in the database; ignored when the
+                channel already has subscribers
+
+        Returns:
+            The subscriber to read updates from
+        """
+        channel = self._channels.get(session_code)
+        if channel is None:
+            channel = self._channels[session_code] = _Channel()
+            channel.state.update(initial or {})
+        subscriber = Subscriber(self.max_pending)
+        channel.subscribers.add(subscriber)
+        for key, message in channel.state.items():
+            subscriber.offer(key, message)
+        return subscriber
+
+    def unsubscribe(self, session_code: str, subscriber: Subscriber) -> None:
+        """Leave a session, dropping its channel once empty."""
+        subscriber.close()
+        channel = self._channels.get(session_code)
+        if channel is None:
+            return
+        channel.subscribers.discard(subscriber)
+        if not channel.subscribers:
+            del self._channels[session_code]
+
+    def publish(self, session_code: str, key: str, message: Message) -> int:
+        """
+        Fan a message out to every subscriber of a session, on every worker.
+
+        The message gets a ``seq`` so clients can ignore anything older than
+        what they have already applied. It is a hybrid logical clock: the
+        current time in microseconds, bumped past the last ``seq`` seen for
+        the session, so it keeps increasing when the leader reconnects to
+        another worker. Across workers this assumes clocks are kept in sync
+        (e.g. NTP): a worker whose clock runs behind can only order its first
+        message on a session after the last one it has seen, so an update from
+        a worker running ahead may shadow it until the next one.
+
+        Args:
+            session_code: Session to publish to
+            key: Coalescing key; only the latest message per key is kept
+            message: JSON-serializable message
+
+        Returns:
+            Number of local subscribers the message was queued for
+        """
+        channel = self._channels.get(session_code)
+        seq = max(channel.seq + 1 if channel else 0, time.time_ns() // 1000)
+        message = {**message, "seq": seq}
+        self.published += 1
+        if self.backplane is not None:
+            self.backplane.publish(session_code, key, message)
+        if channel is None:
+            return 0
+        return self._fan_out(channel, key, message)
+
+    def deliver(self, envelopes: List["Envelope"]) -> None:
+        """Fan out messages relayed from other workers to local subscribers."""
+        for envelope in envelopes:
+            channel = self._channels.get(envelope["session"])
+            if channel is None:
+                continue
+            message = envelope["message"]
+            if not isinstance(message.get("seq"), int):
+                continue
+            if message["seq"] <= channel.state.get(envelope["key"], {}).get("seq", -1):
+                # Older than what this worker already delivered
+                continue
+            self.relayed += 1
+            self._fan_out(channel, envelope["key"], message)
+
+    def _fan_out(self, channel: _Channel, key: str, message: Message) -> int:
+        channel.seq = max(channel.seq, message["seq"])
+        channel.state[key] = message
+
+        delivered = 0
+        for subscriber in list(channel.subscribers):
+            if subscriber.offer(key, message):
+                delivered += 1
+            else:
+                # Too far behind to catch up; it can reconnect for fresh state
+                subscriber.close()
+                channel.subscribers.discard(subscriber)
+                self.dropped_subscribers += 1
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize connected sessions and delivery counters."""
+        return {
+            "sessions": len(self._channels),
+            "subscribers": sum(len(channel.subscribers) for channel in self._channels.values()),
+            "published": self.published,
+            "relayed": self.relayed,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+session_hub = SessionHub(max_pending=settings.SESSION_HUB_MAX_PENDING)
@@ -1,11 +1,83 @@
 """
 Supabase client configuration and initialization.
 """
-from typing import Optional
+import asyncio
+from typing import Optional, Set
+
+import httpx
+from postgrest import AsyncPostgrestClient, AsyncRequestBuilder
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from supabase import create_client, Client
 from .config import get_settings
 
 _supabase_client: Optional[Client] = None
+_async_supabase_client: Optional["AsyncSupabaseClient"] = None
+# Closes scheduled by reset_supabase_client, kept so they are not collected
+_pending_closes: Set[asyncio.Task] = set()
+
+
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose session shares an existing connection pool."""
+
+    def __init__(self, base_url: str, *, transport: httpx.AsyncHTTPTransport, **kwargs):
+        self._transport = transport
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url, headers, timeout) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=self._transport
+        )
+
+
+class AsyncSupabaseClient:
+    """
+    Non-blocking Supabase client for use from ``async def`` handlers.
+
+    PostgREST queries and raw calls to the other Supabase services share a
+    single ``httpx`` connection pool, so connections are kept alive and
+    reused across requests instead of being opened per call.
+
+    Attributes:
+        supabase_url: Base URL of the Supabase instance
+        http: Client for auth, storage and functions endpoints
+        postgrest: Client for table queries
+    """
+
+    def __init__(
+        self,
+        supabase_url: str,
+        supabase_key: str,
+        limits: httpx.Limits,
+        timeout: httpx.Timeout
+    ):
+        self.supabase_url = supabase_url
+        self._transport = httpx.AsyncHTTPTransport(limits=limits)
+        headers = {"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"}
+        self.http = httpx.AsyncClient(
+            base_url=supabase_url,
+            headers=headers,
+            timeout=timeout,
+            transport=self._transport
+        )
+        self.postgrest = _PooledPostgrestClient(
+            f"{supabase_url}/rest/v1",
+            transport=self._transport,
+            headers={**DEFAULT_POSTGREST_CLIENT_HEADERS, **headers},
+            timeout=timeout
+        )
+
+    def table(self, table_name: str) -> AsyncRequestBuilder:
+        """Start a query against a table."""
+        return self.postgrest.from_(table_name)
+
+    async def aclose(self) -> None:
+        """Close both sessions and every pooled connection."""
+        await self.postgrest.aclose()
+        await self.http.aclose()
+        await self._transport.aclose()
 
 
 def get_supabase_client() -> Client:
@@ -34,7 +106,63 @@ def get_supabase_client() -> Client:
     return _supabase_client
 
 
+def get_async_supabase_client() -> AsyncSupabaseClient:
+    """
+    Get or create the shared async Supabase client.
+
+    Pool limits, keep-alive and timeouts come from the ``SUPABASE_HTTP_*``
+    settings. The client is normally created on app startup and closed on
+    shutdown with ``close_async_supabase_client``.
+
+    Returns:
+        AsyncSupabaseClient: Shared async client
+    """
+    global _async_supabase_client
+
+    if _async_supabase_client is None:
+        settings = get_settings()
+        _async_supabase_client = AsyncSupabaseClient(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_KEY,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SUPABASE_HTTP_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(settings.SUPABASE_HTTP_TIMEOUT_SECONDS)
+        )
+
+    return _async_supabase_client
+
+
+async def close_async_supabase_client() -> None:
+    """Close the shared async client's connection pool."""
+    global _async_supabase_client
+
+    if _async_supabase_client is not None:
+        await _async_supabase_client.aclose()
+        _async_supabase_client = None
+
+
 def reset_supabase_client() -> None:
-    """Reset the Supabase client singleton for testing purposes."""
-    global _supabase_client
+    """
+    Reset the Supabase client singletons for testing purposes.
+
+    The async client is closed: on the running event loop if there is one,
+    otherwise right away on a temporary loop.
+    """
+    global _supabase_client, _async_supabase_client
+    client = _async_supabase_client
     _supabase_client = None
+    _async_supabase_client = None
+
+    if client is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(client.aclose())
+        return
+    task = loop.create_task(client.aclose())
+    _pending_closes.add(task)
+    task.add_done_callback(_pending_closes.discard)
@@ -0,0 +1,85 @@
+"""
+Bounded cache of verified JWT claims.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenCache:
+    """
+    LRU cache of verified token claims with per-entry expiry.
+
+    Tokens are keyed by their SHA-256 digest so raw credentials are never
+    kept in memory. Each entry expires at the token's ``exp`` claim, capped
+    at ``max_ttl`` seconds, and the least recently used entry is evicted
+    once ``max_size`` is reached.
+
+    Attributes:
+        max_size: Maximum number of cached tokens
+        max_ttl: Upper bound in seconds on how long an entry is trusted
+        hits: Lookups answered from the cache
+        misses: Lookups that required full verification
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for a token, or None if absent or expired."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims until the token expires."""
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
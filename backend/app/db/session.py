@@ -0,0 +1,169 @@
+"""
+Async database engine and session factory.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """Pool queue that records how long blocking gets wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        if not block:
+            return super().get(block, timeout)
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait for a connection.
+
+    Only time spent queued for a pooled connection counts as waiting;
+    opening new connections and pre-ping are not included.
+    """
+
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+
+    @property
+    def wait_seconds_total(self) -> float:
+        return self._pool.wait_seconds_total
+
+    @property
+    def wait_seconds_max(self) -> float:
+        return self._pool.wait_seconds_max
+
+    def connect(self):
+        self.checkouts += 1
+        return super().connect()
+
+
+def create_db_engine(url: Optional[str] = None) -> AsyncEngine:
+    """
+    Create an async engine with pool settings taken from configuration.
+
+    Pool sizing applies to server databases only; for asyncpg the
+    prepared-statement caches are configured as well. Set
+    ``DB_STATEMENT_CACHE_SIZE=0`` when connecting through PgBouncer in
+    transaction mode.
+
+    Args:
+        url: Database URL, defaults to ``SQLALCHEMY_DATABASE_URL``
+
+    Returns:
+        AsyncEngine: Configured engine
+    """
+    url = make_url(url or settings.SQLALCHEMY_DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        return create_async_engine(url)
+
+    connect_args: Dict[str, Any] = {}
+    if url.get_driver_name() == "asyncpg":
+        connect_args = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Report connection pool usage.
+
+    Args:
+        engine: Engine to inspect
+
+    Returns:
+        Dict with pool size, checked-out connections and checkout wait times
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": pool.__class__.__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "wait_seconds_total": pool.wait_seconds_total,
+            "wait_seconds_max": pool.wait_seconds_max,
+            "wait_seconds_avg": pool.wait_seconds_total / pool.checkouts if pool.checkouts else 0.0,
+        })
+    return stats
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open connections ahead of traffic so the first requests don't pay for them.
+
+    Args:
+        engine: Engine whose pool to fill
+        connections: Number of connections to open concurrently
+    """
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(connections)))
+    except Exception:
+        logger.exception("Failed to warm database connection pool")
+
+
+engine = create_db_engine()
+
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Read-only endpoints use the replica when one is configured
+read_engine: Optional[AsyncEngine] = (
+    create_db_engine(settings.SQLALCHEMY_READ_REPLICA_URL)
+    if settings.SQLALCHEMY_READ_REPLICA_URL else None
+)
+
+ReadSessionLocal: Optional[async_sessionmaker] = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None else None
+)
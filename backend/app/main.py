@@ -1,12 +1,104 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select
 
+from .core.auth import jwks_cache
+from .core.backplane import create_backplane
+from .core.cache import close_cache
 from .core.config import settings
+from .core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, instrument_engine, registry
+from .core.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+from .core.session_hub import session_hub
+from .core.supabase import close_async_supabase_client, get_async_supabase_client
 from .api.v1.api import api_router
+from .db.session import SessionLocal, engine, read_engine, warm_up_pool
+from .models.poi import POI
+from .utils.cluster_grid import cluster_grid
+from .utils.spatial_index import poi_index
+
+logger = logging.getLogger(__name__)
+
+
+async def build_poi_index() -> None:
+    """Load every POI into the in-process spatial index."""
+    try:
+        async with SessionLocal() as db:
+            result = await db.execute(select(POI))
+            poi_index.build(result.scalars().all())
+    except Exception:
+        # Nearby lookups fall back to the database until the index is built
+        logger.exception("Failed to build POI spatial index")
+        return
+    logger.info("Built POI spatial index: %s", poi_index.stats())
+
+
+async def build_cluster_grid() -> None:
+    """Aggregate every POI into the map cluster grid."""
+    try:
+        async with SessionLocal() as db:
+            result = await db.execute(select(POI.id, POI.latitude, POI.longitude))
+            cluster_grid.build(result.all())
+    except Exception:
+        # Cluster requests aggregate from the database until the grid is built
+        logger.exception("Failed to build POI cluster grid")
+        return
+    logger.info("Built POI cluster grid: %s", cluster_grid.stats())
+
+
+async def start_backplane() -> None:
+    """Connect the session hub to the other workers."""
+    backplane = create_backplane()
+    try:
+        await backplane.start(session_hub.deliver)
+    except Exception:
+        # Group sessions keep working, but only within this worker
+        logger.exception("Failed to start session backplane")
+        return
+    session_hub.backplane = backplane
+
+
+async def stop_backplane() -> None:
+    """Flush and disconnect the session hub's backplane."""
+    backplane, session_hub.backplane = session_hub.backplane, None
+    if backplane is not None:
+        await backplane.stop()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm in-process caches and shared clients on startup."""
+    get_async_supabase_client()
+    await warm_up_pool(engine, settings.DB_POOL_WARM_CONNECTIONS)
+    if read_engine is not None:
+        await warm_up_pool(read_engine, settings.DB_POOL_WARM_CONNECTIONS)
+    if jwks_cache is not None:
+        await jwks_cache.start()
+    if settings.POI_INDEX_ENABLED:
+        await build_poi_index()
+    if settings.CLUSTER_GRID_ENABLED:
+        await build_cluster_grid()
+    await start_backplane()
+    yield
+    await stop_backplane()
+    poi_index.clear()
+    cluster_grid.clear()
+    if jwks_cache is not None:
+        await jwks_cache.stop()
+    await close_async_supabase_client()
+    await close_cache()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS middleware
@@ -16,8 +108,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", PROFILE_ID_HEADER],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL_SECONDS
+    )
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "primary")
+    if read_engine is not None:
+        instrument_engine(read_engine, "replica")
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -30,3 +136,9 @@ async def root():
         "version": settings.VERSION,
         "service": settings.PROJECT_NAME
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text, func
+
+from app.db.base_class import Base
+
+
+def utcnow() -> datetime:
+    """Current time in UTC, with microsecond resolution on every backend."""
+    return datetime.now(timezone.utc)
+
+
+class POI(Base):
+    """Point of interest with a geofenced location."""
+    __tablename__ = "pois"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    audio_url = Column(String(512), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set on insert as well as update so delta sync can key on it alone
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (
+        # Backs the bounding-box prefilter used by nearby queries
+        Index("ix_pois_latitude_longitude", "latitude", "longitude"),
+        Index("ix_pois_updated_at_id", "updated_at", "id"),
+    )
+
+
+class POITombstone(Base):
+    """Record of a deleted POI, kept so offline clients can sync removals."""
+    __tablename__ = "poi_tombstones"
+
+    poi_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, index=True)
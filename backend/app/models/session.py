@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.db.base_class import Base
+from app.models.poi import utcnow
+
+
+class GroupSessionState(Base):
+    """
+    Live state of a group session.
+
+    The session itself lives in Supabase (``group_sessions``); its current
+    POI is kept here so it references the POIs this API serves.
+    """
+    __tablename__ = "group_session_state"
+
+    # Supabase group_sessions.id
+    session_id = Column(String(36), primary_key=True)
+    current_poi_id = Column(Integer, ForeignKey("pois.id", ondelete="SET NULL"), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
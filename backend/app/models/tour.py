@@ -0,0 +1,30 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+
+from app.db.base_class import Base
+from app.models.poi import utcnow
+
+
+class Tour(Base):
+    """Ordered walk through a set of POIs."""
+    __tablename__ = "tours"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    created_by = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+
+class TourPOI(Base):
+    """Position of a POI within a tour."""
+    __tablename__ = "tour_pois"
+
+    tour_id = Column(Integer, ForeignKey("tours.id", ondelete="CASCADE"), primary_key=True)
+    poi_id = Column(Integer, ForeignKey("pois.id", ondelete="CASCADE"), primary_key=True)
+    sequence_number = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Finds the tours to invalidate when a POI changes
+        Index("ix_tour_pois_poi_id", "poi_id"),
+    )
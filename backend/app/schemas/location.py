@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.poi import POIInDB
+
+
+class LocationQuery(BaseModel):
+    """A user position and the geofence radius to search within."""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius: float = Field(default=20.0, gt=0, le=1000)
+
+
+class PositionUpdate(BaseModel):
+    """A position streamed by a client for geofence tracking."""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class ParticipantPosition(BaseModel):
+    """Current position of one group session participant."""
+    user_id: str = Field(..., min_length=1)
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class BatchNearbyQuery(BaseModel):
+    """Positions of every participant in a group session."""
+    session_id: Optional[str] = None
+    radius: float = Field(default=20.0, gt=0, le=1000)
+    positions: List[ParticipantPosition] = Field(..., min_length=1, max_length=500)
+
+
+class ParticipantNearby(BaseModel):
+    """POIs whose geofence a participant is currently inside."""
+    user_id: str
+    pois: List[POIInDB]
+
+
+class BatchNearbyResponse(BaseModel):
+    """Triggered POIs for each participant in a group session."""
+    session_id: Optional[str] = None
+    results: List[ParticipantNearby]
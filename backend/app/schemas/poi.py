@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, field_validator, ConfigDict, Field
 
 class POIBase(BaseModel):
@@ -53,3 +53,42 @@ class POIInDB(POIBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+class POITombstoneInDB(BaseModel):
+    """A POI removal recorded for delta sync."""
+    poi_id: int
+    deleted_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class POIChanges(BaseModel):
+    """POIs created, updated or deleted since a sync point."""
+    changes: List[POIInDB]
+    deleted: List[POITombstoneInDB]
+    next_cursor: str
+    has_more: bool
+
+class BulkImportError(BaseModel):
+    """A row rejected during bulk import."""
+    row: int
+    errors: List[str]
+
+class BulkImportResult(BaseModel):
+    """Outcome of a bulk POI import."""
+    imported: int
+    failed: int
+    errors: List[BulkImportError]
+    elapsed_seconds: float
+    rows_per_second: float
+
+class POICluster(BaseModel):
+    """POIs aggregated into one grid cell of the cluster map."""
+    latitude: float
+    longitude: float
+    count: int
+    poi_id: Optional[int] = None
+
+class POIClusters(BaseModel):
+    """Clusters covering a map viewport."""
+    zoom: int
+    clusters: List[POICluster]
@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class SetPOIMessage(BaseModel):
+    """A session leader moving the group to another POI."""
+    type: Literal["set_poi"]
+    poi_id: int = Field(..., gt=0)
@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.poi import POIInDB
+
+class TourPOIs(BaseModel):
+    """POIs of a tour, in visiting order."""
+    poi_ids: List[int] = Field(..., max_length=500)
+
+    @field_validator('poi_ids')
+    @classmethod
+    def validate_unique(cls, v: List[int]) -> List[int]:
+        """A tour visits each POI once."""
+        if len(set(v)) != len(v):
+            raise ValueError('A POI can only appear once in a tour')
+        return v
+
+class TourCreate(TourPOIs):
+    """Tour creation schema."""
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    poi_ids: List[int] = Field(default_factory=list, max_length=500)
+
+class TourInDB(BaseModel):
+    """Tour database schema."""
+    id: int
+    title: str
+    description: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TourBundle(BaseModel):
+    """Everything a client needs to start a tour, in one response."""
+    tour: TourInDB
+    pois: List[POIInDB]
+    leg_distances_meters: List[float]
+    total_distance_meters: float
+
+class TourPackageJob(BaseModel):
+    """Progress of an offline package build."""
+    id: str
+    tour_id: int
+    include_audio: bool
+    status: str
+    package_id: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,72 @@
+"""
+Single byte-range requests (RFC 9110 section 14) for resumable downloads.
+"""
+from typing import AsyncIterator, Optional, Tuple
+
+import anyio
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested range starts beyond the end of the content."""
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Resolve a ``Range`` header against content of a known size.
+
+    Only a single range is supported; multiple ranges and malformed
+    headers are ignored, so the full content is served, as RFC 9110
+    allows.
+
+    Args:
+        header: Value of the ``Range`` header, if any
+        size: Content length in bytes
+
+    Returns:
+        Inclusive (first, last) byte positions, or None to serve everything
+
+    Raises:
+        RangeNotSatisfiable: If the range lies entirely past the end
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+async def iter_file_range(
+    path: str,
+    start: int,
+    end: int,
+    chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """Yield bytes ``start`` through ``end`` (inclusive) of a file."""
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,255 @@
+"""
+Hierarchical Web Mercator grid of POI counts for zoomed-out map views.
+"""
+import math
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+
+Cell = Tuple[int, int]
+
+MERCATOR_MAX_LATITUDE = 85.0511287798
+
+# Coordinates are summed as integers in units of 1e-7 degrees (about 1 cm),
+# so centroids stay exact however many upserts and removals a cell sees
+COORDINATE_SCALE = 10_000_000
+
+# Per cell: [count, latitude sum, longitude sum, id sum]. The id sum is the
+# POI's id whenever the cell holds a single POI.
+CellStats = List[int]
+
+
+def _column(longitude: float, n: int) -> int:
+    return min(n - 1, max(0, math.floor((longitude + 180.0) / 360.0 * n)))
+
+
+def _row(latitude: float, n: int) -> int:
+    latitude = min(MERCATOR_MAX_LATITUDE, max(-MERCATOR_MAX_LATITUDE, latitude))
+    y = (1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0
+    return min(n - 1, max(0, math.floor(y * n)))
+
+
+def _fixed(degrees: float) -> int:
+    return round(degrees * COORDINATE_SCALE)
+
+
+def _cluster(stats: CellStats) -> Dict[str, Any]:
+    count, latitude_sum, longitude_sum, id_sum = stats
+    return {
+        "latitude": latitude_sum / count / COORDINATE_SCALE,
+        "longitude": longitude_sum / count / COORDINATE_SCALE,
+        "count": count,
+        "poi_id": id_sum if count == 1 else None,
+    }
+
+
+def _validate_cells_per_tile(cells_per_tile: int) -> int:
+    if cells_per_tile < 1 or cells_per_tile & (cells_per_tile - 1):
+        raise ValueError(f"cells_per_tile must be a positive power of two, got {cells_per_tile}")
+    return cells_per_tile.bit_length() - 1
+
+
+def cluster_pois(pois: Iterable[Any], zoom: int, cells_per_tile: int = 8) -> List[Dict[str, Any]]:
+    """
+    Cluster POIs at a single zoom level, as ``ClusterGrid.query`` would.
+
+    For answering a viewport from a database query when the shared grid is
+    not available, without aggregating every other level.
+
+    Args:
+        pois: Objects with ``id``, ``latitude`` and ``longitude``
+        zoom: Map zoom level
+        cells_per_tile: Cells along each edge of a map tile (a power of two)
+
+    Returns:
+        Clusters ordered north to south, then west to east
+    """
+    n = 1 << (zoom + _validate_cells_per_tile(cells_per_tile))
+    cells: Dict[Cell, CellStats] = {}
+    for poi in pois:
+        cell = (_column(poi.longitude, n), _row(poi.latitude, n))
+        stats = cells.get(cell)
+        if stats is None:
+            stats = cells[cell] = [0, 0, 0, 0]
+        stats[0] += 1
+        stats[1] += _fixed(poi.latitude)
+        stats[2] += _fixed(poi.longitude)
+        stats[3] += poi.id
+    return [_cluster(cells[cell]) for cell in sorted(cells, key=lambda cell: (cell[1], cell[0]))]
+
+
+class ClusterGrid:
+    """
+    Aggregated POI counts and centroids for every zoom level up to ``max_zoom``.
+
+    At zoom ``z`` the world is split into ``2**z * cells_per_tile`` columns
+    and rows of Web Mercator cells, so each cell is the union of four cells
+    one level deeper. Like ``POISpatialIndex``, each worker holds its own
+    copy, built at startup and kept current by the POI write endpoints;
+    writes are ignored until ``build`` has been called.
+
+    Attributes:
+        max_zoom: Deepest zoom level that is aggregated
+        cells_per_tile: Cells along each edge of a map tile (a power of two)
+    """
+
+    def __init__(self, max_zoom: int = 16, cells_per_tile: int = 8):
+        if max_zoom < 0:
+            raise ValueError(f"max_zoom must not be negative, got {max_zoom}")
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self._tile_bits = _validate_cells_per_tile(cells_per_tile)
+        self._levels: List[Dict[Cell, CellStats]] = [{} for _ in range(max_zoom + 1)]
+        self._positions: Dict[int, Tuple[float, float]] = {}
+        self._ready = False
+        self._build_seconds = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the grid has been built and can answer queries."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _cells_across(self, zoom: int) -> int:
+        return 1 << (zoom + self._tile_bits)
+
+    def _column(self, longitude: float, zoom: int) -> int:
+        return _column(longitude, self._cells_across(zoom))
+
+    def _row(self, latitude: float, zoom: int) -> int:
+        return _row(latitude, self._cells_across(zoom))
+
+    def _apply(self, poi_id: int, latitude: float, longitude: float, sign: int) -> None:
+        x = self._column(longitude, self.max_zoom)
+        y = self._row(latitude, self.max_zoom)
+        latitude_fixed, longitude_fixed = _fixed(latitude), _fixed(longitude)
+        for zoom in range(self.max_zoom, -1, -1):
+            level = self._levels[zoom]
+            cell = (x, y)
+            stats = level.get(cell)
+            if stats is None:
+                stats = level[cell] = [0, 0, 0, 0]
+            stats[0] += sign
+            if stats[0] == 0:
+                del level[cell]
+            else:
+                stats[1] += sign * latitude_fixed
+                stats[2] += sign * longitude_fixed
+                stats[3] += sign * poi_id
+            x >>= 1
+            y >>= 1
+
+    def _discard(self, poi_id: int) -> None:
+        position = self._positions.pop(poi_id, None)
+        if position is not None:
+            self._apply(poi_id, position[0], position[1], -1)
+
+    def _insert(self, poi_id: int, latitude: float, longitude: float) -> None:
+        self._positions[poi_id] = (latitude, longitude)
+        self._apply(poi_id, latitude, longitude, 1)
+
+    def build(self, pois: Iterable[Any]) -> None:
+        """
+        Replace the grid contents with the given POIs.
+
+        Args:
+            pois: Objects with ``id``, ``latitude`` and ``longitude``
+        """
+        started = time.perf_counter()
+        self._levels = [{} for _ in range(self.max_zoom + 1)]
+        self._positions = {}
+        for poi in pois:
+            self._insert(poi.id, poi.latitude, poi.longitude)
+        self._build_seconds = time.perf_counter() - started
+        self._ready = True
+
+    def upsert(self, poi: Any) -> None:
+        """Add a POI or move it to its current location. No-op until built."""
+        if not self._ready:
+            return
+        self._discard(poi.id)
+        self._insert(poi.id, poi.latitude, poi.longitude)
+
+    def remove(self, poi_id: int) -> None:
+        """Drop a POI from the grid. No-op until built."""
+        if not self._ready:
+            return
+        self._discard(poi_id)
+
+    def clear(self) -> None:
+        """Empty the grid and mark it as not ready."""
+        self._levels = [{} for _ in range(self.max_zoom + 1)]
+        self._positions = {}
+        self._ready = False
+        self._build_seconds = 0.0
+
+    def query(
+        self,
+        zoom: int,
+        west: float,
+        south: float,
+        east: float,
+        north: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the clusters of the cells overlapping a bounding box.
+
+        Args:
+            zoom: Map zoom level, capped at ``max_zoom``
+            west: Western edge in degrees; greater than ``east`` when the
+                box crosses the antimeridian
+            south: Southern edge in degrees
+            east: Eastern edge in degrees
+            north: Northern edge in degrees
+
+        Returns:
+            Clusters with ``latitude``, ``longitude`` (the centroid),
+            ``count`` and, for single-POI clusters, ``poi_id``; ordered
+            north to south, then west to east
+        """
+        zoom = min(zoom, self.max_zoom)
+        level = self._levels[zoom]
+        min_row, max_row = self._row(north, zoom), self._row(south, zoom)
+        if west <= east:
+            spans = [(self._column(west, zoom), self._column(east, zoom))]
+        else:
+            spans = [(self._column(west, zoom), self._cells_across(zoom) - 1), (0, self._column(east, zoom))]
+        cell_count = (max_row - min_row + 1) * sum(last - first + 1 for first, last in spans)
+
+        # Scanning the occupied cells is cheaper than enumerating a huge box
+        if cell_count > len(level):
+            cells = [
+                (x, y) for x, y in level
+                if min_row <= y <= max_row and any(first <= x <= last for first, last in spans)
+            ]
+        else:
+            cells = [
+                (x, y)
+                for y in range(min_row, max_row + 1)
+                for first, last in spans
+                for x in range(first, last + 1)
+                if (x, y) in level
+            ]
+        cells.sort(key=lambda cell: (cell[1], cell[0]))
+
+        return [_cluster(level[cell]) for cell in cells]
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize grid size and build time."""
+        return {
+            "ready": self._ready,
+            "pois": len(self._positions),
+            "max_zoom": self.max_zoom,
+            "cells_per_tile": self.cells_per_tile,
+            "cells": sum(len(level) for level in self._levels),
+            "build_seconds": self._build_seconds,
+        }
+
+
+cluster_grid = ClusterGrid(
+    max_zoom=settings.CLUSTER_GRID_MAX_ZOOM,
+    cells_per_tile=settings.CLUSTER_GRID_CELLS_PER_TILE
+)
@@ -0,0 +1,267 @@
+"""
+Geofence helpers for matching user positions against POI locations.
+"""
+import math
+from typing import List, NamedTuple, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+EARTH_RADIUS_METERS = 6371000.0
+
+T = TypeVar("T")
+
+
+class BoundingBox(NamedTuple):
+    """Lat/lon rectangle enclosing a circular geofence.
+
+    Attributes:
+        min_lat: Southern edge in degrees
+        max_lat: Northern edge in degrees
+        lon_ranges: One (west, east) pair, or two when the box crosses
+            the antimeridian
+    """
+    min_lat: float
+    max_lat: float
+    lon_ranges: List[Tuple[float, float]]
+
+
+def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great-circle distance between two points using haversine.
+
+    Args:
+        lat1: Latitude of the first point in degrees
+        lon1: Longitude of the first point in degrees
+        lat2: Latitude of the second point in degrees
+        lon2: Longitude of the second point in degrees
+
+    Returns:
+        Distance in meters
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def is_within_radius(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    radius: float
+) -> bool:
+    """
+    Check whether two points are within a given radius of each other.
+
+    Args:
+        lat1: Latitude of the user in degrees
+        lon1: Longitude of the user in degrees
+        lat2: Latitude of the POI in degrees
+        lon2: Longitude of the POI in degrees
+        radius: Geofence radius in meters
+
+    Returns:
+        True if the distance between the points is at most radius
+    """
+    return calculate_distance(lat1, lon1, lat2, lon2) <= radius
+
+
+def batch_distances(
+    user_lats: ArrayLike,
+    user_lons: ArrayLike,
+    poi_lats: ArrayLike,
+    poi_lons: ArrayLike
+) -> np.ndarray:
+    """
+    Calculate haversine distances from one or many users to many POIs.
+
+    Args:
+        user_lats: A single latitude, or an array of U user latitudes
+        user_lons: A single longitude, or an array of U user longitudes
+        poi_lats: Array of P POI latitudes in degrees
+        poi_lons: Array of P POI longitudes in degrees
+
+    Returns:
+        Distances in meters with shape (P,) for a single user, or (U, P)
+    """
+    phi1 = np.radians(np.asarray(user_lats, dtype=np.float64))
+    lambda1 = np.radians(np.asarray(user_lons, dtype=np.float64))
+    phi2 = np.radians(np.asarray(poi_lats, dtype=np.float64))
+    lambda2 = np.radians(np.asarray(poi_lons, dtype=np.float64))
+
+    if phi1.ndim:
+        # Broadcast users along rows and POIs along columns
+        phi1 = phi1[:, np.newaxis]
+        lambda1 = lambda1[:, np.newaxis]
+
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin((lambda2 - lambda1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def batch_within_radius(
+    user_lats: ArrayLike,
+    user_lons: ArrayLike,
+    poi_lats: ArrayLike,
+    poi_lons: ArrayLike,
+    radius: Union[float, ArrayLike]
+) -> np.ndarray:
+    """
+    Vectorized counterpart of ``is_within_radius``.
+
+    Args:
+        user_lats: A single latitude, or an array of U user latitudes
+        user_lons: A single longitude, or an array of U user longitudes
+        poi_lats: Array of P POI latitudes in degrees
+        poi_lons: Array of P POI longitudes in degrees
+        radius: Geofence radius in meters, shared or one per user
+
+    Returns:
+        Boolean mask with shape (P,) for a single user, or (U, P)
+    """
+    distances = batch_distances(user_lats, user_lons, poi_lats, poi_lons)
+    radius = np.asarray(radius, dtype=np.float64)
+    if radius.ndim:
+        radius = radius[:, np.newaxis]
+    return distances <= radius
+
+
+def filter_within_radius(
+    latitude: float,
+    longitude: float,
+    pois: Sequence[T],
+    radius: float
+) -> List[T]:
+    """
+    Keep the POIs within radius meters of a position in one vectorized pass.
+
+    Args:
+        latitude: User latitude in degrees
+        longitude: User longitude in degrees
+        pois: Objects exposing ``latitude`` and ``longitude`` attributes
+        radius: Geofence radius in meters
+
+    Returns:
+        The matching POIs, in their original order
+    """
+    if not pois:
+        return []
+    count = len(pois)
+    poi_lats = np.fromiter((poi.latitude for poi in pois), dtype=np.float64, count=count)
+    poi_lons = np.fromiter((poi.longitude for poi in pois), dtype=np.float64, count=count)
+    mask = batch_within_radius(latitude, longitude, poi_lats, poi_lons, radius)
+    return [poi for poi, inside in zip(pois, mask) if inside]
+
+
+def bounding_box(latitude: float, longitude: float, radius: float) -> BoundingBox:
+    """
+    Compute the lat/lon rectangle that fully contains a circular geofence.
+
+    The box is a cheap, index-friendly prefilter: every point within
+    ``radius`` meters lies inside it, but corners of the box do not lie
+    within the circle, so candidates still need an exact distance check.
+
+    Args:
+        latitude: Center latitude in degrees
+        longitude: Center longitude in degrees
+        radius: Geofence radius in meters
+
+    Returns:
+        BoundingBox enclosing the geofence
+    """
+    return expand_box(latitude, latitude, longitude, longitude, radius)
+
+
+def expand_box(
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    radius: float
+) -> BoundingBox:
+    """
+    Grow a lat/lon rectangle so it contains every point within radius of it.
+
+    Args:
+        min_lat: Southern edge in degrees
+        max_lat: Northern edge in degrees
+        min_lon: Western edge in degrees
+        max_lon: Eastern edge in degrees
+        radius: Distance to grow by in meters
+
+    Returns:
+        BoundingBox enclosing the grown rectangle
+    """
+    # Meridians converge away from the equator, so widen by the edge nearest a pole
+    widest_lat = max(abs(min_lat), abs(max_lat))
+    angular_radius = radius / EARTH_RADIUS_METERS
+    d_lat = math.degrees(angular_radius)
+    min_lat -= d_lat
+    max_lat += d_lat
+
+    # Near a pole the circle covers every meridian
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return BoundingBox(max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)])
+
+    d_lon = math.degrees(
+        math.asin(min(1.0, math.sin(angular_radius) / math.cos(math.radians(widest_lat))))
+    )
+    min_lon -= d_lon
+    max_lon += d_lon
+
+    if max_lon - min_lon >= 360.0:
+        lon_ranges = [(-180.0, 180.0)]
+    elif min_lon < -180.0:
+        lon_ranges = [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    elif max_lon > 180.0:
+        lon_ranges = [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    else:
+        lon_ranges = [(min_lon, max_lon)]
+
+    return BoundingBox(min_lat, max_lat, lon_ranges)
+
+
+def grid_cell(latitude: float, longitude: float, cell_size: float) -> Tuple[int, int]:
+    """
+    Snap a position to the (row, column) of a uniform lat/lon grid.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        cell_size: Edge length of a grid cell in degrees
+
+    Returns:
+        Grid cell containing the position
+    """
+    return math.floor(latitude / cell_size), math.floor(longitude / cell_size)
+
+
+def grid_cells_overlapping(box: BoundingBox, cell_size: float) -> List[Tuple[int, int]]:
+    """
+    List the grid cells that overlap a bounding box.
+
+    Args:
+        box: Area to cover
+        cell_size: Edge length of a grid cell in degrees
+
+    Returns:
+        (row, column) pairs of every overlapping cell
+    """
+    min_row = math.floor(box.min_lat / cell_size)
+    max_row = math.floor(box.max_lat / cell_size)
+    return [
+        (row, col)
+        for row in range(min_row, max_row + 1)
+        for west, east in box.lon_ranges
+        for col in range(math.floor(west / cell_size), math.floor(east / cell_size) + 1)
+    ]
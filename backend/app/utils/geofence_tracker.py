@@ -0,0 +1,55 @@
+"""
+Incremental geofence evaluation for a stream of positions from one user.
+"""
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from app.utils.geofence import calculate_distance, filter_within_radius
+
+T = TypeVar("T")
+
+
+class GeofenceTracker(Generic[T]):
+    """
+    Tracks which POI geofences one user is inside as they move.
+
+    Positions closer than ``min_move_meters`` to the last evaluated one are
+    skipped, so GPS jitter while standing still costs neither a candidate
+    lookup nor any events. Distance is measured from the last *evaluated*
+    position, so slow drift still gets evaluated once it adds up.
+
+    Attributes:
+        radius: Geofence radius in meters
+        min_move_meters: Movement below which a position is skipped
+        inside: POIs the user is currently inside, by ID
+    """
+
+    def __init__(self, radius: float, min_move_meters: float = 5.0):
+        self.radius = radius
+        self.min_move_meters = min_move_meters
+        self.inside: Dict[Any, T] = {}
+        self._last: Optional[Tuple[float, float]] = None
+
+    def should_evaluate(self, latitude: float, longitude: float) -> bool:
+        """Whether a position moved far enough to be worth evaluating."""
+        return self._last is None or calculate_distance(*self._last, latitude, longitude) >= self.min_move_meters
+
+    def update(self, latitude: float, longitude: float, candidates: Sequence[T]) -> Tuple[List[T], List[Any]]:
+        """
+        Evaluate a position against candidate POIs.
+
+        Args:
+            latitude: User latitude in degrees
+            longitude: User longitude in degrees
+            candidates: Objects exposing ``id``, ``latitude`` and
+                ``longitude``, covering at least every POI within
+                ``radius`` of the position
+
+        Returns:
+            POIs entered, in candidate order, and IDs of POIs exited, sorted
+        """
+        self._last = (latitude, longitude)
+        current = {poi.id: poi for poi in filter_within_radius(latitude, longitude, candidates, self.radius)}
+        entered = [poi for poi_id, poi in current.items() if poi_id not in self.inside]
+        exited = sorted(poi_id for poi_id in self.inside if poi_id not in current)
+        self.inside = current
+        return entered, exited
@@ -0,0 +1,136 @@
+"""
+Incremental parsing of streamed NDJSON and CSV request bodies.
+"""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+
+# (row number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+INVALID_UTF8 = "Line is not valid UTF-8"
+
+
+def _decode_line(line: bytes) -> Optional[str]:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Split a stream of byte chunks into UTF-8 text lines.
+
+    Each line is decoded on its own, so a bad byte sequence only spoils the
+    line it is on.
+
+    Args:
+        chunks: Raw body chunks, e.g. ``request.stream()``
+
+    Yields:
+        Lines without their trailing newline, or None for a line that is
+        not valid UTF-8
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield _decode_line(line)
+    if pending:
+        yield _decode_line(pending)
+
+
+async def iter_ndjson_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Record]:
+    """Parse one JSON object per line, skipping blank lines."""
+    row = 0
+    async for line in lines:
+        if line is None:
+            row += 1
+            yield row, None, INVALID_UTF8
+            continue
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, record, None
+
+
+class _LineFeed:
+    """Hands lines to ``csv.reader`` and notes when it asks for more."""
+
+    def __init__(self, lines: List[str]):
+        self._lines = iter(lines)
+        self.starved = False
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        try:
+            # csv keeps the newline inside a quoted field only if it is given one
+            return f"{next(self._lines)}\n"
+        except StopIteration:
+            self.starved = True
+            raise
+
+
+async def iter_csv_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Record]:
+    """
+    Parse CSV with a header row, supporting quoted fields that span lines.
+
+    Lines are collected until ``csv.reader`` can finish a record without
+    asking for another one, so quoting follows the csv module's rules.
+    Empty cells are returned as None so optional fields validate cleanly.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    row = 0
+    async for line in lines:
+        if line is None:
+            # The record this line belongs to cannot be recovered
+            pending = []
+            row += 1
+            yield row, None, INVALID_UTF8
+            continue
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+
+        feed = _LineFeed(pending)
+        try:
+            values = next(csv.reader(feed), [])
+        except csv.Error as e:
+            pending = []
+            row += 1
+            yield row, None, f"Invalid CSV: {str(e)}"
+            continue
+        if feed.starved:
+            # Inside a quoted field that continues on the next line
+            continue
+        pending = []
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, {name: value if value != "" else None for name, value in zip(header, values)}, None
+
+    if pending:
+        yield row + 1, None, "Unterminated quoted field"
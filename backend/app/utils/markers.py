@@ -0,0 +1,110 @@
+"""
+Compact marker encodings and slippy-map tile math for the map feed.
+"""
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+import orjson
+
+MARKERS_BINARY_MEDIA_TYPE = "application/vnd.geovoyager.markers"
+
+MAX_TILE_ZOOM = 22
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Geographic bounds of a Web Mercator (XYZ) tile.
+
+    The top and bottom rows are stretched to the poles so POIs beyond the
+    Mercator limit of ~85.05° still land in a tile.
+
+    Args:
+        z: Zoom level
+        x: Tile column, 0 at the antimeridian
+        y: Tile row, 0 at the north
+
+    Returns:
+        Tuple of (south, north, west, east) in degrees
+    """
+    n = 1 << z
+
+    def row_latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    north = 90.0 if y == 0 else row_latitude(y)
+    south = -90.0 if y == n - 1 else row_latitude(y + 1)
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    return south, north, west, east
+
+
+def encode_markers_json(
+    ids: Sequence[int],
+    titles: Sequence[str],
+    latitudes: Sequence[float],
+    longitudes: Sequence[float]
+) -> bytes:
+    """Encode markers as one JSON array per column."""
+    return orjson.dumps({
+        "count": len(ids),
+        "ids": list(ids),
+        "titles": list(titles),
+        "latitudes": list(latitudes),
+        "longitudes": list(longitudes),
+    })
+
+
+def encode_markers_binary(
+    ids: Sequence[int],
+    titles: Sequence[str],
+    latitudes: Sequence[float],
+    longitudes: Sequence[float]
+) -> bytes:
+    """
+    Encode markers as packed little-endian columns.
+
+    Layout, with every column starting on a 4-byte boundary so clients can
+    wrap it in a typed array without copying:
+
+    - ``uint32`` marker count ``n``
+    - ``int32[n]`` ids
+    - ``float32[n]`` latitudes (~2m precision)
+    - ``float32[n]`` longitudes
+    - ``uint16[n]`` UTF-8 byte length of each title
+    - the UTF-8 titles, concatenated
+
+    Returns:
+        The encoded feed
+    """
+    encoded_titles = [title.encode("utf-8") for title in titles]
+    return b"".join((
+        np.array([len(ids)], dtype="<u4").tobytes(),
+        np.asarray(ids, dtype="<i4").tobytes(),
+        np.asarray(latitudes, dtype="<f4").tobytes(),
+        np.asarray(longitudes, dtype="<f4").tobytes(),
+        np.array([len(title) for title in encoded_titles], dtype="<u2").tobytes(),
+        b"".join(encoded_titles),
+    ))
+
+
+def decode_markers_binary(payload: bytes) -> dict:
+    """
+    Decode a feed produced by ``encode_markers_binary``.
+
+    Returns:
+        Dict of column name to numpy array (titles as a list of str)
+    """
+    count = int(np.frombuffer(payload, dtype="<u4", count=1)[0])
+    offset = 4
+    columns = {}
+    for name, dtype in (("ids", "<i4"), ("latitudes", "<f4"), ("longitudes", "<f4"), ("title_lengths", "<u2")):
+        columns[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += columns[name].nbytes
+
+    titles = []
+    for length in columns.pop("title_lengths").tolist():
+        titles.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    columns["titles"] = titles
+    return columns
@@ -0,0 +1,157 @@
+"""
+Quantized-location cache of nearby POI candidates.
+"""
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.core.cache import CacheBackend, get_cache, invalidate_versioned, versioned_key
+from app.core.config import settings
+from app.schemas.poi import POIInDB
+from app.utils.geofence import (
+    EARTH_RADIUS_METERS,
+    BoundingBox,
+    bounding_box,
+    expand_box,
+    grid_cell,
+    grid_cells_overlapping,
+)
+
+CACHED_LATITUDE_LIMIT = 80.0
+
+_candidates_adapter = TypeAdapter(List[POIInDB])
+
+
+class CachedCell(NamedTuple):
+    """
+    Result of a cell lookup, to be passed back to ``NearbyCache.set``.
+
+    Attributes:
+        key: Cache key of the cell's current version
+        candidates: Cached candidates, or None on a miss
+        recently_changed: Whether a POI in reach of the cell changed within
+            ``READ_YOUR_WRITES_SECONDS``
+    """
+
+    key: str
+    candidates: Optional[List[POIInDB]]
+    recently_changed: bool
+
+
+class NearbyCache:
+    """
+    Caches, per grid cell, every POI that could be within ``max_radius`` of
+    a position in that cell.
+
+    Queries snap the user's position to a cell, fetch the cell's candidates
+    and run the exact radius check on them. Because a cell's candidates
+    cover the largest supported radius, one entry serves every query radius
+    up to ``max_radius``. A POI write invalidates every cell within
+    ``max_radius`` of its old and new location.
+
+    Attributes:
+        cell_size: Edge length of a grid cell in degrees
+        max_radius: Largest query radius in meters the cache can answer
+        hits: Lookups answered from the cache
+        misses: Lookups that had to query the database
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        cell_size: float = 0.005,
+        max_radius: float = 1000.0
+    ):
+        self._backend = backend
+        self.cell_size = cell_size
+        self.max_radius = max_radius
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        """Cache backend, defaulting to the shared response cache."""
+        return self._backend if self._backend is not None else get_cache()
+
+    def _key(self, cell: Tuple[int, int]) -> str:
+        return f"nearby:{self.cell_size}:{cell[0]}:{cell[1]}"
+
+    def supports(self, latitude: float, longitude: float, radius: float) -> bool:
+        """Whether a query can be answered from the cache."""
+        # Near the poles candidate areas would span every meridian
+        return radius <= self.max_radius and abs(latitude) + self.cell_size < CACHED_LATITUDE_LIMIT
+
+    def candidate_box(self, latitude: float, longitude: float) -> BoundingBox:
+        """Area whose POIs make up the candidates of the position's cell."""
+        row, col = grid_cell(latitude, longitude, self.cell_size)
+        return expand_box(
+            row * self.cell_size,
+            (row + 1) * self.cell_size,
+            col * self.cell_size,
+            (col + 1) * self.cell_size,
+            self.max_radius
+        )
+
+    async def get(self, latitude: float, longitude: float) -> CachedCell:
+        """Look up the cached candidates for the position's cell."""
+        cell = grid_cell(latitude, longitude, self.cell_size)
+        key, recently_changed = await versioned_key(self.backend, self._key(cell))
+        cached = await self.backend.get(key)
+        if cached is None:
+            self.misses += 1
+            return CachedCell(key, None, recently_changed)
+        self.hits += 1
+        return CachedCell(key, _candidates_adapter.validate_json(cached), recently_changed)
+
+    async def set(self, cell: CachedCell, candidates: Iterable[Any]) -> List[POIInDB]:
+        """
+        Cache the candidates for a cell that missed.
+
+        Candidates are stored under the version seen by ``get``, so a load
+        that raced with a POI write is never read back. Loads shortly after
+        a write are not stored at all, since a replica may not have the
+        write yet.
+
+        Args:
+            cell: Lookup returned by ``get`` for the position
+            candidates: POIs inside ``candidate_box`` for the position
+
+        Returns:
+            The candidates as POIInDB instances
+        """
+        pois = [POIInDB.model_validate(poi) for poi in candidates]
+        if not cell.recently_changed:
+            await self.backend.set(cell.key, _candidates_adapter.dump_json(pois))
+        return pois
+
+    async def invalidate(self, *positions: Tuple[float, float]) -> None:
+        """Drop every cell whose candidates could include the given positions."""
+        reach = math.degrees(self.max_radius / EARTH_RADIUS_METERS)
+        keys = {
+            self._key(cell)
+            for latitude, longitude in positions
+            # Positions this close to a pole can't be near any cached cell
+            if abs(latitude) - reach < CACHED_LATITUDE_LIMIT
+            for cell in grid_cells_overlapping(
+                bounding_box(latitude, longitude, self.max_radius), self.cell_size
+            )
+        }
+        await invalidate_versioned(self.backend, *keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize hit rate and grid configuration."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cell_size_degrees": self.cell_size,
+            "max_radius_meters": self.max_radius,
+        }
+
+
+nearby_cache = NearbyCache(
+    cell_size=settings.NEARBY_CACHE_CELL_SIZE_DEGREES,
+    max_radius=settings.NEARBY_CACHE_MAX_RADIUS_METERS
+)
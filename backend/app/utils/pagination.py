@@ -0,0 +1,47 @@
+"""
+Opaque cursor encoding for keyset pagination.
+"""
+import base64
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    Args:
+        position: Sort key values of the last row on the page
+
+    Returns:
+        Cursor string to hand back to the client
+    """
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        The keyset position
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}") from e
+    if not isinstance(position, dict):
+        raise InvalidCursorError("Invalid cursor: expected an object")
+    return position
@@ -0,0 +1,103 @@
+"""
+Fast encoding of POI lists read from trusted sources.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, List
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.metrics import timed_phase
+from app.schemas.poi import POIInDB
+
+POI_FIELDS = tuple(POIInDB.model_fields)
+
+# The stdlib writes floats below this magnitude in exponent form ("1e-05")
+# while orjson writes them out ("0.00001")
+_EXPONENT_THRESHOLD = 1e-4
+
+
+def _stock_dumps(pois: Iterable[Any]) -> bytes:
+    """Encode exactly like FastAPI does for ``response_model=List[POIInDB]``."""
+    validated = [POIInDB.model_validate(poi) for poi in pois]
+    return json.dumps(
+        jsonable_encoder(validated),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dump_pois(pois: Iterable[Any]) -> bytes:
+    """
+    Serialize POIs to the same bytes as the ``List[POIInDB]`` response model.
+
+    Rows are read attribute by attribute without re-validation, so only pass
+    ORM rows or POIInDB instances, which already satisfy the schema.
+
+    Args:
+        pois: POI ORM objects or POIInDB instances
+
+    Returns:
+        JSON array as UTF-8 bytes
+    """
+    rows: List[dict] = [{field: getattr(poi, field) for field in POI_FIELDS} for poi in pois]
+    for row in rows:
+        for coordinate in (row["latitude"], row["longitude"]):
+            if coordinate and abs(coordinate) < _EXPONENT_THRESHOLD:
+                # Rare near the equator or prime meridian; keep the exact bytes
+                return _stock_dumps(rows)
+    return orjson.dumps(rows, option=orjson.OPT_UTC_Z)
+
+
+def dump_ndjson(rows: Iterable[Any]) -> bytes:
+    """Serialize POIs as newline-delimited JSON, one object per line."""
+    return b"".join(
+        orjson.dumps({field: getattr(row, field) for field in POI_FIELDS}, option=orjson.OPT_UTC_Z) + b"\n"
+        for row in rows
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def dump_csv(rows: Iterable[Any], header: bool = False) -> bytes:
+    """
+    Serialize POIs as CSV with one column per ``POIInDB`` field.
+
+    Missing values are written as empty cells, which the bulk import reads
+    back as None.
+
+    Args:
+        rows: POI rows to write
+        header: Whether to start with the column names
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(POI_FIELDS)
+    writer.writerows(
+        [_csv_value(getattr(row, field)) for field in POI_FIELDS]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+class POIListResponse(Response):
+    """JSON response for lists of trusted POIs, encoded with ``dump_pois``."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timed_phase("serialization"):
+            return dump_pois(content)
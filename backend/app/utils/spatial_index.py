@@ -0,0 +1,178 @@
+"""
+In-process grid index over POI coordinates for fast geofence matching.
+"""
+import math
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from app.core.config import settings
+from app.schemas.poi import POIInDB
+from app.utils.geofence import bounding_box, filter_within_radius
+
+Cell = Tuple[int, int]
+
+
+class POISpatialIndex:
+    """
+    Uniform lat/lon grid mapping cells to the POIs they contain.
+
+    Each worker process holds its own copy, built once at startup and kept
+    current by the POI write endpoints. Until ``build`` has been called the
+    index reports itself as not ready and writes are ignored, so callers
+    should fall back to the database.
+
+    Attributes:
+        cell_size: Edge length of a grid cell in degrees
+    """
+
+    def __init__(self, cell_size: float = 0.01):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._pois: Dict[int, POIInDB] = {}
+        self._ready = False
+        self._build_seconds = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been built and can answer queries."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._pois)
+
+    def _cell_for(self, latitude: float, longitude: float) -> Cell:
+        return (
+            math.floor(latitude / self.cell_size),
+            math.floor(longitude / self.cell_size)
+        )
+
+    def _insert(self, poi: POIInDB) -> None:
+        self._pois[poi.id] = poi
+        self._cells.setdefault(self._cell_for(poi.latitude, poi.longitude), set()).add(poi.id)
+
+    def _discard(self, poi_id: int) -> None:
+        poi = self._pois.pop(poi_id, None)
+        if poi is None:
+            return
+        cell = self._cell_for(poi.latitude, poi.longitude)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(poi_id)
+            if not members:
+                del self._cells[cell]
+
+    def build(self, pois: Iterable[Any]) -> None:
+        """
+        Replace the index contents with the given POIs.
+
+        Args:
+            pois: POI ORM objects or POIInDB instances
+        """
+        started = time.perf_counter()
+        self._cells = {}
+        self._pois = {}
+        for poi in pois:
+            self._insert(POIInDB.model_validate(poi))
+        self._build_seconds = time.perf_counter() - started
+        self._ready = True
+
+    def upsert(self, poi: Any) -> None:
+        """Add a POI or move it to its current location. No-op until built."""
+        if not self._ready:
+            return
+        snapshot = POIInDB.model_validate(poi)
+        self._discard(snapshot.id)
+        self._insert(snapshot)
+
+    def remove(self, poi_id: int) -> None:
+        """Drop a POI from the index. No-op until built."""
+        if not self._ready:
+            return
+        self._discard(poi_id)
+
+    def clear(self) -> None:
+        """Empty the index and mark it as not ready."""
+        self._cells = {}
+        self._pois = {}
+        self._ready = False
+        self._build_seconds = 0.0
+
+    def _candidate_cells(self, latitude: float, longitude: float, radius: float) -> Iterable[Cell]:
+        box = bounding_box(latitude, longitude, radius)
+        min_row = math.floor(box.min_lat / self.cell_size)
+        max_row = math.floor(box.max_lat / self.cell_size)
+        spans = [
+            (math.floor(west / self.cell_size), math.floor(east / self.cell_size))
+            for west, east in box.lon_ranges
+        ]
+        cell_count = (max_row - min_row + 1) * sum(east - west + 1 for west, east in spans)
+
+        # Scanning the occupied cells is cheaper than enumerating a huge box
+        if cell_count > len(self._cells):
+            return [
+                (row, col) for row, col in self._cells
+                if min_row <= row <= max_row
+                and any(west <= col <= east for west, east in spans)
+            ]
+
+        return [
+            (row, col)
+            for row in range(min_row, max_row + 1)
+            for west, east in spans
+            for col in range(west, east + 1)
+        ]
+
+    def candidates(self, latitude: float, longitude: float, radius: float) -> List[POIInDB]:
+        """
+        Collect POIs in the grid cells overlapping a geofence's bounding box.
+
+        Candidates may lie outside the geofence and still need an exact
+        distance check.
+        """
+        return [
+            self._pois[poi_id]
+            for cell in self._candidate_cells(latitude, longitude, radius)
+            for poi_id in self._cells.get(cell, ())
+        ]
+
+    def query_radius(self, latitude: float, longitude: float, radius: float) -> List[POIInDB]:
+        """
+        Find POIs within radius meters of a position.
+
+        Args:
+            latitude: User latitude in degrees
+            longitude: User longitude in degrees
+            radius: Geofence radius in meters
+
+        Returns:
+            Matching POIs ordered by ID
+        """
+        candidates = self.candidates(latitude, longitude, radius)
+        matches = filter_within_radius(latitude, longitude, candidates, radius)
+        matches.sort(key=lambda poi: poi.id)
+        return matches
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index structures and POI snapshots."""
+        total = sys.getsizeof(self._cells) + sys.getsizeof(self._pois)
+        for cell, members in self._cells.items():
+            total += sys.getsizeof(cell) + sys.getsizeof(members)
+        for poi in self._pois.values():
+            total += sys.getsizeof(poi) + sys.getsizeof(poi.__dict__)
+            total += sum(sys.getsizeof(value) for value in poi.__dict__.values())
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize index size, memory use and build time."""
+        return {
+            "ready": self._ready,
+            "pois": len(self._pois),
+            "cells": len(self._cells),
+            "cell_size_degrees": self.cell_size,
+            "memory_bytes": self.memory_bytes(),
+            "build_seconds": self._build_seconds,
+        }
+
+
+poi_index = POISpatialIndex(cell_size=settings.POI_INDEX_CELL_SIZE_DEGREES)
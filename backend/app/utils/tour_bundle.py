@@ -0,0 +1,54 @@
+"""
+Precomputed tour bundles: a tour's ordered POIs with leg and route distances.
+"""
+from typing import Any, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache, invalidate_versioned
+from app.models.tour import TourPOI
+from app.schemas.tour import TourBundle
+from app.utils.geofence import calculate_distance
+
+
+def tour_bundle_key(tour_id: int) -> str:
+    return f"tour-bundle:{tour_id}"
+
+
+def build_tour_bundle(tour: Any, pois: Sequence[Any]) -> TourBundle:
+    """
+    Assemble a tour bundle from a tour and its POIs in visiting order.
+
+    Legs are great-circle distances between consecutive POIs, not walking
+    routes, so they are a lower bound on the distance actually walked.
+
+    Args:
+        tour: Tour ORM object or schema
+        pois: The tour's POIs, ordered by sequence number
+
+    Returns:
+        TourBundle with one leg per pair of consecutive POIs
+    """
+    legs = [
+        calculate_distance(origin.latitude, origin.longitude, destination.latitude, destination.longitude)
+        for origin, destination in zip(pois, pois[1:])
+    ]
+    return TourBundle(
+        tour=tour,
+        pois=list(pois),
+        leg_distances_meters=legs,
+        total_distance_meters=sum(legs)
+    )
+
+
+async def tours_containing(db: AsyncSession, poi_id: int) -> List[int]:
+    """IDs of the tours that visit a POI."""
+    result = await db.execute(select(TourPOI.tour_id).where(TourPOI.poi_id == poi_id))
+    return list(result.scalars().all())
+
+
+async def invalidate_tour_bundles(*tour_ids: int) -> None:
+    """Drop the cached bundles of tours whose POIs or order changed."""
+    if tour_ids:
+        await invalidate_versioned(get_cache(), *(tour_bundle_key(tour_id) for tour_id in tour_ids))
@@ -0,0 +1,352 @@
+"""
+Offline tour packages: a tour bundle and its narration audio, zipped and content-addressed.
+"""
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import os
+import re
+import socket
+import tempfile
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import anyio
+import httpx
+
+from app.core.config import settings
+from app.schemas.tour import TourBundle
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_FORMAT_VERSION = 1
+PACKAGE_MEDIA_TYPE = "application/zip"
+MANIFEST_NAME = "manifest.json"
+
+_PACKAGE_ID = re.compile(r"[0-9a-f]{64}")
+_EXTENSION = re.compile(r"\.[A-Za-z0-9]{1,8}")
+# Fixed entry timestamp, so identical contents always zip to identical bytes
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_CHUNK_SIZE = 64 * 1024
+
+
+class AudioUnavailable(Exception):
+    """A narration file could not be included in a package."""
+
+
+def audio_client() -> httpx.AsyncClient:
+    """
+    HTTP client used to fetch narration audio.
+
+    Redirects are not followed: every URL fetched has to pass
+    ``check_audio_url``, and a redirect would skip it.
+    """
+    return httpx.AsyncClient(timeout=settings.TOUR_PACKAGE_FETCH_TIMEOUT_SECONDS, follow_redirects=False)
+
+
+def _audio_hosts() -> List[str]:
+    return settings.TOUR_PACKAGE_AUDIO_HOSTS or [urlparse(settings.SUPABASE_URL).hostname or ""]
+
+
+async def _resolve(host: str, port: int) -> List[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+def _is_public(address: str) -> bool:
+    # Drop any IPv6 zone ID, and judge IPv4-mapped addresses by their IPv4 part
+    ip = ipaddress.ip_address(address.split("%")[0])
+    ip = getattr(ip, "ipv4_mapped", None) or ip
+    return not (
+        ip.is_private or ip.is_loopback or ip.is_link_local
+        or ip.is_reserved or ip.is_multicast or ip.is_unspecified
+    )
+
+
+async def check_audio_url(url: str) -> None:
+    """
+    Make sure an audio URL points at an allowed, public host.
+
+    Audio URLs come from POI data, so without this check anyone who can
+    edit a POI could make the server fetch internal endpoints.
+
+    Raises:
+        AudioUnavailable: If the URL is not http(s), its host is not in
+            ``TOUR_PACKAGE_AUDIO_HOSTS``, or it resolves to a non-public address
+    """
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if parsed.scheme not in ("http", "https") or host not in _audio_hosts():
+        raise AudioUnavailable(f"{host or url!r} is not an allowed audio host")
+    if settings.TOUR_PACKAGE_AUDIO_ALLOW_PRIVATE:
+        return
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = await _resolve(host, port)
+    except (ValueError, OSError) as e:
+        raise AudioUnavailable(f"could not resolve {host}: {e}") from e
+    for address in addresses:
+        if not _is_public(address):
+            raise AudioUnavailable(f"{host} resolves to non-public address {address}")
+
+
+def package_path(package_id: str, output_dir: Optional[str] = None) -> str:
+    """
+    Locate a stored package.
+
+    Raises:
+        ValueError: If ``package_id`` is not a SHA-256 hex digest
+    """
+    if not _PACKAGE_ID.fullmatch(package_id):
+        raise ValueError(f"Invalid package ID: {package_id}")
+    return os.path.join(output_dir or settings.TOUR_PACKAGE_DIR, f"{package_id}.zip")
+
+
+def _audio_extension(url: str) -> str:
+    extension = os.path.splitext(urlparse(url).path)[1]
+    return extension.lower() if _EXTENSION.fullmatch(extension) else ""
+
+
+async def _fetch_audio(client: httpx.AsyncClient, url: str, destination: Optional[str]) -> Dict[str, Any]:
+    """Download an audio file, hashing it and optionally saving it to ``destination``."""
+    await check_audio_url(url)
+    digest = hashlib.sha256()
+    size = 0
+    f = await anyio.open_file(destination, "wb") if destination else None
+    try:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.TOUR_PACKAGE_MAX_AUDIO_BYTES:
+                    raise AudioUnavailable(f"larger than {settings.TOUR_PACKAGE_MAX_AUDIO_BYTES} bytes")
+                digest.update(chunk)
+                if f is not None:
+                    await f.write(chunk)
+    finally:
+        if f is not None:
+            await f.aclose()
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+def _write_zip(archive: str, manifest: Dict[str, Any], files: Dict[str, str]) -> Tuple[str, int]:
+    """Write the package and return its SHA-256 and size."""
+    with zipfile.ZipFile(archive, "w") as zf:
+        info = zipfile.ZipInfo(MANIFEST_NAME, date_time=_ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        zf.writestr(info, json.dumps(manifest, sort_keys=True, separators=(",", ":")))
+        for name, source in sorted(files.items()):
+            # Audio is already compressed
+            info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+            with open(source, "rb") as src, zf.open(info, "w") as dst:
+                while chunk := src.read(_CHUNK_SIZE):
+                    dst.write(chunk)
+
+    digest = hashlib.sha256()
+    with open(archive, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest(), os.path.getsize(archive)
+
+
+def prune_packages(
+    output_dir: Optional[str] = None,
+    max_age_seconds: Optional[float] = None,
+    max_total_bytes: Optional[int] = None,
+    keep: Optional[str] = None
+) -> int:
+    """
+    Delete stored packages that are too old or don't fit the size cap.
+
+    Packages older than ``max_age_seconds`` go first, then the oldest
+    remaining ones until the rest add up to at most ``max_total_bytes``.
+    A deleted package is simply rebuilt when its tour is packaged again.
+
+    Args:
+        output_dir: Package directory, defaulting to ``TOUR_PACKAGE_DIR``
+        max_age_seconds: Defaults to ``TOUR_PACKAGE_MAX_AGE_SECONDS``
+        max_total_bytes: Defaults to ``TOUR_PACKAGE_MAX_TOTAL_BYTES``
+        keep: ID of a package to keep regardless, e.g. one just built
+
+    Returns:
+        Number of packages deleted
+    """
+    output_dir = output_dir or settings.TOUR_PACKAGE_DIR
+    if max_age_seconds is None:
+        max_age_seconds = settings.TOUR_PACKAGE_MAX_AGE_SECONDS
+    if max_total_bytes is None:
+        max_total_bytes = settings.TOUR_PACKAGE_MAX_TOTAL_BYTES
+
+    packages = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            package_id, extension = os.path.splitext(entry.name)
+            if extension != ".zip" or not _PACKAGE_ID.fullmatch(package_id) or package_id == keep:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            packages.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in packages)
+    if keep is not None:
+        try:
+            total += os.path.getsize(package_path(keep, output_dir))
+        except FileNotFoundError:
+            pass
+
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+    for mtime, size, path in sorted(packages):
+        if mtime >= cutoff and total <= max_total_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+async def build_tour_package(
+    bundle: TourBundle,
+    include_audio: bool,
+    client: httpx.AsyncClient,
+    output_dir: Optional[str] = None
+) -> Tuple[str, int]:
+    """
+    Build and store the offline package of a tour.
+
+    The package is a zip holding ``manifest.json`` (the tour bundle plus
+    the URL, size and SHA-256 of each POI's narration) and, with
+    ``include_audio``, the audio files themselves under
+    ``audio/<sha256><ext>``. Its ID is the SHA-256 of the zip, so an
+    unchanged tour always yields the same package and ID. Audio that
+    can't be fetched is listed with a null size and hash rather than
+    failing the whole package.
+
+    Args:
+        bundle: The tour to package
+        include_audio: Whether to embed the audio bytes
+        client: HTTP client to fetch audio with
+        output_dir: Where to store packages, defaulting to ``TOUR_PACKAGE_DIR``
+
+    Returns:
+        The package ID and its size in bytes
+    """
+    output_dir = output_dir or settings.TOUR_PACKAGE_DIR
+    await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_dir) as workdir:
+        # POIs sharing a narration file fetch it once
+        urls = sorted({poi.audio_url for poi in bundle.pois if poi.audio_url})
+        semaphore = asyncio.Semaphore(settings.TOUR_PACKAGE_FETCH_CONCURRENCY)
+
+        async def fetch(index: int, url: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+            destination = os.path.join(workdir, str(index)) if include_audio else None
+            async with semaphore:
+                try:
+                    return destination, await _fetch_audio(client, url, destination)
+                except (httpx.HTTPError, AudioUnavailable) as e:
+                    logger.warning("Leaving %s out of tour %s package: %s", url, bundle.tour.id, e)
+                    return None, None
+
+        results = await asyncio.gather(*(fetch(index, url) for index, url in enumerate(urls)))
+        fetched = dict(zip(urls, results))
+
+        audio: List[Dict[str, Any]] = []
+        files: Dict[str, str] = {}
+        for poi in bundle.pois:
+            if not poi.audio_url:
+                continue
+            source, info = fetched[poi.audio_url]
+            entry = {
+                "poi_id": poi.id,
+                "url": poi.audio_url,
+                "size": info["size"] if info else None,
+                "sha256": info["sha256"] if info else None,
+                "path": None,
+            }
+            if info and source:
+                entry["path"] = f"audio/{info['sha256']}{_audio_extension(poi.audio_url)}"
+                files[entry["path"]] = source
+            audio.append(entry)
+
+        manifest = {
+            "format_version": PACKAGE_FORMAT_VERSION,
+            "include_audio": include_audio,
+            **bundle.model_dump(mode="json"),
+            "audio": audio,
+        }
+        archive = os.path.join(workdir, "package.zip")
+        package_id, size = await asyncio.to_thread(_write_zip, archive, manifest, files)
+        os.replace(archive, package_path(package_id, output_dir))
+    deleted = await asyncio.to_thread(prune_packages, output_dir, keep=package_id)
+    if deleted:
+        logger.info("Pruned %d old tour packages", deleted)
+    return package_id, size
+
+
+@dataclass
+class PackageJob:
+    """A queued or finished package build."""
+    tour_id: int
+    include_audio: bool
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "pending"
+    package_id: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+
+class PackageJobStore:
+    """
+    Keeps the most recent package jobs of this worker in memory.
+
+    Attributes:
+        max_jobs: Jobs kept before the oldest is dropped
+    """
+
+    def __init__(self, max_jobs: int = 200):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, PackageJob]" = OrderedDict()
+
+    def add(self, job: PackageJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[PackageJob]:
+        return self._jobs.get(job_id)
+
+    def clear(self) -> None:
+        self._jobs.clear()
+
+
+package_jobs = PackageJobStore(max_jobs=settings.TOUR_PACKAGE_MAX_JOBS)
+
+
+async def run_package_job(job: PackageJob, bundle: TourBundle) -> None:
+    """Build a job's package, recording the outcome on the job."""
+    job.status = "running"
+    try:
+        async with audio_client() as client:
+            job.package_id, job.size = await build_tour_package(bundle, job.include_audio, client)
+    except Exception:
+        logger.exception("Failed to build package for tour %s", job.tour_id)
+        job.status = "failed"
+        job.error = "Package build failed"
+    else:
+        job.status = "done"
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
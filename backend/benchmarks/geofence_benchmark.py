@@ -0,0 +1,52 @@
+"""
+Benchmark the vectorized geofence check against the scalar one.
+
+Run from the backend directory:
+
+    python -m benchmarks.geofence_benchmark
+"""
+import random
+import timeit
+
+import numpy as np
+
+from app.utils.geofence import batch_within_radius, is_within_radius
+
+USER_LAT, USER_LON = 48.8584, 2.2945
+RADIUS = 20.0
+REPEAT = 5
+
+
+def make_pois(count: int):
+    rng = random.Random(42)
+    return (
+        [USER_LAT + rng.uniform(-0.05, 0.05) for _ in range(count)],
+        [USER_LON + rng.uniform(-0.05, 0.05) for _ in range(count)],
+    )
+
+
+def main() -> None:
+    print(f"{'POIs':>8} {'scalar ms':>10} {'batch ms':>10} {'speedup':>8}")
+    for count in (100, 1_000, 10_000, 100_000):
+        lats, lons = make_pois(count)
+        lat_array = np.array(lats)
+        lon_array = np.array(lons)
+
+        def scalar():
+            return [
+                is_within_radius(USER_LAT, USER_LON, lat, lon, RADIUS)
+                for lat, lon in zip(lats, lons)
+            ]
+
+        def batch():
+            return batch_within_radius(USER_LAT, USER_LON, lat_array, lon_array, RADIUS)
+
+        assert scalar() == batch().tolist()
+        number = max(1, 100_000 // count)
+        scalar_ms = min(timeit.repeat(scalar, number=number, repeat=REPEAT)) / number * 1000
+        batch_ms = min(timeit.repeat(batch, number=number, repeat=REPEAT)) / number * 1000
+        print(f"{count:>8} {scalar_ms:>10.3f} {batch_ms:>10.3f} {scalar_ms / batch_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
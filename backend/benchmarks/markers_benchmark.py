@@ -0,0 +1,60 @@
+"""
+Compare marker feed payload size and parse time against the full POI list.
+
+Run from the backend directory:
+
+    python -m benchmarks.markers_benchmark
+"""
+import json
+import random
+import timeit
+from datetime import datetime, timezone
+
+from app.schemas.poi import POIInDB
+from app.utils.markers import decode_markers_binary, encode_markers_binary, encode_markers_json
+from app.utils.serialization import dump_pois
+
+REPEAT = 5
+
+
+def make_pois(count: int):
+    rng = random.Random(42)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        POIInDB(
+            id=poi_id,
+            title=f"Point of interest {poi_id}",
+            description="A few sentences about the history of this place. " * 6,
+            latitude=48.8584 + rng.uniform(-0.5, 0.5),
+            longitude=2.2945 + rng.uniform(-0.5, 0.5),
+            audio_url=f"https://storage.example.com/audio/{poi_id}.mp3",
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        for poi_id in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    print(f"{'POIs':>8} {'feed':>8} {'KiB':>10} {'parse ms':>10}")
+    for count in (1_000, 10_000, 100_000):
+        pois = make_pois(count)
+        columns = (
+            [poi.id for poi in pois],
+            [poi.title for poi in pois],
+            [poi.latitude for poi in pois],
+            [poi.longitude for poi in pois],
+        )
+        feeds = (
+            ("full", dump_pois(pois), json.loads),
+            ("json", encode_markers_json(*columns), json.loads),
+            ("binary", encode_markers_binary(*columns), decode_markers_binary),
+        )
+        for name, payload, parse in feeds:
+            number = max(1, 100_000 // count)
+            parse_ms = min(timeit.repeat(lambda: parse(payload), number=number, repeat=REPEAT)) / number * 1000
+            print(f"{count:>8} {name:>8} {len(payload) / 1024:>10.1f} {parse_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark the fast POI list encoder against FastAPI's response-model path.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization_benchmark
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from app.models.poi import POI
+from app.utils.serialization import _stock_dumps, dump_pois
+
+REPEAT = 5
+
+
+def make_pois(count: int):
+    rng = random.Random(42)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        POI(
+            id=poi_id,
+            title=f"Point of interest {poi_id}",
+            description="A short description of what makes this place worth a stop.",
+            latitude=48.8584 + rng.uniform(-0.05, 0.05),
+            longitude=2.2945 + rng.uniform(-0.05, 0.05),
+            audio_url=f"https://storage.example.com/audio/{poi_id}.mp3",
+            created_at=created_at,
+            updated_at=created_at + timedelta(seconds=poi_id),
+        )
+        for poi_id in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    print(f"{'POIs':>8} {'stock ms':>10} {'fast ms':>10} {'speedup':>8}")
+    for count in (10, 100, 1_000):
+        pois = make_pois(count)
+
+        def stock():
+            return _stock_dumps(pois)
+
+        def fast():
+            return dump_pois(pois)
+
+        assert stock() == fast()
+        number = max(1, 10_000 // count)
+        stock_ms = min(timeit.repeat(stock, number=number, repeat=REPEAT)) / number * 1000
+        fast_ms = min(timeit.repeat(fast, number=number, repeat=REPEAT)) / number * 1000
+        print(f"{count:>8} {stock_ms:>10.3f} {fast_ms:>10.3f} {stock_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
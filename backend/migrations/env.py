@@ -9,6 +9,8 @@ from alembic import context
 
 from app.db.base_class import Base
 from app.models.poi import POI  # Import all models here
+from app.models.session import GroupSessionState
+from app.models.tour import Tour, TourPOI
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
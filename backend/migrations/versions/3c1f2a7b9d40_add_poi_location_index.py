@@ -0,0 +1,26 @@
+"""Add POI latitude/longitude index
+
+Revision ID: 3c1f2a7b9d40
+Revises: 946acacc9ebb
+Create Date: 2025-05-02 10:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f2a7b9d40'
+down_revision: Union[str, None] = '946acacc9ebb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pois_latitude_longitude', 'pois', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pois_latitude_longitude', table_name='pois')
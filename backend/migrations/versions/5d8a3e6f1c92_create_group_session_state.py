@@ -0,0 +1,32 @@
+"""Create group session state table
+
+Revision ID: 5d8a3e6f1c92
+Revises: 7e4d0c2a5b18
+Create Date: 2025-05-12 09:41:17.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a3e6f1c92'
+down_revision: Union[str, None] = '7e4d0c2a5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('group_session_state',
+    sa.Column('session_id', sa.String(length=36), nullable=False),
+    sa.Column('current_poi_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['current_poi_id'], ['pois.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('group_session_state')
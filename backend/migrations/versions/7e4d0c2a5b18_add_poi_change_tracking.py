@@ -0,0 +1,37 @@
+"""Add POI change tracking for delta sync
+
+Revision ID: 7e4d0c2a5b18
+Revises: 3c1f2a7b9d40
+Create Date: 2025-05-06 14:41:09.530117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4d0c2a5b18'
+down_revision: Union[str, None] = '3c1f2a7b9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows created before updated_at was set on insert
+    op.execute("UPDATE pois SET updated_at = created_at WHERE updated_at IS NULL")
+    op.create_index('ix_pois_updated_at_id', 'pois', ['updated_at', 'id'], unique=False)
+
+    op.create_table('poi_tombstones',
+    sa.Column('poi_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('poi_id')
+    )
+    op.create_index(op.f('ix_poi_tombstones_deleted_at'), 'poi_tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_poi_tombstones_deleted_at'), table_name='poi_tombstones')
+    op.drop_table('poi_tombstones')
+    op.drop_index('ix_pois_updated_at_id', table_name='pois')
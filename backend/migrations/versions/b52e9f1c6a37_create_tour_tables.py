@@ -0,0 +1,48 @@
+"""Create tour tables
+
+Revision ID: b52e9f1c6a37
+Revises: 5d8a3e6f1c92
+Create Date: 2025-05-20 10:12:44.281903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e9f1c6a37'
+down_revision: Union[str, None] = '5d8a3e6f1c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tours',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tours_id'), 'tours', ['id'], unique=False)
+
+    op.create_table('tour_pois',
+    sa.Column('tour_id', sa.Integer(), nullable=False),
+    sa.Column('poi_id', sa.Integer(), nullable=False),
+    sa.Column('sequence_number', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['poi_id'], ['pois.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tour_id'], ['tours.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tour_id', 'poi_id')
+    )
+    op.create_index('ix_tour_pois_poi_id', 'tour_pois', ['poi_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tour_pois_poi_id', table_name='tour_pois')
+    op.drop_table('tour_pois')
+    op.drop_index(op.f('ix_tours_id'), table_name='tours')
+    op.drop_table('tours')
@@ -0,0 +1,94 @@
+"""
+Unit tests for read/write session routing.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.api import deps
+from app.db import session as db_session
+
+
+@pytest.fixture(autouse=True)
+def reset_recent_writers():
+    deps.recent_writers.clear()
+    yield
+    deps.recent_writers.clear()
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Configure a fake replica session factory."""
+    replica_session = MagicMock(name="replica_session")
+
+    class ReplicaSessionLocal:
+        async def __aenter__(self):
+            return replica_session
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(db_session, "ReadSessionLocal", ReplicaSessionLocal)
+    return replica_session
+
+
+async def resolve(dependency, db, user):
+    generator = dependency(db=db, current_user=user)
+    session = await generator.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await generator.__anext__()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replica(monkeypatch):
+    """
+    Given: No read replica configured
+    When: Resolving a read session
+    Then: It should be the primary session
+    """
+    monkeypatch.setattr(db_session, "ReadSessionLocal", None)
+    primary = MagicMock(name="primary_session")
+
+    assert await resolve(deps.get_read_db, primary, {"sub": "reader"}) is primary
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica(replica):
+    """
+    Given: A read replica
+    When: A user who has not written resolves a read session
+    Then: It should be a replica session
+    """
+    primary = MagicMock(name="primary_session")
+
+    assert await resolve(deps.get_read_db, primary, {"sub": "reader"}) is replica
+
+
+@pytest.mark.asyncio
+async def test_reads_stay_on_primary_after_own_write(replica):
+    """
+    Given: A read replica
+    When: A user writes and then reads
+    Then: The writer reads from the primary, other users from the replica
+    """
+    primary = MagicMock(name="primary_session")
+
+    await resolve(deps.get_write_db, primary, {"sub": "admin"})
+
+    assert await resolve(deps.get_read_db, primary, {"sub": "admin"}) is primary
+    assert await resolve(deps.get_read_db, primary, {"sub": "reader"}) is replica
+
+
+def test_recent_writers_window_expires(monkeypatch):
+    """
+    Given: A 5 second read-your-writes window
+    When: A user wrote 6 seconds ago
+    Then: Their reads should no longer be pinned to the primary
+    """
+    clock = iter([100.0, 103.0, 106.0])
+    monkeypatch.setattr(deps.time, "monotonic", lambda: next(clock))
+    writers = deps.RecentWriters(window=5.0)
+
+    writers.record("admin")
+    assert writers.wrote_recently("admin")
+    assert not writers.wrote_recently("admin")
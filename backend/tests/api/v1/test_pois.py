@@ -1,8 +1,25 @@
 import pytest
 from fastapi import status
+from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from starlette.websockets import WebSocketDisconnect
 from tests.conftest import TestingSessionLocal
-from app.models.poi import POI
+from datetime import datetime, timedelta
+import json
+from jose import jwt
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.core.cache import get_cache, versioned_key
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.base_class import Base
+from app.main import app
+from app.models.poi import POI, utcnow
+from app.utils.cluster_grid import cluster_grid
+from app.utils.markers import MARKERS_BINARY_MEDIA_TYPE, decode_markers_binary
+from app.utils.spatial_index import poi_index
 import asyncio
 
 class TestPOIEndpoints:
@@ -127,3 +144,682 @@ class TestPOIEndpoints:
             headers=auth_headers
         )
         assert get_response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_get_nearby_pois(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: One POI next to the user and one POI across town
+        When: Fetching POIs within 20m of the user's location
+        Then: Should return only the POI inside the geofence
+        """
+        for poi_data in (
+            {"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+            {"title": "Louvre", "latitude": 48.8606, "longitude": 2.3376},
+        ):
+            create_response = await async_client.post(
+                "/api/v1/pois",
+                json=poi_data,
+                headers=auth_headers
+            )
+            assert create_response.status_code == status.HTTP_201_CREATED
+
+        response = await async_client.get(
+            "/api/v1/pois/nearby",
+            params={"latitude": 48.85845, "longitude": 2.29452, "radius": 20},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        titles = [poi["title"] for poi in response.json()]
+        assert titles == ["Eiffel Tower"]
+
+    @pytest.mark.asyncio
+    async def test_get_nearby_pois_sees_new_poi_after_cached_query(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A nearby query whose candidates have been cached
+        When: A POI is created next to the user and the query is repeated
+        Then: The new POI should be returned despite the cached candidates
+        """
+        params = {"latitude": 48.85845, "longitude": 2.29452, "radius": 20}
+        first = await async_client.get("/api/v1/pois/nearby", params=params, headers=auth_headers)
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json() == []
+
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        assert create_response.status_code == status.HTTP_201_CREATED
+
+        second = await async_client.get("/api/v1/pois/nearby", params=params, headers=auth_headers)
+        assert [poi["title"] for poi in second.json()] == ["Eiffel Tower"]
+
+    @pytest.mark.asyncio
+    async def test_get_poi_markers(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: POIs in Paris and Sydney
+        When: Fetching the marker feed for the whole map and for one tile, in both encodings
+        Then: Should return compact columns limited to the tile's POIs
+        """
+        for poi_data in (
+            {"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945, "description": "x" * 500},
+            {"title": "Opera House", "latitude": -33.8568, "longitude": 151.2153},
+        ):
+            create_response = await async_client.post("/api/v1/pois", json=poi_data, headers=auth_headers)
+            assert create_response.status_code == status.HTTP_201_CREATED
+
+        response = await async_client.get("/api/v1/pois/markers", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["titles"] == ["Eiffel Tower", "Opera House"]
+        assert "description" not in data
+
+        # Zoom 1 tile 1/0 is the north-east quadrant, which holds only Paris
+        response = await async_client.get(
+            "/api/v1/pois/markers",
+            params={"format": "binary", "z": 1, "x": 1, "y": 0},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == MARKERS_BINARY_MEDIA_TYPE
+        assert decode_markers_binary(response.content)["titles"] == ["Eiffel Tower"]
+
+        response = await async_client.get(
+            "/api/v1/pois/markers", params={"z": 1, "x": 1}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await async_client.get(
+            "/api/v1/pois/markers", params={"z": 1, "x": 2, "y": 0}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_get_poi_clusters(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: Two POIs in Paris and one in Sydney
+        When: Fetching world clusters at zoom 2, before and after the grid is built and a POI is deleted
+        Then: Should return the same counts from both paths and reflect the delete
+        """
+        poi_ids = []
+        for poi_data in (
+            {"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+            {"title": "Louvre", "latitude": 48.8606, "longitude": 2.3376},
+            {"title": "Opera House", "latitude": -33.8568, "longitude": 151.2153},
+        ):
+            create_response = await async_client.post("/api/v1/pois", json=poi_data, headers=auth_headers)
+            assert create_response.status_code == status.HTTP_201_CREATED
+            poi_ids.append(create_response.json()["id"])
+
+        params = {"bbox": "-180,-90,180,90", "zoom": 2}
+        response = await async_client.get("/api/v1/pois/clusters", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [cluster["count"] for cluster in response.json()["clusters"]] == [2, 1]
+
+        async with TestingSessionLocal() as db:
+            result = await db.execute(select(POI))
+            cluster_grid.build(result.scalars().all())
+        try:
+            await async_client.delete(f"/api/v1/pois/{poi_ids[0]}", headers=auth_headers)
+            response = await async_client.get("/api/v1/pois/clusters", params=params, headers=auth_headers)
+            clusters = response.json()["clusters"]
+            assert [cluster["count"] for cluster in clusters] == [1, 1]
+            assert clusters[0]["poi_id"] == poi_ids[1]
+        finally:
+            cluster_grid.clear()
+
+        response = await async_client.get(
+            "/api/v1/pois/clusters", params={"bbox": "1,2,3", "zoom": 2}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_get_nearby_pois_batch(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: Two POIs and a group whose participants are spread between them
+        When: Fetching nearby POIs for the whole group in one request
+        Then: Should return the triggered POIs for each participant
+        """
+        for poi_data in (
+            {"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+            {"title": "Louvre", "latitude": 48.8606, "longitude": 2.3376},
+        ):
+            create_response = await async_client.post(
+                "/api/v1/pois",
+                json=poi_data,
+                headers=auth_headers
+            )
+            assert create_response.status_code == status.HTTP_201_CREATED
+
+        response = await async_client.post(
+            "/api/v1/pois/nearby:batch",
+            json={
+                "session_id": "TOUR42",
+                "radius": 20,
+                "positions": [
+                    {"user_id": "leader", "latitude": 48.85845, "longitude": 2.29452},
+                    {"user_id": "straggler", "latitude": 48.8606, "longitude": 2.3376},
+                    {"user_id": "lost", "latitude": 40.7128, "longitude": -74.0060},
+                ]
+            },
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["session_id"] == "TOUR42"
+        triggered = {
+            result["user_id"]: [poi["title"] for poi in result["pois"]]
+            for result in data["results"]
+        }
+        assert triggered == {
+            "leader": ["Eiffel Tower"],
+            "straggler": ["Louvre"],
+            "lost": [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_pois_cursor_pagination(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: Five existing POIs
+        When: Walking the catalog two POIs at a time with the next cursor
+        Then: Should visit every POI exactly once and stop on the last page
+        """
+        for i in range(5):
+            create_response = await async_client.post(
+                "/api/v1/pois",
+                json={"title": f"POI {i}", "latitude": 48.0 + i, "longitude": 2.0},
+                headers=auth_headers
+            )
+            assert create_response.status_code == status.HTTP_201_CREATED
+
+        titles = []
+        params = {"limit": 2}
+        while True:
+            response = await async_client.get("/api/v1/pois", params=params, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            titles.extend(poi["title"] for poi in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert titles == [f"POI {i}" for i in range(5)]
+
+        # Offset pagination keeps working for existing clients
+        response = await async_client.get(
+            "/api/v1/pois",
+            params={"skip": 3, "limit": 2},
+            headers=auth_headers
+        )
+        assert [poi["title"] for poi in response.json()] == ["POI 3", "POI 4"]
+
+    @pytest.mark.asyncio
+    async def test_list_pois_invalid_cursor(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A tampered pagination cursor
+        When: Listing POIs with it
+        Then: Should return 400
+        """
+        response = await async_client.get(
+            "/api/v1/pois",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_get_poi_changes_delta_sync(self, async_client: AsyncClient, auth_headers: dict, monkeypatch):
+        """
+        Given: A client that has synced two POIs, with no safety window
+        When: One POI is updated, one deleted and one created, then the client syncs again
+        Then: Should return only the updated and created POIs plus a tombstone
+        """
+        monkeypatch.setattr(settings, "POI_CHANGES_SAFETY_WINDOW_SECONDS", 0)
+        poi_ids = []
+        for title in ("Kept", "Removed"):
+            create_response = await async_client.post(
+                "/api/v1/pois",
+                json={"title": title, "latitude": 48.8584, "longitude": 2.2945},
+                headers=auth_headers
+            )
+            poi_ids.append(create_response.json()["id"])
+        kept_id, removed_id = poi_ids
+
+        response = await async_client.get("/api/v1/pois/changes", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        initial = response.json()
+        assert [poi["title"] for poi in initial["changes"]] == ["Kept", "Removed"]
+        assert initial["deleted"] == []
+        assert initial["has_more"] is False
+
+        await async_client.put(
+            f"/api/v1/pois/{kept_id}",
+            json={"title": "Kept (renamed)"},
+            headers=auth_headers
+        )
+        await async_client.delete(f"/api/v1/pois/{removed_id}", headers=auth_headers)
+        await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Added", "latitude": 48.8606, "longitude": 2.3376},
+            headers=auth_headers
+        )
+
+        response = await async_client.get(
+            "/api/v1/pois/changes",
+            params={"since": initial["next_cursor"]},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        delta = response.json()
+        assert [poi["title"] for poi in delta["changes"]] == ["Kept (renamed)", "Added"]
+        assert [tombstone["poi_id"] for tombstone in delta["deleted"]] == [removed_id]
+
+        # Nothing new since the latest cursor
+        response = await async_client.get(
+            "/api/v1/pois/changes",
+            params={"since": delta["next_cursor"]},
+            headers=auth_headers
+        )
+        assert response.json()["changes"] == []
+        assert response.json()["deleted"] == []
+
+    @pytest.mark.asyncio
+    async def test_get_poi_changes_rescans_safety_window(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A client that has synced, and a row from a slow transaction stamped before its cursor
+        When: The client syncs again
+        Then: Should return the late row instead of skipping it
+        """
+        await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Synced", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        response = await async_client.get("/api/v1/pois/changes", headers=auth_headers)
+        cursor = response.json()["next_cursor"]
+
+        async with TestingSessionLocal() as session:
+            late = POI(title="Late commit", latitude=48.8606, longitude=2.3376)
+            late.updated_at = utcnow() - timedelta(seconds=10)
+            session.add(late)
+            await session.commit()
+
+        response = await async_client.get(
+            "/api/v1/pois/changes",
+            params={"since": cursor},
+            headers=auth_headers
+        )
+        assert "Late commit" in [poi["title"] for poi in response.json()["changes"]]
+
+    @pytest.mark.asyncio
+    async def test_get_poi_changes_since_timestamp(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: An existing POI
+        When: Syncing from a timestamp in the future, and from a malformed value
+        Then: Should return no changes, and 400 respectively
+        """
+        await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Old", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+
+        response = await async_client.get(
+            "/api/v1/pois/changes",
+            params={"since": "2999-01-01T00:00:00Z"},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["changes"] == []
+
+        response = await async_client.get(
+            "/api/v1/pois/changes",
+            params={"since": "yesterday"},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_ndjson(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: An NDJSON body with two valid rows, a malformed line and an invalid POI
+        When: Bulk importing it
+        Then: Should insert the valid rows and report each bad row
+        """
+        body = "\n".join([
+            '{"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945}',
+            '{"title": "Broken",',
+            '',
+            '{"title": "Nowhere", "latitude": 91.0, "longitude": 0.0}',
+            '{"title": "Louvre", "latitude": 48.8606, "longitude": 2.3376}',
+        ])
+
+        response = await async_client.post(
+            "/api/v1/pois/bulk",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [error["row"] for error in data["errors"]] == [2, 3]
+        assert "latitude" in data["errors"][1]["errors"][0]
+        assert data["rows_per_second"] > 0
+
+        list_response = await async_client.get("/api/v1/pois", headers=auth_headers)
+        assert [poi["title"] for poi in list_response.json()] == ["Eiffel Tower", "Louvre"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_csv(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A CSV body whose description spans several lines
+        When: Bulk importing it
+        Then: Should import the row with its multi-line description intact
+        """
+        body = (
+            "title,latitude,longitude,description,audio_url\r\n"
+            'Notre-Dame,48.8530,2.3499,"Gothic cathedral,\nbuilt 1163-1345",\r\n'
+            "Bad audio,48.8530,2.3499,,ftp://example.com/a.mp3\r\n"
+        )
+
+        response = await async_client.post(
+            "/api/v1/pois/bulk",
+            content=body,
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["failed"] == 1
+        assert data["errors"][0]["row"] == 2
+
+        list_response = await async_client.get("/api/v1/pois", headers=auth_headers)
+        (poi,) = list_response.json()
+        assert poi["description"] == "Gothic cathedral,\nbuilt 1163-1345"
+        assert poi["audio_url"] is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_reports_invalid_utf8_per_row(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A CSV body with a Latin-1 encoded row between two UTF-8 rows
+        When: Bulk importing it
+        Then: Should import the UTF-8 rows and report the bad one instead of failing the request
+        """
+        body = (
+            "title,latitude,longitude\n".encode()
+            + "Café de Flore,48.8541,2.3326\n".encode("latin-1")
+            + "Sacré-Cœur,48.8867,2.3431\n".encode()
+        )
+
+        response = await async_client.post(
+            "/api/v1/pois/bulk",
+            content=body,
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["errors"] == [{"row": 1, "errors": ["Line is not valid UTF-8"]}]
+
+    @pytest.mark.asyncio
+    async def test_export_pois_ndjson_updated_range(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: Two POIs last updated a year apart
+        When: Exporting as NDJSON with and without an updated_at range
+        Then: Should stream one JSON object per POI, limited to the range when given
+        """
+        for title, updated_at in (("Old", datetime(2024, 1, 1)), ("New", datetime(2025, 1, 1))):
+            create_response = await async_client.post(
+                "/api/v1/pois",
+                json={"title": title, "latitude": 48.8584, "longitude": 2.2945},
+                headers=auth_headers
+            )
+            async with TestingSessionLocal() as db:
+                await db.execute(
+                    update(POI).where(POI.id == create_response.json()["id"]).values(updated_at=updated_at)
+                )
+                await db.commit()
+
+        response = await async_client.get("/api/v1/pois/export", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["Old", "New"]
+
+        response = await async_client.get(
+            "/api/v1/pois/export",
+            params={"updated_from": "2024-06-01T00:00:00Z", "updated_to": "2025-06-01T00:00:00Z"},
+            headers=auth_headers
+        )
+        assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["New"]
+
+    @pytest.mark.asyncio
+    async def test_export_pois_csv_round_trips_through_bulk_import(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A POI with a multi-line description
+        When: Exporting as CSV and bulk importing the export
+        Then: The imported copy should match the original
+        """
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Notre-Dame", "latitude": 48.8530, "longitude": 2.3499, "description": "Gothic,\ncathedral"},
+            headers=auth_headers
+        )
+        assert create_response.status_code == status.HTTP_201_CREATED
+
+        response = await async_client.get("/api/v1/pois/export", params={"format": "csv"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text.startswith("title,description,latitude,longitude,audio_url,id,created_at,updated_at\n")
+
+        import_response = await async_client.post(
+            "/api/v1/pois/bulk",
+            content=response.content,
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        assert import_response.json()["imported"] == 1
+
+        list_response = await async_client.get("/api/v1/pois", headers=auth_headers)
+        original, copy = list_response.json()
+        assert copy["description"] == original["description"] == "Gothic,\ncathedral"
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_unsupported_media_type(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A JSON array body
+        When: Bulk importing it
+        Then: Should return 415
+        """
+        response = await async_client.post(
+            "/api/v1/pois/bulk",
+            json=[{"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945}],
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    @pytest.mark.asyncio
+    async def test_get_poi_conditional_requests(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: An existing POI fetched once
+        When: Revalidating with its ETag before and after an update
+        Then: Should return 304 while unchanged and the updated POI afterwards
+        """
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Original Title", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        poi_id = create_response.json()["id"]
+
+        response = await async_client.get(f"/api/v1/pois/{poi_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = await async_client.get(
+            f"/api/v1/pois/{poi_id}",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+        response = await async_client.get(
+            f"/api/v1/pois/{poi_id}",
+            headers={**auth_headers, "If-Modified-Since": last_modified}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        await async_client.put(
+            f"/api/v1/pois/{poi_id}",
+            json={"title": "Updated Title"},
+            headers=auth_headers
+        )
+
+        response = await async_client.get(
+            f"/api/v1/pois/{poi_id}",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Updated Title"
+        assert response.headers["ETag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_get_poi_ignores_refill_from_before_update(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A reader that resolved a POI's cache key and loaded it just before an update committed
+        When: That reader stores the old POI after the update, and the POI is fetched again
+        Then: Should return the updated POI
+        """
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Original Title", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        poi_id = create_response.json()["id"]
+        cache = get_cache()
+        stale_key, _ = await versioned_key(cache, f"poi:{poi_id}")
+        stale_entry = json.dumps({
+            "etag": '"stale"', "last_modified": "Thu, 01 Jan 2026 00:00:00 GMT",
+            "body": json.dumps({**create_response.json(), "title": "Original Title"})
+        }).encode()
+
+        await async_client.put(f"/api/v1/pois/{poi_id}", json={"title": "Updated Title"}, headers=auth_headers)
+        await cache.set(stale_key, stale_entry)
+
+        response = await async_client.get(f"/api/v1/pois/{poi_id}", headers=auth_headers)
+        assert response.json()["title"] == "Updated Title"
+
+    @pytest.mark.asyncio
+    async def test_get_poi_after_update_skips_lagging_replica(
+        self, async_client: AsyncClient, auth_headers: dict, monkeypatch
+    ):
+        """
+        Given: A read replica that has not yet applied a POI update
+        When: Another user fetches the POI right after the update
+        Then: Should load it from the primary and return the updated POI
+        """
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Original Title", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        poi_id = create_response.json()["id"]
+
+        replica_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with replica_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(replica_engine) as session:
+            session.add(POI(id=poi_id, title="Original Title", latitude=48.8584, longitude=2.2945))
+            await session.commit()
+        monkeypatch.setattr(
+            db_session, "ReadSessionLocal", async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+        )
+        other_user = jwt.encode(
+            {"sub": "other-user-id", "role": "authenticated", "exp": 2000000000},
+            settings.SUPABASE_JWT_SECRET, algorithm="HS256"
+        )
+
+        try:
+            await async_client.put(f"/api/v1/pois/{poi_id}", json={"title": "Updated Title"}, headers=auth_headers)
+            response = await async_client.get(
+                f"/api/v1/pois/{poi_id}", headers={"Authorization": f"Bearer {other_user}"}
+            )
+            assert response.json()["title"] == "Updated Title"
+        finally:
+            await replica_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_geofence_websocket_streams_enter_and_exit(
+        self, async_client: AsyncClient, auth_headers: dict, valid_token: str
+    ):
+        """
+        Given: A POI and a client streaming its position over the geofence WebSocket
+        When: The client walks up to the POI, jitters in place, then walks away
+        Then: It should receive one enter and one exit event and nothing for the jitter
+        """
+        create_response = await async_client.post(
+            "/api/v1/pois",
+            json={"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+            headers=auth_headers
+        )
+        poi_id = create_response.json()["id"]
+
+        with TestClient(app) as client:
+            # Exercise the database lookup rather than an index built at startup
+            poi_index.clear()
+            with client.websocket_connect(f"/api/v1/pois/geofence?radius=20&token={valid_token}") as ws:
+                ws.send_json({"latitude": 48.8600, "longitude": 2.2945})
+                ws.send_json({"latitude": 48.85845, "longitude": 2.29452})
+                entered = ws.receive_json()
+                assert entered["type"] == "enter"
+                assert entered["poi"]["title"] == "Eiffel Tower"
+
+                ws.send_json({"latitude": 48.85846, "longitude": 2.29453})
+                ws.send_json({"latitude": "north"})
+                assert ws.receive_json()["type"] == "error"
+
+                ws.send_json({"latitude": 48.8600, "longitude": 2.2945})
+                assert ws.receive_json() == {"type": "exit", "poi_id": poi_id}
+
+    def test_geofence_websocket_rejects_binary_frames(self, valid_token: str):
+        """
+        Given: A client connected to the geofence WebSocket
+        When: It sends a binary frame
+        Then: It should get an error and the stream should stay open
+        """
+        with TestClient(app) as client:
+            with client.websocket_connect(f"/api/v1/pois/geofence?token={valid_token}") as ws:
+                ws.send_bytes(b"\x00")
+                assert ws.receive_json() == {"type": "error", "detail": "Messages must be JSON text"}
+                ws.send_json({"latitude": "north"})
+                assert ws.receive_json()["type"] == "error"
+
+    def test_geofence_websocket_lookup_failure_closes_with_1011(self, valid_token: str, monkeypatch):
+        """
+        Given: No POI index and a database that fails the candidate lookup
+        When: A client streams a position
+        Then: The connection should be closed with 1011
+        """
+        def failing_session():
+            raise OperationalError("SELECT", {}, Exception("connection refused"))
+
+        with TestClient(app) as client:
+            poi_index.clear()
+            monkeypatch.setattr(db_session, "ReadSessionLocal", failing_session)
+            with client.websocket_connect(f"/api/v1/pois/geofence?token={valid_token}") as ws:
+                ws.send_json({"latitude": 48.8584, "longitude": 2.2945})
+                with pytest.raises(WebSocketDisconnect) as exc_info:
+                    ws.receive_json()
+        assert exc_info.value.code == status.WS_1011_INTERNAL_ERROR
+
+    def test_geofence_websocket_requires_token(self):
+        """
+        Given: A client without a token
+        When: Connecting to the geofence WebSocket
+        Then: The connection should be closed with 4401
+        """
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect("/api/v1/pois/geofence") as ws:
+                    ws.receive_json()
+        assert exc_info.value.code == 4401
@@ -0,0 +1,242 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy.exc import OperationalError
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import deps
+from app.api.v1.endpoints import sessions
+from app.core.config import settings
+from app.api.v1.endpoints.sessions import _forward
+from app.core.session_hub import SessionHub, session_hub
+from app.main import app
+from app.models.session import GroupSessionState
+from tests.conftest import TestingSessionLocal
+
+SESSION = {"id": "s1", "leader_id": "leader-id", "status": "active"}
+
+
+class FakeQuery:
+    """Records a PostgREST query chain and returns canned rows."""
+
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    async def execute(self):
+        rows = [row for row in self.client.sessions if row["session_code"] == self.filters.get("session_code")]
+        return type("Response", (), {"data": rows})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.sessions = [{**SESSION, "session_code": "ABC123"}]
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def make_token(user_id: str) -> str:
+    payload = {"sub": user_id, "role": "authenticated", "exp": 2000000000, "iat": 1600000000}
+    return jwt.encode(payload, settings.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+
+def create_poi(client: TestClient) -> int:
+    response = client.post(
+        "/api/v1/pois",
+        json={"title": "Louvre", "latitude": 48.8606, "longitude": 2.3376},
+        headers={"Authorization": f"Bearer {make_token('leader-id')}"}
+    )
+    return response.json()["id"]
+
+
+async def stored_poi(session_id: str):
+    async with TestingSessionLocal() as db:
+        state = await db.get(GroupSessionState, session_id)
+        return state.current_poi_id if state else None
+
+
+async def store_poi(session_id: str, poi_id: int) -> None:
+    async with TestingSessionLocal() as db:
+        await db.merge(GroupSessionState(session_id=session_id, current_poi_id=poi_id))
+        await db.commit()
+
+
+@pytest.fixture
+def supabase():
+    fake = FakeSupabase()
+    app.dependency_overrides[deps.get_supabase] = lambda: fake
+    yield fake
+    del app.dependency_overrides[deps.get_supabase]
+
+
+class TestSessionWebSocket:
+    """BDD-style tests for the group session WebSocket."""
+
+    def test_leader_change_fans_out_to_participants(self, supabase: FakeSupabase):
+        """
+        Given: A leader and a participant connected to a session at a stored POI
+        When: The leader sets a new POI
+        Then: Both should receive the change and it should be stored for later joiners
+        """
+        with TestClient(app) as client:
+            first_poi_id = create_poi(client)
+            poi_id = create_poi(client)
+            client.portal.call(store_poi, "s1", first_poi_id)
+            with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('leader-id')}") as leader, \
+                    client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('guest-id')}") as guest:
+                initial = {"type": "poi_changed", "poi_id": first_poi_id, "seq": 0}
+                assert leader.receive_json() == initial
+                assert guest.receive_json() == initial
+
+                leader.send_json({"type": "set_poi", "poi_id": poi_id})
+
+                change = guest.receive_json()
+                assert change["poi_id"] == poi_id
+                assert change["seq"] > 0
+                assert leader.receive_json() == change
+
+                guest.send_json({"type": "set_poi", "poi_id": poi_id})
+                assert guest.receive_json()["type"] == "error"
+
+            assert session_hub.stats()["sessions"] == 0
+            assert client.portal.call(stored_poi, "s1") == poi_id
+            with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('guest-id')}") as guest:
+                assert guest.receive_json() == {"type": "poi_changed", "poi_id": poi_id, "seq": 0}
+
+    @pytest.mark.parametrize("message, detail", [
+        ({"type": "set_poi", "poi_id": "../admin"}, "poi_id must be a positive integer"),
+        ({"type": "set_poi", "poi_id": -3}, "poi_id must be a positive integer"),
+        ({"type": "set_poi"}, "poi_id must be a positive integer"),
+        ({"type": "set_poi", "poi_id": 999}, "POI 999 not found"),
+    ])
+    def test_leader_invalid_poi_gets_error(self, supabase: FakeSupabase, message: dict, detail: str):
+        """
+        Given: A leader connected to an active session
+        When: The leader sets a malformed or unknown POI
+        Then: Only the leader should get an error, and nothing should be published or stored
+        """
+        with TestClient(app) as client:
+            with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('leader-id')}") as leader:
+                leader.receive_json()
+                leader.send_json(message)
+                assert leader.receive_json() == {"type": "error", "detail": detail}
+
+            assert client.portal.call(stored_poi, "s1") is None
+
+    def test_failed_store_gets_error_and_is_not_published(self, supabase: FakeSupabase, monkeypatch):
+        """
+        Given: A leader connected to an active session and a database failing writes
+        When: The leader sets a POI
+        Then: The leader should get an error and the change should not be published
+        """
+        async def failing_store(session_factory, session_id, poi_id):
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        monkeypatch.setattr(sessions, "_store_current_poi", failing_store)
+
+        with TestClient(app) as client:
+            poi_id = create_poi(client)
+            with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('leader-id')}") as leader:
+                published = session_hub.published
+                leader.send_json({"type": "set_poi", "poi_id": poi_id})
+                assert leader.receive_json() == {"type": "error", "detail": "Could not change the POI, try again"}
+                assert session_hub.published == published
+
+    def test_binary_frame_gets_error(self, supabase: FakeSupabase):
+        """
+        Given: A participant connected to an active session
+        When: It sends a binary frame
+        Then: It should get an error and stay connected
+        """
+        with TestClient(app) as client:
+            with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('guest-id')}") as guest:
+                guest.receive_json()
+                guest.send_bytes(b"\x00\x01")
+                assert guest.receive_json() == {"type": "error", "detail": "Messages must be JSON text"}
+                guest.send_json({"type": "ping"})
+
+    def test_session_lookup_failure_closes_with_1011(self, supabase: FakeSupabase, monkeypatch):
+        """
+        Given: Supabase failing to answer the session lookup
+        When: Connecting to the session WebSocket
+        Then: The connection should be closed with 1011
+        """
+        async def failing_execute(self):
+            raise ConnectionError("Supabase unavailable")
+        monkeypatch.setattr(FakeQuery, "execute", failing_execute)
+
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect(f"/api/v1/sessions/ABC123/ws?token={make_token('guest-id')}") as ws:
+                    ws.receive_json()
+            assert exc_info.value.code == status.WS_1011_INTERNAL_ERROR
+
+    def test_rejects_unknown_session_and_missing_token(self, supabase: FakeSupabase):
+        """
+        Given: An unknown session code, and a request without a token
+        When: Connecting to the session WebSocket
+        Then: The connection should be closed with 4404 and 4401
+        """
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect(f"/api/v1/sessions/NOPE/ws?token={make_token('guest-id')}") as ws:
+                    ws.receive_json()
+            assert exc_info.value.code == 4404
+
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect("/api/v1/sessions/ABC123/ws") as ws:
+                    ws.receive_json()
+            assert exc_info.value.code == 4401
+
+
+@pytest.mark.asyncio
+async def test_forward_ends_when_subscriber_is_dropped():
+    """
+    Given: A participant sender and a hub with one outbox slot per subscriber
+    When: The participant is dropped for falling behind while updates are pending
+    Then: The sender should send nothing more and close the socket with 1013
+    """
+    hub = SessionHub(max_pending=1)
+    subscriber = hub.subscribe("ABC123")
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": 1})
+    hub.publish("ABC123", "error", {"type": "error"})
+    websocket = AsyncMock()
+
+    await asyncio.wait_for(_forward(websocket, subscriber), timeout=1)
+
+    websocket.send_json.assert_not_called()
+    websocket.close.assert_awaited_once_with(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+@pytest.mark.asyncio
+async def test_forward_ends_when_send_fails():
+    """
+    Given: A participant whose connection fails while an update is sent
+    When: The sender forwards the update
+    Then: The sender should stop cleanly instead of dying with the error
+    """
+    hub = SessionHub()
+    subscriber = hub.subscribe("ABC123")
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": 1})
+    websocket = AsyncMock()
+    websocket.send_json.side_effect = RuntimeError("Unexpected ASGI message 'websocket.send'")
+    websocket.close.side_effect = RuntimeError("Unexpected ASGI message 'websocket.close'")
+
+    await asyncio.wait_for(_forward(websocket, subscriber), timeout=1)
+
+    websocket.send_json.assert_awaited_once()
@@ -0,0 +1,254 @@
+import io
+import zipfile
+
+import httpx
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.base_class import Base
+from app.models.poi import POI
+from app.models.tour import Tour, TourPOI
+from app.utils import tour_package
+
+
+async def create_pois(async_client: AsyncClient, auth_headers: dict) -> list:
+    ids = []
+    for poi_data in (
+        {"title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945},
+        {"title": "Trocadero", "latitude": 48.8616, "longitude": 2.2893},
+        {"title": "Arc de Triomphe", "latitude": 48.8738, "longitude": 2.2950},
+    ):
+        response = await async_client.post("/api/v1/pois", json=poi_data, headers=auth_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def fake_resolve(host: str, port: int) -> list:
+    return ["93.184.216.34"]
+
+
+class TestTourEndpoints:
+    """BDD-style tests for tour endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_get_tour_bundle(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A tour visiting three POIs in a custom order
+        When: Fetching the tour bundle twice
+        Then: Should return the POIs in tour order with leg distances, then a 304 for a matching ETag
+        """
+        eiffel, trocadero, arc = await create_pois(async_client, auth_headers)
+        response = await async_client.post(
+            "/api/v1/tours",
+            json={"title": "Left Bank to Étoile", "poi_ids": [trocadero, eiffel, arc]},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        tour_id = response.json()["id"]
+
+        response = await async_client.get(f"/api/v1/tours/{tour_id}/bundle", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        bundle = response.json()
+        assert bundle["tour"]["title"] == "Left Bank to Étoile"
+        assert [poi["id"] for poi in bundle["pois"]] == [trocadero, eiffel, arc]
+        assert len(bundle["leg_distances_meters"]) == 2
+        assert 500 < bundle["leg_distances_meters"][0] < 600
+        assert bundle["total_distance_meters"] == pytest.approx(sum(bundle["leg_distances_meters"]))
+
+        response = await async_client.get(
+            f"/api/v1/tours/{tour_id}/bundle",
+            headers={**auth_headers, "If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.asyncio
+    async def test_tour_bundle_invalidated_by_changes(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A tour whose bundle has been cached
+        When: A POI is renamed, the tour is reordered, and a POI is deleted
+        Then: Each change should be reflected in the next bundle
+        """
+        eiffel, trocadero, arc = await create_pois(async_client, auth_headers)
+        response = await async_client.post(
+            "/api/v1/tours",
+            json={"title": "Paris", "poi_ids": [eiffel, trocadero, arc]},
+            headers=auth_headers
+        )
+        tour_id = response.json()["id"]
+        url = f"/api/v1/tours/{tour_id}/bundle"
+        await async_client.get(url, headers=auth_headers)
+
+        await async_client.put(f"/api/v1/pois/{eiffel}", json={"title": "La Tour Eiffel"}, headers=auth_headers)
+        bundle = (await async_client.get(url, headers=auth_headers)).json()
+        assert bundle["pois"][0]["title"] == "La Tour Eiffel"
+
+        response = await async_client.put(
+            f"/api/v1/tours/{tour_id}/pois", json={"poi_ids": [arc, eiffel]}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        bundle = (await async_client.get(url, headers=auth_headers)).json()
+        assert [poi["id"] for poi in bundle["pois"]] == [arc, eiffel]
+
+        await async_client.delete(f"/api/v1/pois/{arc}", headers=auth_headers)
+        bundle = (await async_client.get(url, headers=auth_headers)).json()
+        assert [poi["id"] for poi in bundle["pois"]] == [eiffel]
+        assert bundle["leg_distances_meters"] == []
+        assert bundle["total_distance_meters"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tour_bundle_after_change_skips_lagging_replica(
+        self, async_client: AsyncClient, auth_headers: dict, monkeypatch
+    ):
+        """
+        Given: A read replica that has not yet applied a POI rename
+        When: Another user fetches a tour bundle holding the POI right after the rename
+        Then: Should load it from the primary and return the new title
+        """
+        eiffel, _, _ = await create_pois(async_client, auth_headers)
+        response = await async_client.post(
+            "/api/v1/tours", json={"title": "Paris", "poi_ids": [eiffel]}, headers=auth_headers
+        )
+        tour_id = response.json()["id"]
+
+        replica_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with replica_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(replica_engine) as session:
+            session.add(POI(id=eiffel, title="Eiffel Tower", latitude=48.8584, longitude=2.2945))
+            session.add(Tour(id=tour_id, title="Paris"))
+            await session.flush()
+            session.add(TourPOI(tour_id=tour_id, poi_id=eiffel, sequence_number=0))
+            await session.commit()
+        monkeypatch.setattr(
+            db_session, "ReadSessionLocal", async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+        )
+        other_user = jwt.encode(
+            {"sub": "other-user-id", "role": "authenticated", "exp": 2000000000},
+            settings.SUPABASE_JWT_SECRET, algorithm="HS256"
+        )
+
+        try:
+            await async_client.put(f"/api/v1/pois/{eiffel}", json={"title": "La Tour Eiffel"}, headers=auth_headers)
+            response = await async_client.get(
+                f"/api/v1/tours/{tour_id}/bundle", headers={"Authorization": f"Bearer {other_user}"}
+            )
+            assert response.json()["pois"][0]["title"] == "La Tour Eiffel"
+        finally:
+            await replica_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_tour_rejects_unknown_and_duplicate_pois(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: An authenticated user
+        When: Creating tours with an unknown POI and with a repeated POI
+        Then: Should return 400 and 422 respectively
+        """
+        eiffel, _, _ = await create_pois(async_client, auth_headers)
+
+        response = await async_client.post(
+            "/api/v1/tours", json={"title": "Paris", "poi_ids": [eiffel, 999]}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "999" in response.json()["detail"]
+
+        response = await async_client.post(
+            "/api/v1/tours", json={"title": "Paris", "poi_ids": [eiffel, eiffel]}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    async def test_deleted_tour_bundle_not_found(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: A tour whose bundle has been cached
+        When: The tour is deleted
+        Then: Its bundle should return 404
+        """
+        response = await async_client.post("/api/v1/tours", json={"title": "Empty"}, headers=auth_headers)
+        tour_id = response.json()["id"]
+        assert (await async_client.get(f"/api/v1/tours/{tour_id}/bundle", headers=auth_headers)).status_code == 200
+
+        response = await async_client.delete(f"/api/v1/tours/{tour_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = await async_client.get(f"/api/v1/tours/{tour_id}/bundle", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_tour_package_build_and_download(
+        self, async_client: AsyncClient, auth_headers: dict, monkeypatch, tmp_path
+    ):
+        """
+        Given: A tour whose POI has narration audio
+        When: Building its package and downloading it in full, conditionally and by range
+        Then: Should serve the package with a 304 for its ETag and 206 for a range
+        """
+        monkeypatch.setattr(settings, "TOUR_PACKAGE_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "TOUR_PACKAGE_AUDIO_HOSTS", ["audio.example.com"])
+        monkeypatch.setattr(tour_package, "_resolve", fake_resolve)
+        monkeypatch.setattr(tour_package, "audio_client", lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"ID3" * 1000))
+        ))
+        response = await async_client.post(
+            "/api/v1/pois",
+            json={
+                "title": "Eiffel Tower", "latitude": 48.8584, "longitude": 2.2945,
+                "audio_url": "https://audio.example.com/eiffel.mp3"
+            },
+            headers=auth_headers
+        )
+        response = await async_client.post(
+            "/api/v1/tours", json={"title": "Paris", "poi_ids": [response.json()["id"]]}, headers=auth_headers
+        )
+        tour_id = response.json()["id"]
+
+        response = await async_client.post(
+            f"/api/v1/tours/{tour_id}/package", params={"include_audio": True}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        response = await async_client.get(response.headers["Location"], headers=auth_headers)
+        job = response.json()
+        assert job["status"] == "done"
+
+        url = f"/api/v1/tours/packages/{job['package_id']}"
+        full = await async_client.get(url, headers=auth_headers)
+        assert full.status_code == status.HTTP_200_OK
+        assert len(full.content) == job["size"]
+        assert full.headers["ETag"] == f'"{job["package_id"]}"'
+        with zipfile.ZipFile(io.BytesIO(full.content)) as zf:
+            assert any(name.startswith("audio/") for name in zf.namelist())
+
+        response = await async_client.get(url, headers={**auth_headers, "If-None-Match": full.headers["ETag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = await async_client.get(url, headers={**auth_headers, "Range": "bytes=100-"})
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.headers["Content-Range"] == f"bytes 100-{job['size'] - 1}/{job['size']}"
+        assert response.content == full.content[100:]
+
+        response = await async_client.get(
+            url, headers={**auth_headers, "Range": "bytes=100-", "If-Range": '"stale"'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await async_client.get(url, headers={**auth_headers, "Range": f"bytes={job['size']}-"})
+        assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+    @pytest.mark.asyncio
+    async def test_tour_package_not_found(self, async_client: AsyncClient, auth_headers: dict):
+        """
+        Given: No such tour, job or package
+        When: Requesting a package build, job status and download
+        Then: Should return 404 for each
+        """
+        response = await async_client.post("/api/v1/tours/999/package", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await async_client.get("/api/v1/tours/package-jobs/unknown", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await async_client.get(f"/api/v1/tours/packages/{'0' * 64}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -10,6 +10,7 @@ from app.main import app
 from app.core.config import settings
 from app.db.base_class import Base
 from app.api import deps
+from app.core.cache import get_cache
 
 # Override the database URL for testing
 settings.SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -33,6 +34,7 @@ async def override_get_db():
         yield session
 
 app.dependency_overrides[deps.get_db] = override_get_db
+app.dependency_overrides[deps.get_session_factory] = lambda: TestingSessionLocal
 
 @pytest.fixture
 def client():
@@ -89,6 +91,7 @@ def expired_token():
 @pytest_asyncio.fixture(autouse=True)
 async def setup_db():
     """Set up test database before each test."""
+    await get_cache().clear()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -6,7 +6,7 @@ from fastapi import HTTPException, security
 from jose import jwt
 from unittest.mock import AsyncMock, MagicMock
 
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, is_admin
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -83,3 +83,14 @@ async def test_get_current_user_malformed_token():
         await get_current_user(type("Credentials", (), {"credentials": "not.a.token"})())
     assert exc_info.value.status_code == 401
     assert "Invalid authentication token" in str(exc_info.value.detail)
+
+
+def test_is_admin_uses_user_roles():
+    """
+    Given: Claims of an admin user, a regular user and a service-role key
+    When: Checking for admin privileges
+    Then: Only the user whose app_metadata grants the admin role should pass
+    """
+    assert is_admin({"sub": "u1", "role": "authenticated", "app_metadata": {"role": "admin"}})
+    assert not is_admin({"sub": "u2", "role": "authenticated"})
+    assert not is_admin({"role": "service_role"})
@@ -0,0 +1,331 @@
+"""
+Unit tests for the cross-worker session backplane.
+"""
+import asyncio
+import json
+import sys
+import types
+
+import asyncpg
+import pytest
+
+from app.core.backplane import Backplane, InMemoryBackplane, InMemoryBus, PostgresBackplane, RedisBackplane
+from app.core.session_hub import SessionHub
+
+
+async def start_workers(count: int, **kwargs):
+    """Start ``count`` hubs connected by in-memory backplanes on one bus."""
+    bus = InMemoryBus()
+    hubs = []
+    for _ in range(count):
+        hub = SessionHub()
+        hub.backplane = InMemoryBackplane(bus, **kwargs)
+        await hub.backplane.start(hub.deliver)
+        hubs.append(hub)
+    return hubs
+
+
+async def stop_workers(hubs):
+    for hub in hubs:
+        await hub.backplane.stop()
+
+
+@pytest.mark.asyncio
+async def test_backplane_relays_updates_between_workers():
+    """
+    Given: Participants of one session connected to two different workers
+    When: The leader's worker publishes a POI change
+    Then: Participants on both workers should receive the same message
+    """
+    first, second = await start_workers(2, flush_interval=0.001)
+    leader = first.subscribe("ABC123")
+    guest = second.subscribe("ABC123")
+
+    first.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": "p1"})
+    local = await leader.next_batch()
+    relayed = await asyncio.wait_for(guest.next_batch(), 1)
+
+    assert relayed == local
+    assert relayed[0]["poi_id"] == "p1"
+    assert second.stats()["relayed"] == 1
+    await stop_workers([first, second])
+
+
+@pytest.mark.asyncio
+async def test_backplane_does_not_echo_to_publisher():
+    """
+    Given: Two workers on a backplane
+    When: One of them publishes and flushes
+    Then: Only the other worker should receive the message
+    """
+    first, second = await start_workers(2, flush_interval=60)
+    first.publish("ABC123", "poi", {"type": "poi_changed"})
+
+    await first.backplane.flush()
+
+    assert first.backplane.stats()["received"] == 0
+    assert second.backplane.stats()["received"] == 1
+    await stop_workers([first, second])
+
+
+@pytest.mark.asyncio
+async def test_backplane_coalesces_messages_within_a_batch():
+    """
+    Given: A backplane that has not flushed yet
+    When: The same session's POI changes three times
+    Then: Only the latest change should be sent
+    """
+    bus = InMemoryBus()
+    sender = InMemoryBackplane(bus, flush_interval=60)
+    received = []
+    receiver = InMemoryBackplane(bus, flush_interval=60)
+    await sender.start(lambda envelopes: None)
+    await receiver.start(received.extend)
+
+    for poi_id in ("p1", "p2", "p3"):
+        sender.publish("ABC123", "poi", {"poi_id": poi_id})
+    sender.publish("XYZ789", "poi", {"poi_id": "q1"})
+    await sender.flush()
+
+    assert [(e["session"], e["message"]["poi_id"]) for e in received] == [("ABC123", "p3"), ("XYZ789", "q1")]
+    await sender.stop()
+    await receiver.stop()
+
+
+@pytest.mark.asyncio
+async def test_backplane_flushes_early_when_batch_is_full():
+    """
+    Given: A backplane with a long flush interval and a batch size of two
+    When: Two messages are published
+    Then: They should be sent without waiting for the interval
+    """
+    first, second = await start_workers(2, flush_interval=60, max_batch=2)
+    guest = second.subscribe("XYZ789")
+
+    first.publish("ABC123", "poi", {"type": "poi_changed"})
+    first.publish("XYZ789", "poi", {"type": "poi_changed"})
+
+    assert len(await asyncio.wait_for(guest.next_batch(), 1)) == 1
+    await stop_workers([first, second])
+
+
+def test_backplane_splits_payloads_at_size_limit():
+    """
+    Given: A backplane limited to small payloads
+    When: Encoding a batch too large for one payload, and an oversized message
+    Then: The batch should be split into valid payloads and the oversized message dropped
+    """
+    backplane = InMemoryBackplane(max_payload_bytes=200)
+    batch = [
+        {"origin": "w", "session": f"S{i}", "key": "poi", "message": {"poi_id": "p" * 40}}
+        for i in range(5)
+    ]
+    batch.append({"origin": "w", "session": "BIG", "key": "poi", "message": {"poi_id": "p" * 500}})
+
+    payloads = backplane._encode(batch)
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode("utf-8")) <= 200 for payload, _ in payloads)
+    assert all(json.loads(payload) == envelopes for payload, envelopes in payloads)
+    decoded = [envelope for payload, _ in payloads for envelope in json.loads(payload)]
+    assert decoded == batch[:5]
+
+
+def test_backplane_is_abstract():
+    """
+    Given: A backplane that does not implement sending
+    When: Instantiating it
+    Then: Should raise TypeError instead of failing on first flush
+    """
+    class Incomplete(Backplane):
+        async def _connect(self) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+class FlakyBackplane(InMemoryBackplane):
+    """In-memory backplane whose sends fail while ``down`` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.down = False
+
+    async def _send(self, payload: str) -> None:
+        if self.down:
+            raise ConnectionError("backplane unreachable")
+        await super()._send(payload)
+
+
+@pytest.mark.asyncio
+async def test_backplane_keeps_unsent_messages_after_failed_send():
+    """
+    Given: A backplane whose connection is down while two sessions change
+    When: Flushing fails, one session changes again, and the connection comes back
+    Then: The next flush should send the unsent message and only the newest one for the changed session
+    """
+    bus = InMemoryBus()
+    sender = FlakyBackplane(bus, flush_interval=60)
+    received = []
+    receiver = InMemoryBackplane(bus, flush_interval=60)
+    await sender.start(lambda envelopes: None)
+    await receiver.start(received.extend)
+
+    sender.down = True
+    sender.publish("ABC123", "poi", {"poi_id": 1, "seq": 1})
+    sender.publish("XYZ789", "poi", {"poi_id": 5, "seq": 1})
+    await sender.flush()
+    sender.publish("ABC123", "poi", {"poi_id": 2, "seq": 2})
+    sender.down = False
+    await sender.flush()
+
+    assert sorted((e["session"], e["message"]["poi_id"]) for e in received) == [("ABC123", 2), ("XYZ789", 5)]
+    assert sender.stats()["sent"] == 2
+    await sender.stop()
+    await receiver.stop()
+
+
+@pytest.mark.parametrize("payload", [
+    '{"origin": "other"}',
+    '["not an envelope", {"origin": "other", "session": "ABC123"}]',
+    '[{"origin": "other", "session": "ABC123", "key": "poi", "message": "p1"}]',
+])
+def test_backplane_ignores_malformed_payloads(payload: str):
+    """
+    Given: A started backplane
+    When: Receiving payloads that are not lists of well-formed envelopes
+    Then: Nothing should reach the handler
+    """
+    received = []
+    backplane = InMemoryBackplane()
+    backplane._handler = received.extend
+
+    backplane._receive(payload)
+
+    assert received == []
+    assert backplane.stats()["received"] == 0
+
+
+class FakePostgresConnection:
+    """Just enough of an asyncpg connection for LISTEN/NOTIFY."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.notified = []
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def execute(self, query, *args):
+        self.notified.append(args)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.terminate()
+
+    def terminate(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+@pytest.mark.asyncio
+async def test_postgres_backplane_listens_again_after_connection_loss(monkeypatch):
+    """
+    Given: A Postgres backplane whose listening connection drops, and a first reconnect that fails
+    When: The connection terminates
+    Then: It should keep retrying and issue LISTEN on the new connection
+    """
+    first, second = FakePostgresConnection(), FakePostgresConnection()
+    outcomes = [first, OSError("connection refused"), second]
+
+    async def connect(dsn):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    received = []
+    backplane = PostgresBackplane("postgresql://db/geovoyager", flush_interval=60, reconnect_delay=0.001)
+    await backplane.start(received.extend)
+
+    first.terminate()
+    for _ in range(100):
+        if backplane.stats()["reconnects"]:
+            break
+        await asyncio.sleep(0.005)
+
+    assert outcomes == []
+    second.listeners["group_sessions"](second, 1, "group_sessions", json.dumps([
+        {"origin": "other", "session": "ABC123", "key": "poi", "message": {"poi_id": 2}}
+    ]))
+    assert [envelope["message"] for envelope in received] == [{"poi_id": 2}]
+    await backplane.stop()
+    assert second.closed
+
+
+class FakePubSub:
+    """Redis pub/sub whose first subscription dies after one message."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def subscribe(self, channel):
+        self.redis.subscriptions += 1
+        self.generation = self.redis.subscriptions
+
+    async def listen(self):
+        payload = json.dumps([
+            {"origin": "other", "session": "ABC123", "key": "poi", "message": {"poi_id": self.generation}}
+        ])
+        yield {"type": "message", "data": payload.encode()}
+        if self.generation == 1:
+            raise ConnectionError("Connection closed by server.")
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.subscriptions = 0
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_resubscribes_after_connection_loss(monkeypatch):
+    """
+    Given: A Redis backplane whose subscription connection drops after one message
+    When: Listening
+    Then: It should subscribe again and keep receiving
+    """
+    redis = types.ModuleType("redis")
+    redis.asyncio = types.SimpleNamespace(from_url=lambda url: FakeRedis())
+    monkeypatch.setitem(sys.modules, "redis", redis)
+    received = []
+    backplane = RedisBackplane("redis://cache", flush_interval=60, reconnect_delay=0.001)
+    await backplane.start(received.extend)
+
+    for _ in range(100):
+        if len(received) == 2:
+            break
+        await asyncio.sleep(0.005)
+
+    assert [envelope["message"]["poi_id"] for envelope in received] == [1, 2]
+    assert backplane.stats()["reconnects"] == 1
+    await backplane.stop()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the in-process response cache backend.
+"""
+import pytest
+
+from app.core.cache import CacheBackend, InMemoryLRUCache, invalidate_versioned, versioned_key
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_set_get_delete():
+    """
+    Given: An empty in-memory cache
+    When: Setting, reading and deleting a key
+    Then: The value should round-trip and then be gone
+    """
+    cache = InMemoryLRUCache()
+    await cache.set("poi:1", b"{}")
+    assert await cache.get("poi:1") == b"{}"
+
+    await cache.delete("poi:1")
+    assert await cache.get("poi:1") is None
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_evicts_least_recently_used():
+    """
+    Given: A cache limited to two entries
+    When: A third entry is added after the first was read
+    Then: The least recently used entry should be evicted
+    """
+    cache = InMemoryLRUCache(max_entries=2)
+    await cache.set("a", b"a")
+    await cache.set("b", b"b")
+    await cache.get("a")
+    await cache.set("c", b"c")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"a"
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_ttl_expiry():
+    """
+    Given: An entry stored with a TTL that has already elapsed
+    When: Reading it
+    Then: It should be treated as missing
+    """
+    cache = InMemoryLRUCache()
+    await cache.set("poi:1", b"{}", ttl=0)
+    assert await cache.get("poi:1") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_versioned_moves_key_to_new_version():
+    """
+    Given: An entry stored under a key's current version
+    When: The key is invalidated and a stale value is written under the old version
+    Then: The key should resolve to a new, empty, recently changed version
+    """
+    cache = InMemoryLRUCache()
+    old_key, recently_changed = await versioned_key(cache, "poi:1")
+    assert (old_key, recently_changed) == ("poi:1", False)
+    await cache.set(old_key, b"old")
+
+    await invalidate_versioned(cache, "poi:1")
+    await cache.set(old_key, b"stale")
+
+    new_key, recently_changed = await versioned_key(cache, "poi:1")
+    assert new_key != old_key
+    assert recently_changed
+    assert await cache.get(new_key) is None
+
+
+def test_cache_backend_is_abstract():
+    """
+    Given: A cache backend that does not implement the interface
+    When: Instantiating it
+    Then: Should raise TypeError instead of failing on first use
+    """
+    class Incomplete(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,132 @@
+"""
+Tests for the JWKS key cache against a local stub JWKS server.
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.core import auth
+from app.core.jwks import JWKSCache
+
+
+def make_key(kid: str):
+    """Create an RSA private key PEM and its public JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return pem, public_jwk
+
+
+@pytest.fixture
+def jwks_server():
+    """Serve a mutable key set from a local HTTP server."""
+    state = {"keys": [], "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=600")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/auth/v1/.well-known/jwks.json"
+    yield state
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_verify_rs256_token_with_cached_key(jwks_server, monkeypatch):
+    """
+    Given: A JWKS server publishing one RSA key
+    When: Verifying a token signed with that key
+    Then: It should be accepted using the locally cached key
+    """
+    pem, public_jwk = make_key("key-1")
+    jwks_server["keys"] = [public_jwk]
+    cache = JWKSCache(jwks_server["url"])
+    await cache.start()
+    monkeypatch.setattr(auth, "jwks_cache", cache)
+    try:
+        token = jwt.encode(
+            {"sub": "user-1", "role": "authenticated", "exp": 2000000000},
+            pem, algorithm="RS256", headers={"kid": "key-1"}
+        )
+        assert auth.verify_token(token)["sub"] == "user-1"
+        auth.verify_token(token)
+        assert jwks_server["requests"] == 1
+    finally:
+        await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_in_background(jwks_server, monkeypatch):
+    """
+    Given: A cache loaded before the signing key was rotated
+    When: A token signed with the new key arrives
+    Then: It should be rejected without blocking, and accepted once the
+          background re-fetch has picked up the new key
+    """
+    old_pem, old_jwk = make_key("old")
+    new_pem, new_jwk = make_key("new")
+    jwks_server["keys"] = [old_jwk]
+    cache = JWKSCache(jwks_server["url"], min_refetch_interval=0)
+    await cache.start()
+    monkeypatch.setattr(auth, "jwks_cache", cache)
+    try:
+        jwks_server["keys"] = [old_jwk, new_jwk]
+        token = jwt.encode(
+            {"sub": "user-1", "role": "authenticated", "exp": 2000000000},
+            new_pem, algorithm="RS256", headers={"kid": "new"}
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            auth.verify_token(token)
+        assert exc_info.value.status_code == 401
+
+        for _ in range(50):
+            if "new" in cache.kids:
+                break
+            await asyncio.sleep(0.02)
+        assert auth.verify_token(token)["sub"] == "user-1"
+        assert jwks_server["requests"] == 2
+    finally:
+        await cache.stop()
+
+
+def test_asymmetric_token_rejected_without_jwks(monkeypatch):
+    """
+    Given: No JWKS endpoint configured
+    When: Verifying an RS256 token
+    Then: It should be rejected
+    """
+    pem, _ = make_key("key-1")
+    monkeypatch.setattr(auth, "jwks_cache", None)
+    token = jwt.encode(
+        {"sub": "user-1", "role": "authenticated", "exp": 2000000000},
+        pem, algorithm="RS256", headers={"kid": "key-1"}
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        auth.verify_token(token)
+    assert "Unsupported signing algorithm" in exc_info.value.detail
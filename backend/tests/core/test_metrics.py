@@ -0,0 +1,84 @@
+"""
+Unit tests for the Prometheus metrics registry and instrumentation hooks.
+"""
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.metrics import MetricsRegistry, instrument_engine, start_request, timed_phase
+
+
+def test_histogram_renders_cumulative_buckets():
+    """
+    Given: A histogram with two buckets
+    When: Observing values below, between and above them
+    Then: Buckets should be cumulative, with sum and count for the label set
+    """
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/pois")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/pois",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/pois",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/pois",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/pois"} 5.55' in lines
+    assert 'latency_seconds_count{route="/pois"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    """
+    Given: A counter label containing quotes
+    When: Rendering it
+    Then: The quotes should be escaped
+    """
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors.", ("reason",)).inc('say "hi"', amount=2)
+
+    assert 'errors_total{reason="say \\"hi\\""} 2' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_instrument_engine_counts_request_queries():
+    """
+    Given: An instrumented engine and a request being measured
+    When: Executing two statements and timing a phase
+    Then: The request should record two queries and the phase time
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine, "test")
+    metrics = start_request()
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await conn.execute(text("SELECT 2"))
+    with timed_phase("serialization"):
+        pass
+    await engine.dispose()
+
+    assert metrics.db_queries == 2
+    assert metrics.db_seconds > 0
+    assert "serialization" in metrics.phases
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_latency(async_client: AsyncClient, auth_headers: dict):
+    """
+    Given: A request to a POI route with a path parameter
+    When: Scraping /metrics
+    Then: Latency should be labelled with the route template and auth time recorded
+    """
+    await async_client.get("/api/v1/pois/12345", headers=auth_headers)
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/pois/{poi_id}",status="404"}' in body
+    assert 'http_request_phase_seconds_count{route="/api/v1/pois/{poi_id}",phase="auth"}' in body
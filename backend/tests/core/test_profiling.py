@@ -0,0 +1,122 @@
+"""
+Unit tests for the opt-in sampling profiler.
+"""
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from jose import jwt
+
+from app.core.config import settings
+from app.core.profiling import Profile, ProfileStore, ProfilingMiddleware, profile_store
+
+
+def make_token(role: str) -> str:
+    payload = {"sub": "test-user-id", "role": role, "exp": 2000000000, "iat": 1600000000}
+    return jwt.encode(payload, settings.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_app(store: ProfileStore, sample_rate: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, store=store, sample_rate=sample_rate)
+
+    @app.get("/slow")
+    async def slow():
+        busy_wait(0.05)
+        return {"ok": True}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiling_header_from_admin_profiles_request():
+    """
+    Given: An app with the profiling middleware and no sampling
+    When: An admin sends a request with the X-Profile header
+    Then: The response should name a stored profile whose stacks include the endpoint
+    """
+    store = ProfileStore()
+    async with AsyncClient(app=make_app(store), base_url="http://test") as client:
+        response = await client.get(
+            "/slow", headers={"X-Profile": "1", "Authorization": f"Bearer {make_token('admin')}"}
+        )
+
+    profile = store.get(response.headers["X-Profile-Id"])
+    assert profile.trigger == "header"
+    assert profile.status == 200
+    assert profile.samples > 0
+    assert "busy_wait (test_profiling.py:" in profile.folded
+    stack, count = profile.folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_profiling_header_ignored_for_non_admin():
+    """
+    Given: An app with the profiling middleware and no sampling
+    When: A regular user sends the X-Profile header
+    Then: The request should not be profiled
+    """
+    store = ProfileStore()
+    async with AsyncClient(app=make_app(store), base_url="http://test") as client:
+        response = await client.get(
+            "/slow", headers={"X-Profile": "1", "Authorization": f"Bearer {make_token('authenticated')}"}
+        )
+
+    assert "X-Profile-Id" not in response.headers
+    assert store.list() == []
+
+
+@pytest.mark.asyncio
+async def test_profiling_samples_requests(tmp_path):
+    """
+    Given: A sample rate of 1 and an output directory
+    When: Sending an anonymous request
+    Then: It should be profiled and written to disk as folded stacks
+    """
+    store = ProfileStore(output_dir=str(tmp_path))
+    async with AsyncClient(app=make_app(store, sample_rate=1.0), base_url="http://test") as client:
+        await client.get("/slow")
+
+    (profile,) = store.list()
+    assert profile.trigger == "sample"
+    (written,) = tmp_path.iterdir()
+    assert written.read_text() == profile.folded
+
+
+@pytest.mark.asyncio
+async def test_admin_profile_endpoints(async_client: AsyncClient, auth_headers: dict):
+    """
+    Given: A stored profile
+    When: Fetching it as an admin and as a regular user
+    Then: Admins should get the folded stacks and others a 403
+    """
+    profile_store.add(Profile(
+        id="abc123",
+        method="GET",
+        path="/api/v1/pois/nearby",
+        trigger="header",
+        created_at=datetime.now(timezone.utc),
+        folded="main;handler 3\n"
+    ))
+    admin_headers = {"Authorization": f"Bearer {make_token('admin')}"}
+    try:
+        response = await async_client.get("/api/v1/admin/profiles/abc123", headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text == "main;handler 3\n"
+
+        response = await async_client.get("/api/v1/admin/profiles", headers=admin_headers)
+        assert response.json()["profiles"][0]["id"] == "abc123"
+
+        response = await async_client.get("/api/v1/admin/profiles/abc123", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    finally:
+        profile_store.clear()
@@ -0,0 +1,149 @@
+"""
+Unit tests for the in-process group session hub.
+"""
+import asyncio
+
+import pytest
+
+from app.core.session_hub import SessionHub, Subscriber
+
+
+@pytest.mark.asyncio
+async def test_session_hub_fans_out_to_every_subscriber():
+    """
+    Given: Two participants of one session and one of another
+    When: Publishing a POI change to the first session
+    Then: Only its participants should receive it, with a sequence number
+    """
+    hub = SessionHub()
+    first, second = hub.subscribe("ABC123"), hub.subscribe("ABC123")
+    other = hub.subscribe("XYZ789")
+
+    assert hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": "p1"}) == 2
+
+    batches = [await subscriber.next_batch() for subscriber in (first, second)]
+    assert batches[0] == batches[1]
+    assert batches[0][0]["poi_id"] == "p1"
+    assert batches[0][0]["seq"] > 0
+    other.close()
+    assert await other.next_batch() == []
+
+
+@pytest.mark.asyncio
+async def test_session_hub_coalesces_pending_updates():
+    """
+    Given: A participant that has not read its updates yet
+    When: The leader changes the POI three times
+    Then: The participant should only receive the latest change
+    """
+    hub = SessionHub()
+    subscriber = hub.subscribe("ABC123")
+    for poi_id in ("p1", "p2", "p3"):
+        hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": poi_id})
+
+    batch = await subscriber.next_batch()
+    assert [message["poi_id"] for message in batch] == ["p3"]
+
+
+@pytest.mark.asyncio
+async def test_session_hub_late_joiner_gets_latest_state():
+    """
+    Given: A session whose POI has changed and a channel seeded from the database
+    When: Another participant joins
+    Then: It should receive the latest state rather than the seed
+    """
+    hub = SessionHub()
+    hub.subscribe("ABC123", {"poi": {"type": "poi_changed", "poi_id": "p0", "seq": 0}})
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": "p1"})
+
+    late = hub.subscribe("ABC123", {"poi": {"type": "poi_changed", "poi_id": "p0", "seq": 0}})
+
+    batch = await late.next_batch()
+    assert [message["poi_id"] for message in batch] == ["p1"]
+    assert batch[0]["seq"] > 0
+
+
+@pytest.mark.asyncio
+async def test_session_hub_drops_slow_subscribers():
+    """
+    Given: A subscriber whose outbox holds a single key
+    When: Messages for two different keys are published without it reading
+    Then: It should be closed and removed while others keep receiving
+    """
+    hub = SessionHub(max_pending=1)
+    slow = hub.subscribe("ABC123")
+    hub.publish("ABC123", "poi", {"type": "poi_changed"})
+    fast = hub.subscribe("ABC123")
+    await fast.next_batch()
+
+    hub.publish("ABC123", "chat", {"type": "chat"})
+
+    assert slow.closed
+    assert not fast.closed
+    assert hub.stats()["subscribers"] == 1
+    assert hub.stats()["dropped_subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_hub_sequence_increases_within_a_clock_tick(monkeypatch):
+    """
+    Given: A clock that does not advance between publishes
+    When: Publishing twice to the same session
+    Then: The second message should still get a larger sequence number
+    """
+    monkeypatch.setattr("app.core.session_hub.time.time_ns", lambda: 1_000_000_000)
+    hub = SessionHub()
+    subscriber = hub.subscribe("ABC123")
+
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": "p1"})
+    first = await subscriber.next_batch()
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": "p2"})
+    second = await subscriber.next_batch()
+
+    assert first[0]["seq"] == 1_000_000
+    assert second[0]["seq"] == 1_000_001
+
+
+def test_session_hub_drops_empty_channels():
+    """
+    Given: A session with one participant
+    When: The participant leaves
+    Then: The session's channel and state should be released
+    """
+    hub = SessionHub()
+    subscriber = hub.subscribe("ABC123")
+    hub.publish("ABC123", "poi", {"type": "poi_changed"})
+
+    hub.unsubscribe("ABC123", subscriber)
+
+    assert hub.stats()["sessions"] == 0
+    assert hub.publish("ABC123", "poi", {"type": "poi_changed"}) == 0
+
+
+def test_subscriber_rejects_messages_after_close():
+    """
+    Given: A closed subscriber
+    When: Offering it a message
+    Then: The message should be rejected
+    """
+    subscriber = Subscriber()
+    subscriber.close()
+    assert not subscriber.offer("poi", {})
+
+
+@pytest.mark.asyncio
+async def test_dropped_subscriber_stops_waiting():
+    """
+    Given: A subscriber with one outbox slot holding an unsent update
+    When: A second key is published, dropping it, and its sender keeps reading
+    Then: Every read should return nothing straight away instead of blocking
+    """
+    hub = SessionHub(max_pending=1)
+    slow = hub.subscribe("ABC123")
+    hub.publish("ABC123", "poi", {"type": "poi_changed", "poi_id": 1})
+    hub.publish("ABC123", "error", {"type": "error"})
+
+    assert slow.closed
+    assert hub.stats()["dropped_subscribers"] == 1
+    for _ in range(2):
+        assert await asyncio.wait_for(slow.next_batch(), timeout=1) == []
@@ -1,11 +1,19 @@
 """
 Unit tests for Supabase client functionality.
 """
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock
 from supabase import Client
 
-from app.core.supabase import get_supabase_client, reset_supabase_client
+from app.core import supabase as supabase_module
+from app.core.supabase import (
+    close_async_supabase_client,
+    get_async_supabase_client,
+    get_supabase_client,
+    reset_supabase_client,
+)
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -73,3 +81,76 @@ def test_supabase_client_configuration(mock_create):
         settings.SUPABASE_KEY
     )
     assert client is mock_client
+
+
+def test_get_async_supabase_client_singleton():
+    """
+    Given: Multiple calls to get_async_supabase_client
+    When: Getting the async Supabase client
+    Then: It should return the same instance until reset
+    """
+    client1 = get_async_supabase_client()
+    client2 = get_async_supabase_client()
+    assert client1 is client2
+
+    reset_supabase_client()
+    assert get_async_supabase_client() is not client1
+
+
+def test_async_supabase_client_shares_connection_pool():
+    """
+    Given: The async Supabase client
+    When: Inspecting its PostgREST and raw HTTP sessions
+    Then: Both should use one transport configured from settings
+    """
+    client = get_async_supabase_client()
+    pool = client._transport._pool
+
+    assert client.postgrest.session._transport is client._transport
+    assert client.http._transport is client._transport
+    assert pool._max_connections == settings.SUPABASE_HTTP_MAX_CONNECTIONS
+    assert pool._max_keepalive_connections == settings.SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS
+    assert str(client.postgrest.session.base_url).rstrip("/") == f"{settings.SUPABASE_URL}/rest/v1"
+    assert client.http.headers["apikey"] == settings.SUPABASE_KEY
+
+
+@pytest.mark.asyncio
+async def test_close_async_supabase_client():
+    """
+    Given: An initialized async Supabase client
+    When: Closing it on shutdown
+    Then: A fresh client should be created on next get
+    """
+    client = get_async_supabase_client()
+    await close_async_supabase_client()
+    assert client.http.is_closed
+    assert client.postgrest.session.is_closed
+    assert get_async_supabase_client() is not client
+
+
+def test_reset_supabase_client_closes_async_client():
+    """
+    Given: An initialized async Supabase client and no running event loop
+    When: Resetting the clients
+    Then: The old client's sessions should be closed
+    """
+    client = get_async_supabase_client()
+    reset_supabase_client()
+
+    assert client.http.is_closed
+    assert client.postgrest.session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_reset_supabase_client_closes_on_running_loop():
+    """
+    Given: An initialized async Supabase client inside a running event loop
+    When: Resetting the clients and waiting for the scheduled close
+    Then: The old client's sessions should be closed
+    """
+    client = get_async_supabase_client()
+    reset_supabase_client()
+    await asyncio.gather(*supabase_module._pending_closes)
+
+    assert client.http.is_closed
+    assert client.postgrest.session.is_closed
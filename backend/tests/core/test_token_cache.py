@@ -0,0 +1,89 @@
+"""
+Unit tests for the verified-token cache.
+"""
+import time
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.core.auth import get_current_user, token_cache
+from app.core.config import get_settings
+from app.core.token_cache import TokenCache
+
+settings = get_settings()
+
+
+@pytest.fixture(autouse=True)
+def reset_token_cache():
+    """Start each test with an empty shared cache."""
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_cache_hit_and_miss_counters():
+    """
+    Given: An empty cache
+    When: Looking up a token before and after caching its claims
+    Then: It should count one miss and one hit
+    """
+    cache = TokenCache()
+    assert cache.get("token") is None
+    cache.set("token", {"sub": "user", "exp": time.time() + 60})
+
+    assert cache.get("token")["sub"] == "user"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_entry_expires_with_token():
+    """
+    Given: Claims whose exp is already in the past
+    When: Looking them up
+    Then: The entry should be treated as expired and dropped
+    """
+    cache = TokenCache()
+    cache.set("token", {"sub": "user", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Given: A cache holding two tokens
+    When: A third token is added after the first was used
+    Then: The least recently used token should be evicted
+    """
+    cache = TokenCache(max_size=2)
+    cache.set("a", {"sub": "a"})
+    cache.set("b", {"sub": "b"})
+    cache.get("a")
+    cache.set("c", {"sub": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_reuses_verified_claims():
+    """
+    Given: A valid token
+    When: Authenticating with it twice
+    Then: The second call should be served from the cache
+    """
+    token = jwt.encode(
+        {"sub": "test-user", "role": "authenticated", "exp": 2000000000},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256"
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    first = await get_current_user(credentials)
+    second = await get_current_user(credentials)
+
+    assert first == second
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["misses"] == 1
@@ -0,0 +1,54 @@
+"""
+Unit tests for byte-range request parsing.
+"""
+import pytest
+
+from app.utils.byte_ranges import RangeNotSatisfiable, iter_file_range, parse_byte_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-200", (800, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+    ("bytes=abc-", None),
+    ("bytes=50-10", None),
+])
+def test_parse_byte_range(header, expected):
+    """
+    Given: A 1000-byte body and a Range header
+    When: Resolving the range
+    Then: Should return the inclusive byte positions, or None to serve everything
+    """
+    assert parse_byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_parse_byte_range_not_satisfiable(header):
+    """
+    Given: A 1000-byte body
+    When: The range starts past the end or is empty
+    Then: Should raise RangeNotSatisfiable
+    """
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(header, 1000)
+
+
+@pytest.mark.asyncio
+async def test_iter_file_range(tmp_path):
+    """
+    Given: A file larger than the chunk size
+    When: Reading an inclusive range of it in small chunks
+    Then: Should yield exactly the requested bytes
+    """
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+
+    chunks = [chunk async for chunk in iter_file_range(str(path), 10, 300, chunk_size=64)]
+
+    assert b"".join(chunks) == path.read_bytes()[10:301]
+    assert max(len(chunk) for chunk in chunks) == 64
@@ -0,0 +1,135 @@
+"""
+Unit tests for the hierarchical POI cluster grid.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.cluster_grid import ClusterGrid, cluster_pois
+
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+
+def make_poi(poi_id: int, latitude: float, longitude: float) -> SimpleNamespace:
+    return SimpleNamespace(id=poi_id, latitude=latitude, longitude=longitude)
+
+
+@pytest.fixture
+def grid():
+    grid = ClusterGrid(max_zoom=12, cells_per_tile=8)
+    grid.build([
+        make_poi(1, 48.8584, 2.2945),    # Eiffel Tower
+        make_poi(2, 48.8606, 2.3376),    # Louvre
+        make_poi(3, -33.8568, 151.2153), # Sydney Opera House
+    ])
+    return grid
+
+
+def test_cluster_grid_zoomed_out_merges_nearby_pois(grid: ClusterGrid):
+    """
+    Given: Two POIs in Paris and one in Sydney
+    When: Querying the whole world at zoom 2
+    Then: Paris should be one cluster of two at its centroid, Sydney a single POI
+    """
+    clusters = grid.query(2, *WORLD)
+
+    assert [cluster["count"] for cluster in clusters] == [2, 1]
+    assert clusters[0]["latitude"] == pytest.approx((48.8584 + 48.8606) / 2)
+    assert clusters[0]["poi_id"] is None
+    assert clusters[1]["poi_id"] == 3
+
+
+def test_cluster_grid_zoomed_in_separates_pois(grid: ClusterGrid):
+    """
+    Given: Two POIs about 3km apart in Paris
+    When: Querying a Paris viewport at the grid's deepest zoom
+    Then: Each POI should be its own cluster and Sydney excluded
+    """
+    clusters = grid.query(20, 2.2, 48.8, 2.4, 48.9)
+
+    assert sorted(cluster["poi_id"] for cluster in clusters) == [1, 2]
+
+
+def test_cluster_grid_incremental_updates(grid: ClusterGrid):
+    """
+    Given: A built grid
+    When: Moving a POI from Paris to Sydney and deleting another
+    Then: Every level should reflect the writes as if rebuilt
+    """
+    grid.upsert(make_poi(2, -33.8570, 151.2150))
+    grid.remove(1)
+
+    rebuilt = ClusterGrid(max_zoom=12, cells_per_tile=8)
+    rebuilt.build([make_poi(2, -33.8570, 151.2150), make_poi(3, -33.8568, 151.2153)])
+    for zoom in range(13):
+        assert [c["count"] for c in grid.query(zoom, *WORLD)] == [c["count"] for c in rebuilt.query(zoom, *WORLD)]
+    assert grid.stats()["cells"] == rebuilt.stats()["cells"]
+
+
+def test_cluster_grid_antimeridian_viewport(grid: ClusterGrid):
+    """
+    Given: A POI near the antimeridian
+    When: Querying a viewport whose west edge is east of its east edge
+    Then: Only POIs within the wrapped longitude range should be returned
+    """
+    grid.upsert(make_poi(4, -17.7, 179.9))
+
+    clusters = grid.query(6, 170.0, -30.0, -170.0, 0.0)
+
+    assert [cluster["poi_id"] for cluster in clusters] == [4]
+
+
+def test_cluster_grid_ignores_writes_until_built():
+    """
+    Given: A grid that has not been built
+    When: Upserting a POI
+    Then: The grid should stay empty and not ready
+    """
+    grid = ClusterGrid(max_zoom=4)
+    grid.upsert(make_poi(1, 48.8584, 2.2945))
+
+    assert not grid.is_ready
+    assert len(grid) == 0
+
+
+def test_cluster_grid_centroids_do_not_drift(grid: ClusterGrid):
+    """
+    Given: A built grid
+    When: Moving a POI back and forth thousands of times
+    Then: Centroids should match a freshly built grid exactly
+    """
+    for i in range(5000):
+        grid.upsert(make_poi(2, 48.8606 + (i % 7) * 0.123456789, 2.3376 - (i % 5) * 0.987654321))
+    grid.upsert(make_poi(2, 48.8606, 2.3376))
+
+    rebuilt = ClusterGrid(max_zoom=12, cells_per_tile=8)
+    rebuilt.build([
+        make_poi(1, 48.8584, 2.2945), make_poi(2, 48.8606, 2.3376), make_poi(3, -33.8568, 151.2153)
+    ])
+    for zoom in range(13):
+        assert grid.query(zoom, *WORLD) == rebuilt.query(zoom, *WORLD)
+
+
+def test_cluster_pois_matches_grid(grid: ClusterGrid):
+    """
+    Given: The POIs of a built grid
+    When: Clustering them at a single zoom level without a grid
+    Then: The clusters should equal the grid's
+    """
+    pois = [make_poi(1, 48.8584, 2.2945), make_poi(2, 48.8606, 2.3376), make_poi(3, -33.8568, 151.2153)]
+
+    for zoom in (0, 2, 12):
+        assert cluster_pois(pois, zoom, cells_per_tile=8) == grid.query(zoom, *WORLD)
+
+
+@pytest.mark.parametrize("cells_per_tile", [0, -8, 6])
+def test_cluster_grid_rejects_invalid_cells_per_tile(cells_per_tile: int):
+    """
+    Given: A cells_per_tile that is not a positive power of two
+    When: Creating a grid or clustering POIs with it
+    Then: Should raise ValueError
+    """
+    with pytest.raises(ValueError):
+        ClusterGrid(cells_per_tile=cells_per_tile)
+    with pytest.raises(ValueError):
+        cluster_pois([], 2, cells_per_tile=cells_per_tile)
@@ -0,0 +1,127 @@
+"""
+Unit tests for geofence helpers.
+"""
+import numpy as np
+import pytest
+
+from app.utils.geofence import (
+    batch_distances,
+    batch_within_radius,
+    bounding_box,
+    calculate_distance,
+    filter_within_radius,
+    is_within_radius,
+)
+
+
+def test_is_within_radius_gps_drift():
+    """
+    Given: A user standing roughly 10m north of a POI
+    When: Checking the default 20m geofence
+    Then: The POI should match, but not with a 5m geofence
+    """
+    poi_lat, poi_lon = 48.8584, 2.2945
+    user_lat = poi_lat + 0.00009  # ~10m north
+
+    assert is_within_radius(user_lat, poi_lon, poi_lat, poi_lon, 20.0)
+    assert not is_within_radius(user_lat, poi_lon, poi_lat, poi_lon, 5.0)
+
+
+def test_calculate_distance_known_pair():
+    """
+    Given: The Eiffel Tower and the Louvre
+    When: Calculating the distance between them
+    Then: It should be about 3.2km
+    """
+    distance = calculate_distance(48.8584, 2.2945, 48.8606, 2.3376)
+    assert distance == pytest.approx(3160, rel=0.02)
+
+
+def test_bounding_box_contains_geofence():
+    """
+    Given: A 500m geofence
+    When: Computing its bounding box
+    Then: Points on the circle's edge should lie inside the box
+    """
+    lat, lon, radius = 48.8584, 2.2945, 500.0
+    box = bounding_box(lat, lon, radius)
+    (west, east), = box.lon_ranges
+
+    assert box.min_lat < lat < box.max_lat
+    assert west < lon < east
+    assert calculate_distance(lat, lon, box.max_lat, lon) == pytest.approx(radius, rel=1e-6)
+    assert calculate_distance(lat, lon, lat, east) >= radius - 1e-6
+
+
+def test_bounding_box_crosses_antimeridian():
+    """
+    Given: A geofence centered right next to the antimeridian
+    When: Computing its bounding box
+    Then: It should be split into two longitude ranges
+    """
+    box = bounding_box(0.0, 179.9999, 100.0)
+    assert len(box.lon_ranges) == 2
+    assert box.lon_ranges[0][1] == 180.0
+    assert box.lon_ranges[1][0] == -180.0
+
+
+def test_bounding_box_near_pole():
+    """
+    Given: A geofence that reaches the north pole
+    When: Computing its bounding box
+    Then: It should span every longitude
+    """
+    box = bounding_box(89.9999, 10.0, 100.0)
+    assert box.max_lat == 90.0
+    assert box.lon_ranges == [(-180.0, 180.0)]
+
+
+def test_batch_distances_match_scalar():
+    """
+    Given: One user and several POIs
+    When: Calculating distances in a single vectorized pass
+    Then: Each distance should match the scalar haversine
+    """
+    poi_lats = np.array([48.8584, 48.8606, -33.8568])
+    poi_lons = np.array([2.2945, 2.3376, 151.2153])
+
+    distances = batch_distances(48.8584, 2.2945, poi_lats, poi_lons)
+
+    assert distances.shape == (3,)
+    for distance, lat, lon in zip(distances, poi_lats, poi_lons):
+        assert distance == pytest.approx(calculate_distance(48.8584, 2.2945, lat, lon))
+
+
+def test_batch_within_radius_many_users():
+    """
+    Given: Two participants at different POIs, each with their own radius
+    When: Checking every participant against every POI
+    Then: The mask should have one row per participant
+    """
+    poi_lats = np.array([48.8584, 48.8606])
+    poi_lons = np.array([2.2945, 2.3376])
+
+    mask = batch_within_radius(
+        [48.85845, 48.8606], [2.29452, 2.3376], poi_lats, poi_lons, [20.0, 5000.0]
+    )
+
+    assert mask.tolist() == [[True, False], [True, True]]
+
+
+def test_filter_within_radius_preserves_order():
+    """
+    Given: POI-like objects in a specific order
+    When: Filtering them by distance
+    Then: Matching objects should keep their original order
+    """
+    class Point:
+        def __init__(self, latitude, longitude):
+            self.latitude = latitude
+            self.longitude = longitude
+
+    far = Point(48.8606, 2.3376)
+    near_a = Point(48.8584, 2.2945)
+    near_b = Point(48.85841, 2.29451)
+
+    assert filter_within_radius(48.8584, 2.2945, [near_b, far, near_a], 20.0) == [near_b, near_a]
+    assert filter_within_radius(48.8584, 2.2945, [], 20.0) == []
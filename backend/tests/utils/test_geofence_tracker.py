@@ -0,0 +1,64 @@
+"""
+Unit tests for incremental geofence tracking.
+"""
+from types import SimpleNamespace
+
+from app.utils.geofence_tracker import GeofenceTracker
+
+EIFFEL = SimpleNamespace(id=1, latitude=48.8584, longitude=2.2945)
+TROCADERO = SimpleNamespace(id=2, latitude=48.8616, longitude=2.2893)
+POIS = [EIFFEL, TROCADERO]
+
+
+def test_tracker_reports_enter_and_exit_once():
+    """
+    Given: A user walking from the Eiffel Tower to the Trocadero
+    When: Evaluating each position against both POIs
+    Then: Each geofence should be entered and exited exactly once
+    """
+    tracker = GeofenceTracker(radius=20)
+
+    assert tracker.update(48.85845, 2.29452, POIS) == ([EIFFEL], [])
+    assert tracker.update(48.85846, 2.29451, POIS) == ([], [])
+    assert tracker.update(48.8616, 2.2893, POIS) == ([TROCADERO], [1])
+    assert set(tracker.inside) == {2}
+
+
+def test_tracker_exits_pois_missing_from_candidates():
+    """
+    Given: A user inside a POI's geofence
+    When: The POI is no longer among the candidates, e.g. it was deleted
+    Then: An exit should be reported for it
+    """
+    tracker = GeofenceTracker(radius=20)
+    tracker.update(48.85845, 2.29452, POIS)
+
+    assert tracker.update(48.85845, 2.29452, [TROCADERO]) == ([], [1])
+
+
+def test_tracker_skips_positions_below_min_move():
+    """
+    Given: A tracker that has evaluated a position
+    When: The next positions move 1m and then 50m
+    Then: Only the 50m move should be evaluated
+    """
+    tracker = GeofenceTracker(radius=20, min_move_meters=5)
+    assert tracker.should_evaluate(48.8584, 2.2945)
+    tracker.update(48.8584, 2.2945, POIS)
+
+    assert not tracker.should_evaluate(48.858409, 2.2945)
+    assert tracker.should_evaluate(48.85885, 2.2945)
+
+
+def test_tracker_measures_drift_from_last_evaluated_position():
+    """
+    Given: A user drifting 3m per position with a 5m threshold
+    When: Checking each position in turn
+    Then: The drift should be evaluated once it adds up to the threshold
+    """
+    tracker = GeofenceTracker(radius=20, min_move_meters=5)
+    tracker.update(48.8584, 2.2945, POIS)
+    step = 3 / 111195  # about 3m of latitude
+
+    assert not tracker.should_evaluate(48.8584 + step, 2.2945)
+    assert tracker.should_evaluate(48.8584 + 2 * step, 2.2945)
@@ -0,0 +1,69 @@
+"""
+Unit tests for streamed NDJSON and CSV parsing.
+"""
+import pytest
+
+from app.utils.ingest import iter_csv_records, iter_lines, iter_ndjson_records
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def parse(parser, *parts: bytes):
+    return [record async for record in parser(iter_lines(chunks(*parts)))]
+
+
+@pytest.mark.asyncio
+async def test_csv_follows_csv_quoting_rules():
+    """
+    Given: CSV with a quoted field spanning lines and a stray quote inside an unquoted field
+    When: Parsing it from chunks split mid-record
+    Then: Should keep the multi-line field and treat the stray quote as text
+    """
+    records = await parse(
+        iter_csv_records,
+        b'title,description\r\nNotre-Dame,"Gothic,\r\nbuilt ""1163"""\r\nBistro,5" pizza',
+        b"\r\nLouvre,Museum\r\n"
+    )
+
+    assert records == [
+        (1, {"title": "Notre-Dame", "description": 'Gothic,\nbuilt "1163"'}, None),
+        (2, {"title": "Bistro", "description": '5" pizza'}, None),
+        (3, {"title": "Louvre", "description": "Museum"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_unterminated_quoted_field():
+    """
+    Given: CSV whose last field opens a quote that is never closed
+    When: Parsing it
+    Then: Should report the row as unterminated
+    """
+    records = await parse(iter_csv_records, b'title,description\nLouvre,"Museum\n')
+
+    assert records == [(1, None, "Unterminated quoted field")]
+
+
+@pytest.mark.asyncio
+async def test_invalid_utf8_is_a_row_error():
+    """
+    Given: NDJSON and CSV bodies with a line that is not valid UTF-8
+    When: Parsing them
+    Then: Should report that row and keep parsing the rest
+    """
+    ndjson = await parse(iter_ndjson_records, b'{"title": "A"}\n{"title": "\xe9"}\n{"title": "B"}\n')
+    csv_records = await parse(iter_csv_records, b"title\nA\n\xe9t\xe9\nB\n")
+
+    assert ndjson == [
+        (1, {"title": "A"}, None),
+        (2, None, "Line is not valid UTF-8"),
+        (3, {"title": "B"}, None),
+    ]
+    assert csv_records == [
+        (1, {"title": "A"}, None),
+        (2, None, "Line is not valid UTF-8"),
+        (3, {"title": "B"}, None),
+    ]
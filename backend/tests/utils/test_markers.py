@@ -0,0 +1,68 @@
+"""
+Unit tests for marker feed encodings and tile math.
+"""
+import json
+
+import pytest
+
+from app.utils.markers import (
+    decode_markers_binary, encode_markers_binary, encode_markers_json, tile_bounds
+)
+
+IDS = [1, 2, 3]
+TITLES = ["Eiffel Tower", "Louvre", "Café de Flore"]
+LATITUDES = [48.8584, 48.8606, 48.8540]
+LONGITUDES = [2.2945, 2.3376, 2.3325]
+
+
+def test_encode_markers_binary_round_trip():
+    """
+    Given: Marker columns including a non-ASCII title
+    When: Encoding them in the binary layout and decoding the result
+    Then: Ids and titles should round-trip and coordinates stay within float32 precision
+    """
+    decoded = decode_markers_binary(encode_markers_binary(IDS, TITLES, LATITUDES, LONGITUDES))
+
+    assert decoded["ids"].tolist() == IDS
+    assert decoded["titles"] == TITLES
+    assert decoded["latitudes"] == pytest.approx(LATITUDES, abs=1e-5)
+    assert decoded["longitudes"] == pytest.approx(LONGITUDES, abs=1e-5)
+
+
+def test_encode_markers_binary_empty():
+    """
+    Given: No markers
+    When: Encoding them in the binary layout
+    Then: Only the zero count should be written
+    """
+    payload = encode_markers_binary([], [], [], [])
+    assert payload == b"\x00\x00\x00\x00"
+    assert decode_markers_binary(payload)["titles"] == []
+
+
+def test_encode_markers_json_is_columnar():
+    """
+    Given: Marker columns
+    When: Encoding them as JSON
+    Then: Each column should be a separate array
+    """
+    data = json.loads(encode_markers_json(IDS, TITLES, LATITUDES, LONGITUDES))
+    assert data == {
+        "count": 3,
+        "ids": IDS,
+        "titles": TITLES,
+        "latitudes": LATITUDES,
+        "longitudes": LONGITUDES,
+    }
+
+
+def test_tile_bounds():
+    """
+    Given: The world tile and a zoom 1 tile
+    When: Computing their bounds
+    Then: Edge rows should reach the poles and columns split at the meridian
+    """
+    assert tile_bounds(0, 0, 0) == (-90.0, 90.0, -180.0, 180.0)
+
+    south, north, west, east = tile_bounds(1, 1, 0)
+    assert (south, north, west, east) == (pytest.approx(0.0, abs=1e-9), 90.0, 0.0, 180.0)
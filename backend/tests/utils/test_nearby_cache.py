@@ -0,0 +1,105 @@
+"""
+Unit tests for the quantized-location nearby cache.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import InMemoryLRUCache
+from app.schemas.poi import POIInDB
+from app.utils.geofence import is_within_radius
+from app.utils.nearby_cache import NearbyCache
+
+
+def make_poi(poi_id: int, latitude: float, longitude: float) -> POIInDB:
+    return POIInDB(
+        id=poi_id,
+        title=f"POI {poi_id}",
+        latitude=latitude,
+        longitude=longitude,
+        created_at=datetime(2025, 1, 1)
+    )
+
+
+@pytest.fixture
+def cache():
+    return NearbyCache(InMemoryLRUCache(), cell_size=0.005, max_radius=1000.0)
+
+
+@pytest.mark.asyncio
+async def test_nearby_cache_hit_after_miss(cache: NearbyCache):
+    """
+    Given: An empty nearby cache
+    When: Storing candidates for one position and reading from a position in the same cell
+    Then: The first lookup should miss and the second should return the candidates
+    """
+    cell = await cache.get(48.8584, 2.2945)
+    assert cell.candidates is None
+
+    await cache.set(cell, [make_poi(1, 48.8584, 2.2945)])
+    cell = await cache.get(48.8581, 2.2941)
+
+    assert [poi.id for poi in cell.candidates] == [1]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_nearby_cache_candidate_box_covers_max_radius(cache: NearbyCache):
+    """
+    Given: A position near the corner of its grid cell
+    When: Computing the cell's candidate box
+    Then: Every point within max_radius of the position should fall inside it
+    """
+    latitude, longitude = 48.8549, 2.2901
+    box = cache.candidate_box(latitude, longitude)
+
+    for poi_lat, poi_lon in ((48.8460, 2.2901), (48.8549, 2.2766), (48.8612, 2.2998)):
+        assert is_within_radius(latitude, longitude, poi_lat, poi_lon, 1000.0)
+        assert box.min_lat <= poi_lat <= box.max_lat
+        assert any(west <= poi_lon <= east for west, east in box.lon_ranges)
+
+
+@pytest.mark.asyncio
+async def test_nearby_cache_invalidates_cells_within_reach(cache: NearbyCache):
+    """
+    Given: Cached candidates for two cells, one near a write and one far away
+    When: Invalidating at the written POI's position
+    Then: Only the nearby cell's entry should be dropped
+    """
+    await cache.set(await cache.get(48.8584, 2.2945), [])
+    await cache.set(await cache.get(48.8606, 2.3376), [])
+
+    await cache.invalidate((48.8590, 2.2950))
+
+    assert (await cache.get(48.8584, 2.2945)).candidates is None
+    assert (await cache.get(48.8606, 2.3376)).candidates == []
+
+
+@pytest.mark.asyncio
+async def test_nearby_cache_ignores_loads_racing_a_write(cache: NearbyCache):
+    """
+    Given: A cell lookup that missed just before a POI in reach was written
+    When: The old candidates are stored after the invalidation, and the cell is loaded right after
+    Then: Neither load should be served from the cache
+    """
+    before_write = await cache.get(48.8584, 2.2945)
+    await cache.invalidate((48.8590, 2.2950))
+    await cache.set(before_write, [make_poi(1, 48.8584, 2.2945)])
+
+    after_write = await cache.get(48.8584, 2.2945)
+    assert after_write.candidates is None
+    assert after_write.recently_changed
+
+    await cache.set(after_write, [make_poi(1, 48.8584, 2.2945)])
+    assert (await cache.get(48.8584, 2.2945)).candidates is None
+
+
+def test_nearby_cache_supports(cache: NearbyCache):
+    """
+    Given: A cache answering radii up to 1000m
+    When: Checking queries of different radius and latitude
+    Then: Large radii and polar positions should bypass the cache
+    """
+    assert cache.supports(48.8584, 2.2945, 500)
+    assert not cache.supports(48.8584, 2.2945, 5000)
+    assert not cache.supports(85.0, 2.2945, 500)
@@ -0,0 +1,46 @@
+"""
+Unit tests for the fast POI list encoder.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.schemas.poi import POIInDB
+from app.utils.serialization import _stock_dumps, dump_pois
+
+
+def make_poi(poi_id: int, latitude: float, longitude: float, **kwargs) -> POIInDB:
+    return POIInDB(
+        id=poi_id,
+        title=kwargs.pop("title", f"POI {poi_id}"),
+        latitude=latitude,
+        longitude=longitude,
+        created_at=kwargs.pop("created_at", datetime(2025, 1, 1)),
+        **kwargs
+    )
+
+
+@pytest.mark.parametrize("poi", [
+    make_poi(1, 48.8584, 2.2945),
+    make_poi(2, -33.8568, 151.2153, description="Opéra ☕\n\"quoted\"\x01"),
+    make_poi(3, 0.0, -0.0, audio_url="https://storage.example.com/a.mp3"),
+    make_poi(4, 90.0, -180.0, created_at=datetime(2025, 1, 1, 1, 2, 3, 400000, tzinfo=timezone.utc)),
+    make_poi(5, 12.5, 7.25, updated_at=datetime(2025, 1, 1, 3, tzinfo=timezone(timedelta(hours=2)))),
+    make_poi(6, 0.00001, 1.5e-7),
+])
+def test_dump_pois_matches_response_model_encoding(poi: POIInDB):
+    """
+    Given: A POI with edge-case text, coordinates or timestamps
+    When: Encoding it with the fast path
+    Then: The bytes should equal FastAPI's response-model encoding
+    """
+    assert dump_pois([poi]) == _stock_dumps([poi])
+
+
+def test_dump_pois_empty_list():
+    """
+    Given: No POIs
+    When: Encoding them
+    Then: An empty JSON array should be returned
+    """
+    assert dump_pois([]) == b"[]"
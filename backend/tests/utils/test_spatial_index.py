@@ -0,0 +1,91 @@
+"""
+Unit tests for the in-process POI spatial index.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.schemas.poi import POIInDB
+from app.utils.spatial_index import POISpatialIndex
+
+
+def make_poi(poi_id: int, latitude: float, longitude: float) -> POIInDB:
+    return POIInDB(
+        id=poi_id,
+        title=f"POI {poi_id}",
+        latitude=latitude,
+        longitude=longitude,
+        created_at=datetime(2025, 1, 1)
+    )
+
+
+@pytest.fixture
+def index():
+    index = POISpatialIndex(cell_size=0.01)
+    index.build([
+        make_poi(1, 48.8584, 2.2945),   # Eiffel Tower
+        make_poi(2, 48.8606, 2.3376),   # Louvre
+        make_poi(3, 48.85845, 2.29455), # Right next to the tower
+    ])
+    return index
+
+
+def test_query_radius_matches_geofence(index):
+    """
+    Given: A built index with POIs around Paris
+    When: Querying 20m around the Eiffel Tower
+    Then: Only the POIs inside the geofence should be returned
+    """
+    matches = index.query_radius(48.8584, 2.2945, 20.0)
+    assert [poi.id for poi in matches] == [1, 3]
+
+
+def test_upsert_moves_poi_between_cells(index):
+    """
+    Given: A built index
+    When: A POI is moved next to the Louvre
+    Then: It should only be found at its new location
+    """
+    index.upsert(make_poi(3, 48.8606, 2.3376))
+
+    assert [poi.id for poi in index.query_radius(48.8584, 2.2945, 20.0)] == [1]
+    assert [poi.id for poi in index.query_radius(48.8606, 2.3376, 20.0)] == [2, 3]
+
+
+def test_remove_drops_poi(index):
+    """
+    Given: A built index
+    When: A POI is removed
+    Then: It should no longer match and empty cells should be released
+    """
+    index.remove(2)
+
+    assert index.query_radius(48.8606, 2.3376, 20.0) == []
+    assert len(index) == 2
+    assert index.stats()["cells"] == 1
+
+
+def test_writes_ignored_until_built():
+    """
+    Given: An index that has not been built
+    When: A POI is upserted
+    Then: The index should stay empty and not ready
+    """
+    index = POISpatialIndex()
+    index.upsert(make_poi(1, 48.8584, 2.2945))
+
+    assert not index.is_ready
+    assert len(index) == 0
+
+
+def test_stats_report_memory_and_build_time(index):
+    """
+    Given: A built index
+    When: Reading its stats
+    Then: Memory use and build time should be reported
+    """
+    stats = index.stats()
+    assert stats["ready"] is True
+    assert stats["pois"] == 3
+    assert stats["memory_bytes"] > 0
+    assert stats["build_seconds"] >= 0
@@ -0,0 +1,221 @@
+"""
+Unit tests for offline tour package building.
+"""
+import hashlib
+import io
+import json
+import os
+import time
+import zipfile
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas.poi import POIInDB
+from app.schemas.tour import TourInDB
+from app.utils import tour_package
+from app.utils.tour_bundle import build_tour_bundle
+from app.utils.tour_package import (
+    AudioUnavailable, build_tour_package, check_audio_url, package_path, prune_packages
+)
+
+NOW = datetime(2025, 5, 1, tzinfo=timezone.utc)
+AUDIO = {"/eiffel.mp3": b"ID3" + b"\x01" * 5000, "/louvre.mp3": b"ID3" + b"\x02" * 3000}
+
+
+@pytest.fixture(autouse=True)
+def audio_host(monkeypatch):
+    """Allow audio.example.com and resolve it to a public address."""
+    addresses = {"audio.example.com": ["93.184.216.34"]}
+
+    async def resolve(host, port):
+        return addresses[host]
+
+    monkeypatch.setattr(settings, "TOUR_PACKAGE_AUDIO_HOSTS", ["audio.example.com"])
+    monkeypatch.setattr(tour_package, "_resolve", resolve)
+    return addresses
+
+
+def make_bundle():
+    tour = TourInDB(id=7, title="Paris", created_at=NOW)
+    pois = [
+        POIInDB(id=1, title="Eiffel Tower", latitude=48.8584, longitude=2.2945, created_at=NOW,
+                audio_url="https://audio.example.com/eiffel.mp3"),
+        POIInDB(id=2, title="Louvre", latitude=48.8606, longitude=2.3376, created_at=NOW,
+                audio_url="https://audio.example.com/louvre.mp3"),
+        POIInDB(id=3, title="Missing", latitude=48.8530, longitude=2.3499, created_at=NOW,
+                audio_url="https://audio.example.com/missing.mp3"),
+        POIInDB(id=4, title="Silent", latitude=48.8600, longitude=2.3400, created_at=NOW),
+    ]
+    return build_tour_bundle(tour, pois)
+
+
+def audio_server(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        body = AUDIO.get(request.url.path)
+        return httpx.Response(200, content=body) if body else httpx.Response(404)
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_package_manifest_and_audio(tmp_path):
+    """
+    Given: A tour whose POIs have available, missing and no narration audio
+    When: Building a package with audio
+    Then: The manifest should list sizes and hashes and the zip should hold the audio
+    """
+    async with audio_server([]) as client:
+        package_id, size = await build_tour_package(make_bundle(), True, client, str(tmp_path))
+
+    with open(package_path(package_id, str(tmp_path)), "rb") as f:
+        data = f.read()
+    assert hashlib.sha256(data).hexdigest() == package_id
+    assert len(data) == size
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        eiffel_hash = hashlib.sha256(AUDIO["/eiffel.mp3"]).hexdigest()
+        assert zf.read(f"audio/{eiffel_hash}.mp3") == AUDIO["/eiffel.mp3"]
+
+    assert manifest["format_version"] == 1
+    assert [poi["id"] for poi in manifest["pois"]] == [1, 2, 3, 4]
+    audio = {entry["poi_id"]: entry for entry in manifest["audio"]}
+    assert sorted(audio) == [1, 2, 3]
+    assert audio[1]["size"] == len(AUDIO["/eiffel.mp3"])
+    assert audio[1]["sha256"] == eiffel_hash
+    assert audio[1]["path"] == f"audio/{eiffel_hash}.mp3"
+    assert audio[3] == {
+        "poi_id": 3, "url": "https://audio.example.com/missing.mp3", "size": None, "sha256": None, "path": None
+    }
+
+
+@pytest.mark.asyncio
+async def test_package_is_content_addressed(tmp_path):
+    """
+    Given: The same tour packaged twice, once without audio bytes
+    When: Comparing package IDs
+    Then: Identical contents should give the same ID and different contents a new one
+    """
+    requests = []
+    async with audio_server(requests) as client:
+        first, _ = await build_tour_package(make_bundle(), False, client, str(tmp_path))
+        second, _ = await build_tour_package(make_bundle(), False, client, str(tmp_path))
+        with_audio, _ = await build_tour_package(make_bundle(), True, client, str(tmp_path))
+
+    assert first == second
+    assert with_audio != first
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted({f"{first}.zip", f"{with_audio}.zip"})
+    with zipfile.ZipFile(package_path(first, str(tmp_path))) as zf:
+        assert zf.namelist() == ["manifest.json"]
+
+
+def store_package(directory, package_id: str, size: int, age_seconds: float) -> str:
+    path = package_path(package_id, str(directory))
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_prune_packages_drops_expired_then_oldest(tmp_path):
+    """
+    Given: Stored packages of different ages, one past the max age
+    When: Pruning to a size cap that fits only two of the rest
+    Then: The expired and then the oldest packages should go, and the kept one should stay
+    """
+    expired = store_package(tmp_path, "a" * 64, 100, age_seconds=1000)
+    oldest = store_package(tmp_path, "b" * 64, 100, age_seconds=300)
+    middle = store_package(tmp_path, "c" * 64, 100, age_seconds=200)
+    kept = store_package(tmp_path, "d" * 64, 100, age_seconds=400)
+    (tmp_path / "notes.zip").write_bytes(b"\0" * 1000)
+
+    deleted = prune_packages(str(tmp_path), max_age_seconds=500, max_total_bytes=200, keep="d" * 64)
+
+    assert deleted == 2
+    assert [os.path.exists(path) for path in (expired, oldest, middle, kept)] == [False, False, True, True]
+    assert (tmp_path / "notes.zip").exists()
+
+
+@pytest.mark.asyncio
+async def test_package_build_prunes_old_packages(tmp_path, monkeypatch):
+    """
+    Given: A package directory holding an expired package
+    When: Building a new package
+    Then: The expired package should be deleted and the new one kept
+    """
+    monkeypatch.setattr(settings, "TOUR_PACKAGE_MAX_AGE_SECONDS", 60)
+    expired = store_package(tmp_path, "a" * 64, 100, age_seconds=3600)
+
+    async with audio_server([]) as client:
+        package_id, _ = await build_tour_package(make_bundle(), False, client, str(tmp_path))
+
+    assert not os.path.exists(expired)
+    assert os.path.exists(package_path(package_id, str(tmp_path)))
+
+
+def test_package_path_rejects_non_digest_ids():
+    """
+    Given: A package ID that is not a SHA-256 hex digest
+    When: Resolving its path
+    Then: Should raise ValueError instead of escaping the package directory
+    """
+    with pytest.raises(ValueError):
+        package_path("../../etc/passwd")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", [
+    "https://internal.example.com/eiffel.mp3",
+    "file:///etc/passwd",
+    "https://audio.example.com.evil.test/eiffel.mp3",
+])
+async def test_check_audio_url_rejects_other_hosts(url: str):
+    """
+    Given: An audio host allowlist holding audio.example.com
+    When: Checking URLs on other hosts or schemes
+    Then: Should raise AudioUnavailable
+    """
+    with pytest.raises(AudioUnavailable):
+        await check_audio_url(url)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "169.254.169.254", "::1", "::ffff:192.168.1.1"])
+async def test_check_audio_url_rejects_non_public_addresses(audio_host, address: str):
+    """
+    Given: An allowed audio host that resolves to a non-public address
+    When: Checking one of its URLs
+    Then: Should raise AudioUnavailable
+    """
+    audio_host["audio.example.com"] = ["93.184.216.34", address]
+
+    with pytest.raises(AudioUnavailable):
+        await check_audio_url("https://audio.example.com/eiffel.mp3")
+
+
+@pytest.mark.asyncio
+async def test_package_leaves_out_redirected_audio(tmp_path):
+    """
+    Given: An audio host that redirects to a metadata endpoint
+    When: Building a package with audio
+    Then: The redirect should not be followed and the audio should be left out
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(302, headers={"Location": "http://169.254.169.254/latest/meta-data/"})
+
+    async with tour_package.audio_client() as client:
+        assert not client.follow_redirects
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=False) as client:
+        package_id, _ = await build_tour_package(make_bundle(), True, client, str(tmp_path))
+
+    assert all(url.startswith("https://audio.example.com/") for url in requests)
+    with zipfile.ZipFile(package_path(package_id, str(tmp_path))) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+    assert all(entry["sha256"] is None for entry in manifest["audio"])